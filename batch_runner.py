@@ -0,0 +1,437 @@
+"""
+Apply a row-wise public calculator to the rows of a CSV or Parquet file.
+
+Only calculators whose result for a row depends on that row alone (ROW_WISE)
+can run: functions over a whole series, such as expanding means or marginal
+products, would restart at every chunk and are refused. The input is streamed in chunks. Each chunk's mapped columns are passed to the
+function as arrays. A chunk whose array call fails, or does not return one value
+per row, is retried once per row (across a process pool with --processes), so an
+invalid row only costs its own chunk the fast path and becomes NaN. When every
+row of such a chunk is valid the function has no vectorized path, and later
+chunks go straight to per-row calls. Results
+are appended to the output as each chunk finishes: to a CSV file, or to a
+directory of Parquet parts when the output ends in .parquet.
+
+After every chunk a checkpoint (the output path plus '.checkpoint') records how
+many rows are done and how much output was written, so --resume continues an
+interrupted job where it stopped. Progress and rows/sec go to stderr. With
+--metrics the calculators are instrumented and their call counts and timings
+are written as Prometheus text (or JSON for a .json path) when the job ends.
+
+Run from the repository root:
+    python -m batch_runner calculate_annuity_pv loans.csv pv.csv --map pmt=payment --map r=rate --map n=term
+    python -m batch_runner corporate_finance.calculate_cost quotes.parquet costs.csv --keep quote_id --resume
+    python -m batch_runner calculate_future_value deposits.csv fv.csv --set payment_frequency="'end'"
+"""
+import argparse
+import ast
+import csv
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+PACKAGES = ['quantitative_methods', 'economics', 'corporate_finance']
+MODES = ('auto', 'vectorized', 'rows')
+# Exceptions that mark one row as invalid (NaN) instead of stopping the job
+ROW_ERRORS = (ArithmeticError, LookupError, TypeError, ValueError)
+
+# Calculators whose result for a row depends on that row alone, so chunking the
+# input cannot change the output. Anything else (series statistics, curves,
+# ledgers, charts) needs the whole input at once and is refused.
+ROW_WISE = frozenset([
+    'quantitative_methods.annualized_return', 'quantitative_methods.annuity_fv', 'quantitative_methods.annuity_pv',
+    'quantitative_methods.calculate_EAR', 'quantitative_methods.calculate_annuity_due_fv',
+    'quantitative_methods.calculate_annuity_due_pv', 'quantitative_methods.calculate_annuity_fv',
+    'quantitative_methods.calculate_annuity_pv', 'quantitative_methods.calculate_default_risk_premium',
+    'quantitative_methods.calculate_future_value', 'quantitative_methods.calculate_future_value_batch',
+    'quantitative_methods.calculate_growing_perpetuity_pv', 'quantitative_methods.calculate_maturity_risk_premium',
+    'quantitative_methods.calculate_nominal_risk_free_rate', 'quantitative_methods.calculate_perpetuity_pv',
+    'quantitative_methods.calculate_present_value', 'quantitative_methods.calculate_required_rate_of_return',
+    'quantitative_methods.calculate_total_interest_rate', 'quantitative_methods.future_value',
+    'quantitative_methods.future_value_series', 'quantitative_methods.future_value_with_payment',
+    'quantitative_methods.holding_period_return', 'quantitative_methods.leveraged_return',
+    'quantitative_methods.payment', 'quantitative_methods.perpetuity_pv',
+    'quantitative_methods.present_value_with_payment', 'quantitative_methods.real_return',
+    'quantitative_methods.tvm_factors',
+    'economics.calculate_elasticity_coefficient', 'economics.calculate_keyesian_multiplier', 'economics.calculate_mpc',
+    'economics.calculate_own_price_elasticity',
+    'corporate_finance.calculate_cost', 'corporate_finance.calculate_cost_batch',
+    'corporate_finance.calculate_cost_decimal',
+])
+
+def resolve_function(name):
+    """
+    Find a row-wise public function by 'package.name' or by a name unique across the packages.
+
+    Returns:
+    tuple: (qualified name, function).
+    """
+    package, _, attribute = name.rpartition('.')
+    candidates = [package] if package in PACKAGES else [] if package else PACKAGES
+    found = [package for package in candidates if attribute in importlib.import_module(package).__all__]
+    if not found:
+        raise ValueError(f"Invalid function '{name}'. Please use a public name of {', '.join(PACKAGES)}.")
+    if len(found) > 1:
+        raise ValueError(f"Ambiguous function '{name}'. Please qualify it with one of {', '.join(found)}.")
+    qualified = f'{found[0]}.{attribute}'
+    if qualified not in ROW_WISE:
+        raise ValueError(f"Invalid function '{name}'. Its results depend on other rows, so it cannot run chunk by "
+                         f"chunk. Please use a row-wise calculator (batch_runner.ROW_WISE).")
+    return qualified, getattr(importlib.import_module(found[0]), attribute)
+
+def parse_assignments(items, literal=False):
+    """Parse 'name=value' items; with literal=True values are Python literals where possible."""
+    result = {}
+    for item in items or []:
+        key, sep, value = item.partition('=')
+        if not sep or not key:
+            raise ValueError(f"Invalid assignment '{item}'. Please use name=value.")
+        if literal:
+            try:
+                value = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                pass  # a bare word is taken as a string
+        result[key] = value
+    return result
+
+def argument_columns(function, mapping, constants, columns):
+    """
+    Match the function's parameters to input columns.
+
+    Parameters without an explicit mapping or constant use the column of the same
+    name when there is one. Every parameter without a default must be covered.
+
+    Returns:
+    dict: parameter -> column name.
+    """
+    parameters = inspect.signature(function).parameters
+    unknown = sorted(set(mapping) - set(parameters))
+    if unknown:
+        raise ValueError(f"Invalid argument(s) {unknown}. Please use parameters of {function.__name__}: {list(parameters)}.")
+    missing_columns = sorted(set(mapping.values()) - set(columns))
+    if missing_columns:
+        raise ValueError(f"Invalid column(s) {missing_columns}. Please use columns of the input: {list(columns)}.")
+    result = dict(mapping)
+    for name, parameter in parameters.items():
+        if name in result or name in constants:
+            continue
+        if name in columns:
+            result[name] = name
+        elif parameter.default is inspect.Parameter.empty and parameter.kind not in (
+                parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            raise ValueError(f"Missing argument '{name}'. Please map it with --map {name}=COLUMN or --set {name}=VALUE.")
+    return result
+
+def to_frame(result, rows, name):
+    """
+    Turn a vectorized result into one output row per input row.
+
+    Namedtuples and dicts give one column per field, other tuples name_0, name_1, ...;
+    anything else is a single column. Raises ValueError when a column does not
+    hold exactly one value per row.
+    """
+    if isinstance(result, pd.DataFrame):
+        frame = result.reset_index(drop=True)
+    else:
+        if isinstance(result, dict):
+            columns = result
+        elif isinstance(result, tuple) and hasattr(result, '_fields'):
+            columns = dict(zip(result._fields, result))
+        elif isinstance(result, tuple):
+            columns = {f'{name}_{i}': value for i, value in enumerate(result)}
+        else:
+            columns = {name: result}
+        frame = pd.DataFrame({key: np.asarray(value) for key, value in columns.items()
+                              if np.ndim(value) == 1 and len(value) == rows})
+        if len(frame.columns) != len(columns):
+            raise ValueError("Invalid result. The function did not return one value per row.")
+    if len(frame) != rows:
+        raise ValueError("Invalid result. The function did not return one value per row.")
+    return frame
+
+def _call_rows(function, arguments, constants):
+    """Pool task: call function once per row; invalid rows give None."""
+    names = list(arguments)
+    results = []
+    for values in zip(*arguments.values()):
+        try:
+            results.append(function(**dict(zip(names, values)), **constants))
+        except ROW_ERRORS:
+            results.append(None)
+    return results
+
+def call_rows(function, values, constants, pool=None, processes=None):
+    """
+    Call function once per row of the chunk's argument arrays, across the pool when given.
+
+    Returns:
+    list: One result per row, None where the row was invalid.
+    """
+    arguments = {parameter: array.tolist() for parameter, array in values.items()}
+    if pool is None:
+        return _call_rows(function, arguments, constants)
+    rows = len(next(iter(arguments.values()), []))
+    step = max(-(-rows // (4 * processes)), 1)
+    tasks = [
+        pool.submit(_call_rows, function, {key: column[i:i + step] for key, column in arguments.items()}, constants)
+        for i in range(0, rows, step)
+    ]
+    return [value for task in tasks for value in task.result()]
+
+def rows_frame(results, name):
+    """One output row per per-row result; None (an invalid row) becomes NaN."""
+    sample = next((result for result in results if result is not None), None)
+    if isinstance(sample, dict):
+        fields = list(sample)
+    elif isinstance(sample, tuple) and hasattr(sample, '_fields'):
+        fields = list(sample._fields)
+    elif isinstance(sample, (tuple, list, np.ndarray)):
+        fields = [f'{name}_{i}' for i in range(len(sample))]
+    else:
+        return pd.DataFrame({name: [np.nan if result is None else result for result in results]})
+    blank = [np.nan] * len(fields)
+    records = [blank if result is None else list(result.values() if isinstance(result, dict) else result)
+               for result in results]
+    return pd.DataFrame(records, columns=fields)
+
+def read_chunks(path, columns, chunksize, skip=0):
+    """
+    Yield DataFrame chunks of the needed columns, starting after skip data rows.
+
+    Returns:
+    tuple: (total rows or None when unknown, chunk iterator).
+    """
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(path)
+        sizes = [parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)]
+        # Whole row groups before the resume point are not read at all
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+        first = int(np.searchsorted(starts, skip, side='right') - 1) if sizes else 0
+        offset = skip - int(starts[first]) if sizes else 0
+
+        def batches():
+            nonlocal offset
+            groups = list(range(first, len(sizes)))
+            for batch in parquet.iter_batches(batch_size=chunksize, row_groups=groups, columns=columns):
+                frame = batch.to_pandas()
+                if offset:
+                    frame, offset = frame.iloc[offset:], max(offset - len(frame), 0)
+                if len(frame):
+                    yield frame
+        return parquet.metadata.num_rows, batches()
+
+    def records():
+        # Rows already done are parsed and dropped: only the parser knows how blank
+        # lines and quoted newlines map physical lines to rows
+        remaining = skip
+        for frame in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+            if remaining:
+                frame, remaining = frame.iloc[remaining:], max(remaining - len(frame), 0)
+            if len(frame):
+                yield frame
+    return None, records()
+
+def input_columns(path):
+    """Column names of a CSV or Parquet file."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).schema_arrow.names
+    with open(path, newline='') as f:
+        return next(csv.reader([f.readline()]))
+
+class OutputWriter:
+    """
+    Appends result chunks to a CSV file, or to numbered parts of a Parquet directory.
+    """
+
+    def __init__(self, path, resume_state=None):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        state = resume_state or {'bytes': 0, 'parts': 0}
+        self.parts = state['parts']
+        if self.parquet:
+            os.makedirs(path, exist_ok=True)
+            # Parts written after the last checkpoint are incomplete
+            for name in os.listdir(path):
+                if name.startswith('part-') and int(name[5:10]) >= self.parts:
+                    os.remove(os.path.join(path, name))
+        else:
+            with open(path, 'ab') as f:
+                f.truncate(state['bytes'])
+        self.bytes = state['bytes']
+
+    def write(self, frame):
+        if self.parquet:
+            frame.to_parquet(os.path.join(self.path, f'part-{self.parts:05d}.parquet'), index=False)
+        else:
+            with open(self.path, 'a', newline='') as f:
+                frame.to_csv(f, header=self.bytes == 0, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+                self.bytes = f.tell()
+        self.parts += 1
+
+def write_checkpoint(path, state):
+    """Write the checkpoint atomically, so an interrupted write never corrupts it."""
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(state, f)
+    os.replace(temporary, path)
+
+def run(function_name, input_path, output_path, mapping=None, constants=None, keep=(), chunksize=100_000,
+        processes=None, mode='auto', resume=False, progress=sys.stderr):
+    """
+    Apply a calculator to every row of input_path and write the results to output_path.
+
+    Parameters:
+    function_name (str): 'package.name' or a name unique across the packages.
+    input_path (str): CSV file, or Parquet file when it ends in .parquet.
+    output_path (str): CSV file, or a directory of Parquet parts when it ends in .parquet.
+    mapping (dict, optional): parameter -> input column. Parameters named like a
+        column are mapped automatically.
+    constants (dict, optional): parameter -> value passed unchanged to every call.
+    keep (sequence): Input columns copied to the output ahead of the results.
+    chunksize (int): Rows per chunk.
+    processes (int, optional): Worker processes for per-row calls.
+    mode (str): 'auto' tries the vectorized path until a chunk shows there is none;
+        'vectorized' never gives it up (failing chunks are still retried per row);
+        'rows' calls the function once per row throughout.
+    resume (bool): Continue from the checkpoint of an earlier run when there is one.
+    progress (file, optional): Where progress lines go; None for silence.
+
+    Returns:
+    dict: The final checkpoint state (rows, parts, bytes, mode, errors, row_chunks, seconds).
+    """
+    if mode not in MODES:
+        raise ValueError("Invalid mode. Please use 'auto', 'vectorized' or 'rows'.")
+    qualified, function = resolve_function(function_name)
+    constants = constants or {}
+    columns = input_columns(input_path)
+    arguments = argument_columns(function, mapping or {}, constants, columns)
+    missing = sorted(set(keep) - set(columns))
+    if missing:
+        raise ValueError(f"Invalid column(s) {missing}. Please use columns of the input: {list(columns)}.")
+    needed = list(dict.fromkeys(list(keep) + list(arguments.values())))
+
+    checkpoint_path = output_path + '.checkpoint'
+    job = {'function': qualified, 'input': os.path.abspath(input_path), 'arguments': arguments,
+           'constants': repr(constants), 'keep': list(keep)}
+    state = dict(job, rows=0, parts=0, bytes=0, mode=None, errors=0, row_chunks=0, seconds=0.0, complete=False)
+    if resume and os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as f:
+            saved = json.load(f)
+        if {key: saved.get(key) for key in job} != job:
+            raise ValueError(f"Invalid resume. {checkpoint_path} belongs to a different job.")
+        state = saved
+        if state['complete']:
+            return state
+    if mode != 'auto':
+        state['mode'] = mode
+
+    writer = OutputWriter(output_path, state if state['rows'] else None)
+    total, chunks = read_chunks(input_path, needed, chunksize, skip=state['rows'])
+    name = qualified.rpartition('.')[2]
+    pool = None
+    started = time.perf_counter()
+    rows_before, seconds_before = state['rows'], state['seconds']
+    try:
+        for chunk in chunks:
+            rows = len(chunk)
+            values = {parameter: chunk[column].to_numpy() for parameter, column in arguments.items()}
+            result = None
+            if state['mode'] != 'rows':
+                try:
+                    result = to_frame(function(**values, **constants), rows, name)
+                    state['mode'] = state['mode'] or 'vectorized'
+                except ROW_ERRORS as error:
+                    # One invalid row fails the whole array call; retry this chunk per row
+                    if progress is not None:
+                        print(f"Rows {state['rows']:,}+: array call failed ({type(error).__name__}: {error}), "
+                              f"retrying per row", file=progress)
+            if result is None:
+                if pool is None and processes and processes > 1:
+                    pool = ProcessPoolExecutor(processes)
+                results = call_rows(function, values, constants, pool, processes)
+                invalid = sum(value is None for value in results)
+                state['errors'] += invalid
+                state['row_chunks'] = state.get('row_chunks', 0) + 1
+                if state['mode'] is None and not invalid:
+                    # Every row is valid yet the array call failed: there is no vectorized path
+                    state['mode'] = 'rows'
+                result = rows_frame(results, name)
+
+            if keep:
+                result = pd.concat([chunk[list(keep)].reset_index(drop=True), result], axis=1)
+            writer.write(result)
+            state['rows'] += rows
+            state['parts'], state['bytes'] = writer.parts, writer.bytes
+            elapsed = time.perf_counter() - started
+            state['seconds'] = seconds_before + elapsed
+            write_checkpoint(checkpoint_path, state)
+            if progress is not None:
+                rate = (state['rows'] - rows_before) / elapsed if elapsed else float('inf')
+                share = f" ({state['rows'] / total:.1%})" if total else ''
+                print(f"{state['rows']:,} rows{share}, {rate:,.0f} rows/s, {state['mode'] or 'auto'}", file=progress)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    state['complete'] = True
+    write_checkpoint(checkpoint_path, state)
+    return state
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('function', help="public function, e.g. calculate_annuity_pv or corporate_finance.calculate_cost")
+    parser.add_argument('input', help="CSV file, or Parquet file ending in .parquet")
+    parser.add_argument('output', help="CSV file, or Parquet directory ending in .parquet")
+    parser.add_argument('--map', action='append', metavar='ARG=COLUMN', help="map a parameter to an input column")
+    parser.add_argument('--set', action='append', metavar='ARG=VALUE', help="pass a constant (a Python literal)")
+    parser.add_argument('--keep', action='append', default=[], metavar='COLUMN', help="copy an input column to the output")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="rows per chunk")
+    parser.add_argument('--processes', type=int, help="worker processes for per-row calls")
+    parser.add_argument('--mode', choices=MODES, default='auto', help="force the vectorized or per-row path")
+    parser.add_argument('--resume', action='store_true', help="continue from the checkpoint of an earlier run")
+    parser.add_argument('--quiet', action='store_true', help="no progress output")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="write call metrics of this process as Prometheus text, or JSON for a .json path")
+    parser.add_argument('--profile-slowest', type=int, default=0, metavar='N',
+                        help="with --metrics, also write cProfile files of the N slowest calls to PATH.profiles")
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        from quantitative_methods import instrumentation
+        instrumentation.enable(profile_slowest=args.profile_slowest)
+    try:
+        state = run(
+            args.function, args.input, args.output,
+            mapping=parse_assignments(args.map), constants=parse_assignments(args.set, literal=True),
+            keep=args.keep, chunksize=args.chunksize, processes=args.processes, mode=args.mode,
+            resume=args.resume, progress=None if args.quiet else sys.stderr,
+        )
+    except ValueError as error:
+        parser.exit(2, f"{parser.prog}: error: {error}\n")
+    finally:
+        if args.metrics:
+            instrumentation.disable()
+            if args.metrics.endswith('.json'):
+                instrumentation.write_json(args.metrics)
+            else:
+                instrumentation.write_prometheus(args.metrics)
+            if args.profile_slowest:
+                instrumentation.write_profiles(args.metrics + '.profiles')
+    if not args.quiet:
+        rate = state['rows'] / state['seconds'] if state['seconds'] else float('inf')
+        print(f"Done: {state['rows']:,} rows in {state['seconds']:.1f}s ({rate:,.0f} rows/s, "
+              f"{state['mode']}, {state['errors']:,} invalid rows)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Track package start-up cost with ``python -X importtime``.
+
+Each scenario runs in a fresh interpreter. The report lists the cumulative
+import time of the scenario, the slowest imported modules, and whether any heavy
+dependency was loaded. Pass a path to append the results as JSON lines so they
+can be compared across commits.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time [results.jsonl]
+"""
+import json
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'scipy', 'squarify', 'sympy']
+
+SCENARIOS = {
+    'import packages': 'import quantitative_methods, economics, corporate_finance',
+    'calculate_EAR': 'import quantitative_methods as qm; qm.calculate_EAR(0.05, 12)',
+    'tvm_grid': 'import quantitative_methods as qm; qm.tvm_grid(0.05, 10, 100)',
+    'calculate_cost': 'import corporate_finance as cf; cf.calculate_cost(1000, 50, 10000)',
+    'charting module': 'import quantitative_methods.charting',
+}
+
+def run_scenario(code):
+    """Run code under -X importtime and return (top-level import cumulative us, heavy modules loaded)."""
+    probe = f"{code}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        # Nested imports are indented further than the top-level ones
+        if len(name) - len(name.lstrip()) == 1:
+            cumulative[name.strip()] = cumulative.get(name.strip(), 0) + int(cumulative_us)
+    heavy = [m for m in result.stdout.strip().split(',') if m]
+    return cumulative, heavy
+
+def main():
+    output = sys.argv[1] if len(sys.argv) > 1 else None
+    records = []
+    print(f"{'scenario':<18} {'total ms':>9} {'heavy modules loaded':<30} slowest top-level imports")
+    for name, code in SCENARIOS.items():
+        cumulative, heavy = run_scenario(code)
+        total_ms = sum(cumulative.values()) / 1000
+        slowest = sorted(cumulative.items(), key=lambda item: -item[1])[:3]
+        slowest_text = ', '.join(f"{module} {us / 1000:.0f}ms" for module, us in slowest)
+        print(f"{name:<18} {total_ms:>9.1f} {', '.join(heavy) or '-':<30} {slowest_text}")
+        records.append({'scenario': name, 'total_ms': total_ms, 'heavy_modules': heavy, 'timestamp': time.time()})
+
+    if output:
+        with open(output, 'a') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+
+if __name__ == "__main__":
+    main()
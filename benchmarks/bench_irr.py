@@ -0,0 +1,64 @@
+"""
+Benchmark the Horner/Halley IRR engine against polynomial root-finding.
+
+The roots approach is what the removed ``np.irr`` did: build the companion
+matrix of the NPV polynomial and take its eigenvalues, which is O(n^3).
+
+Run from the repository root:
+    python -m benchmarks.bench_irr
+"""
+import time
+
+import numpy as np
+
+from quantitative_methods import irr_engine
+
+PERIODS = [10, 100, 1000, 10000]
+BATCH_SIZE = 1000  # schedules per batch for the engine
+ROOTS_REPEATS = 5  # the roots approach is timed on a handful of schedules only
+ROOTS_MAX_PERIODS = 2000  # a 10,000-degree eigenvalue problem takes minutes
+
+def roots_irr(cash_flows):
+    """IRR of one schedule via the roots of its NPV polynomial (old np.irr method)."""
+    roots = np.roots(cash_flows[::-1])
+    roots = roots.real[np.abs(roots.imag) < 1e-9]
+    rates = 1 / roots[roots > 0] - 1
+    if rates.size == 0:
+        return np.nan
+    return rates[np.argmin(np.abs(rates))]
+
+def make_schedules(n_rows, n_periods, seed=0):
+    """Random conventional schedules: one outflow followed by positive inflows."""
+    rng = np.random.default_rng(seed)
+    cash_flows = rng.uniform(1, 10, (n_rows, n_periods))
+    cash_flows[:, 0] = -cash_flows[:, 1:].sum(axis=1) * rng.uniform(0.5, 0.95, n_rows)
+    return cash_flows
+
+def best_of(func, repeats=3):
+    """Best wall time of several runs of func."""
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    print(f"{'periods':>8} {'engine us/irr':>14} {'roots us/irr':>14} {'speedup':>9} {'max |diff|':>11}")
+    for n_periods in PERIODS:
+        cash_flows = make_schedules(BATCH_SIZE, n_periods)
+        rates, _ = irr_engine.irr(cash_flows)
+        engine_time = best_of(lambda: irr_engine.irr(cash_flows)) / BATCH_SIZE
+
+        if n_periods <= ROOTS_MAX_PERIODS:
+            sample = cash_flows[:ROOTS_REPEATS]
+            roots_rates = np.array([roots_irr(row) for row in sample])
+            roots_time = best_of(lambda: [roots_irr(row) for row in sample], repeats=1) / ROOTS_REPEATS
+            diff = np.nanmax(np.abs(roots_rates - rates[:ROOTS_REPEATS]))
+            print(f"{n_periods:>8} {engine_time * 1e6:>14.2f} {roots_time * 1e6:>14.2f} "
+                  f"{roots_time / engine_time:>8.1f}x {diff:>11.2e}")
+        else:
+            print(f"{n_periods:>8} {engine_time * 1e6:>14.2f} {'skipped':>14} {'-':>9} {'-':>11}")
+
+if __name__ == "__main__":
+    main()
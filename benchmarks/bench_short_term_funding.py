@@ -0,0 +1,56 @@
+"""
+Benchmark the Decimal and float64 paths of short_term_funding.
+
+The Decimal path prices one quote per call; the float64 path prices a whole
+book of line-of-credit, banker's acceptance and commercial paper quotes at once.
+
+Run from the repository root:
+    python -m benchmarks.bench_short_term_funding
+"""
+import time
+from decimal import Decimal
+
+import numpy as np
+
+from corporate_finance import short_term_funding
+
+BOOK_SIZES = [10**3, 10**5, 10**6]
+DECIMAL_SAMPLE = 10**4  # the Decimal loop is timed on a sample and scaled up
+
+def make_quotes(size, seed=0):
+    """Random quotes, split evenly between the three facility types."""
+    rng = np.random.default_rng(seed)
+    loan_amount = rng.uniform(1e4, 1e7, size).round(2)
+    interest = (loan_amount * rng.uniform(0.01, 0.08, size)).round(2)
+    kind = rng.integers(0, 3, size)
+    commitment_fee = np.where(kind == 0, (loan_amount * 0.005).round(2), 0.0)
+    dealer_commission = np.where(kind == 2, (loan_amount * 0.001).round(2), 0.0)
+    backup_costs = np.where(kind == 2, (loan_amount * 0.0005).round(2), 0.0)
+    return interest, commitment_fee, loan_amount, dealer_commission, backup_costs
+
+def decimal_loop(quotes):
+    """Price each quote with Decimal arithmetic, one call per quote."""
+    rows = zip(*(column.tolist() for column in quotes))
+    return [
+        short_term_funding.calculate_cost_decimal(*(Decimal(str(value)) for value in row))
+        for row in rows
+    ]
+
+def main():
+    print(f"{'quotes':>9} {'float64 s':>10} {'decimal s':>10} {'speedup':>9} {'max |diff|':>11}")
+    for size in BOOK_SIZES:
+        quotes = make_quotes(size)
+        start = time.perf_counter()
+        batch = short_term_funding.calculate_cost_batch(*quotes)
+        batch_time = time.perf_counter() - start
+
+        sample = min(size, DECIMAL_SAMPLE)
+        start = time.perf_counter()
+        exact = np.array(decimal_loop([column[:sample] for column in quotes]), dtype=float)
+        decimal_time = (time.perf_counter() - start) * size / sample
+
+        diff = np.max(np.abs(batch[:sample] - exact))
+        print(f"{size:>9} {batch_time:>10.4f} {decimal_time:>10.4f} {decimal_time / batch_time:>8.1f}x {diff:>11.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark the broadcasting TVM kernel against the scalar per-cell formulas.
+
+Run from the repository root:
+    python -m benchmarks.bench_tvm
+"""
+import time
+
+import numpy as np
+
+from quantitative_methods import tvm_kernel
+
+GRID_SIZES = [10**3, 10**5, 10**7]
+SCALAR_SAMPLE = 10**5  # the scalar loop is timed on a sample and scaled up
+
+def scalar_loop(rates, periods, amounts):
+    """The pre-kernel formulas, evaluated one cell at a time."""
+    out = []
+    for r, n, pmt in zip(rates, periods, amounts):
+        pv = pmt * (1 - (1 + r)**-n) / r
+        fv = pmt * ((1 + r)**n - 1) / r
+        payment = (pmt * r * (1 + r) ** n) / ((1 + r) ** n - 1)
+        out.append((pv, fv, payment))
+    return out
+
+def make_grid(size, seed=0):
+    """Random (rate, periods, amount) cells; rates are kept non-zero for the scalar loop."""
+    rng = np.random.default_rng(seed)
+    rates = rng.uniform(0.0001, 0.15, size)
+    periods = rng.integers(1, 481, size).astype(float)
+    amounts = rng.uniform(10, 10000, size)
+    return rates, periods, amounts
+
+def main():
+    print(f"{'cells':>10} {'kernel s':>10} {'scalar s':>10} {'speedup':>9} {'max rel diff':>13}")
+    for size in GRID_SIZES:
+        rates, periods, amounts = make_grid(size)
+        start = time.perf_counter()
+        grid = tvm_kernel.tvm_grid(rates, periods, amounts)
+        kernel_time = time.perf_counter() - start
+
+        sample = min(size, SCALAR_SAMPLE)
+        start = time.perf_counter()
+        scalar = np.array(scalar_loop(rates[:sample].tolist(), periods[:sample].tolist(), amounts[:sample].tolist()))
+        scalar_time = (time.perf_counter() - start) * size / sample
+
+        kernel = np.column_stack([grid['pv'][:sample], grid['fv'][:sample], grid['payment'][:sample]])
+        diff = np.max(np.abs(kernel - scalar) / np.abs(scalar))
+        print(f"{size:>10} {kernel_time:>10.4f} {scalar_time:>10.4f} {scalar_time / kernel_time:>8.1f}x {diff:>13.2e}")
+
+if __name__ == "__main__":
+    main()
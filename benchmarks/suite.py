@@ -0,0 +1,784 @@
+"""
+Benchmark every public function of quantitative_methods, economics and corporate_finance.
+
+Each function has a case that builds inputs of a given size: a scalar call, then
+arrays (or rows, schedules, curves) of 10**3, 10**6 and 10**7 items. Cases that
+are inherently per-item (plots, Decimal, Python loops) have a cap, and larger
+sizes are measured once at the cap.
+For each (function, size) the suite records the best wall time over repeated
+runs, the throughput in items per second and the peak traced memory of one run
+(tracemalloc, which sees NumPy allocations).
+
+Results are written as JSON. Given a baseline (an earlier results file) the run
+fails with exit status 1 when a function is slower, or peaks higher in memory,
+than the baseline by more than the threshold. A public name with no case and no
+recorded exclusion fails the run with exit status 2, so new functions must be
+added here.
+
+Run from the repository root:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --sizes scalar,1e3 --baseline results.json --threshold 0.5
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+import corporate_finance
+import economics
+import quantitative_methods
+from quantitative_methods import measure_return, time_value_of_money, tvm_kernel
+
+PACKAGES = [quantitative_methods, economics, corporate_finance]
+
+# Public calculators left on their modules because their names clash with a
+# submodule or another export, so no package __all__ lists them
+MODULE_FUNCTIONS = {
+    'quantitative_methods.measure_return.money_weighted_rate_of_return': measure_return.money_weighted_rate_of_return,
+    'quantitative_methods.measure_return.geometric_mean_return': measure_return.geometric_mean_return,
+    'quantitative_methods.time_value_of_money.present_value': time_value_of_money.present_value,
+    'quantitative_methods.tvm_kernel.future_value': tvm_kernel.future_value,
+    'quantitative_methods.tvm_kernel.present_value': tvm_kernel.present_value,
+    'quantitative_methods.tvm_kernel.payment': tvm_kernel.payment,
+}
+PLOT_MAX = 10**3  # plots are timed up to this many points
+BAR_MAX = 10**2  # bar charts label every bar, so they stop earlier
+LOOP_MAX = 10**6  # pure Python loops and per-row objects stop here
+SCHEDULE_MAX = 10**6  # schedules of 10 cash flows, so 10**7 cash flows
+PATHS_MAX = 10**5  # Monte Carlo paths of 480 periods, so 4.8 * 10**7 draws
+MEMORY_FLOOR = 1 << 16  # peaks below this are too small to compare
+
+# Public names that are not benchmarked, with the reason
+EXCLUDED = {
+    'quantitative_methods.use_headless': 'switches the matplotlib backend; no workload',
+    'quantitative_methods.BUILD_UP_COLUMNS': 'constant',
+}
+
+CASES = {}
+
+_scratch = None
+
+def scratch_dir():
+    """A fresh directory inside one temporary tree that is removed when the run exits."""
+    global _scratch
+    if _scratch is None:
+        _scratch = tempfile.TemporaryDirectory(prefix='bench_')
+    return tempfile.mkdtemp(dir=_scratch.name)
+
+def case(name, max_size=10**7):
+    """Register make(size, rng) -> thunk as the benchmark of a public name."""
+    def register(make):
+        CASES[name] = (make, max_size)
+        return make
+    return register
+
+def count(size):
+    return 1 if size is None else size
+
+def uniform(rng, size, low, high):
+    """A float for the scalar size, an array otherwise."""
+    return float(rng.uniform(low, high)) if size is None else rng.uniform(low, high, size)
+
+def integers(rng, size, low, high):
+    return int(rng.integers(low, high)) if size is None else rng.integers(low, high, size)
+
+def schedules(rng, size, periods=10):
+    """Conventional cash-flow schedules, one per row: an outflow then inflows."""
+    rows = count(size)
+    cash_flows = rng.uniform(1, 10, (rows, periods))
+    cash_flows[:, 0] = -cash_flows[:, 1:].sum(axis=1) * rng.uniform(0.5, 0.95, rows)
+    return cash_flows[0] if size is None else cash_flows
+
+def demand_curves(rng, size, points=10):
+    """Downward-sloping linear demand curves, one per row."""
+    rows = count(size)
+    prices = np.sort(rng.uniform(1, 100, (rows, points)), axis=1)
+    quantities = rng.uniform(500, 1000, (rows, 1)) - rng.uniform(1, 4, (rows, 1)) * prices
+    return prices, quantities
+
+def survey(rng, size, variables=3):
+    """Categorical survey answers with size rows."""
+    return pd.DataFrame({
+        f"Q{i}": pd.Categorical(rng.choice(['Yes', 'No', 'Maybe'], count(size))) for i in range(variables)
+    })
+
+def quotes(rng, size):
+    """A book of line of credit, banker's acceptance and commercial paper quotes."""
+    rows = count(size)
+    loan_amount = rng.uniform(1e4, 1e7, rows)
+    kind = rng.integers(0, 3, rows)
+    return pd.DataFrame({
+        'interest': loan_amount * rng.uniform(0.01, 0.08, rows),
+        'commitment_fee': np.where(kind == 0, loan_amount * 0.005, 0.0),
+        'loan_amount': loan_amount,
+        'dealer_commission': np.where(kind == 2, loan_amount * 0.001, 0.0),
+        'backup_costs': np.where(kind == 2, loan_amount * 0.0005, 0.0),
+    })
+
+def quiet(func, *args, **kwargs):
+    """A thunk that runs func with stdout discarded (for functions that print)."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args, **kwargs)
+    return run
+
+def png(func, *args, **kwargs):
+    """A thunk that renders a plotting function to an in-memory PNG."""
+    return lambda: func(*args, output=io.BytesIO(), **kwargs)
+
+RATINGS = {'AAA': 0.002, 'AA': 0.004, 'A': 0.01, 'BBB': 0.02, 'BB': 0.04, 'B': 0.06}
+
+# quantitative_methods: time value of money
+
+for _name in ['calculate_annuity_pv', 'calculate_annuity_fv', 'calculate_annuity_due_pv', 'calculate_annuity_due_fv',
+              'calculate_present_value', 'future_value', 'payment', 'future_value_with_payment',
+              'present_value_with_payment', 'annuity_pv', 'annuity_fv', 'tvm_grid']:
+    def _make(size, rng, _name=_name):
+        func = getattr(quantitative_methods, _name)
+        args = (uniform(rng, size, 10, 1e4), uniform(rng, size, 0, 0.15), integers(rng, size, 1, 481))
+        return lambda: func(*args)
+    case(f'quantitative_methods.{_name}')(_make)
+
+for _name, _func in MODULE_FUNCTIONS.items():
+    if _name.rpartition('.')[0] in ('quantitative_methods.time_value_of_money', 'quantitative_methods.tvm_kernel'):
+        def _make(size, rng, func=_func):
+            args = (uniform(rng, size, 10, 1e4), uniform(rng, size, 0, 0.15), integers(rng, size, 1, 481))
+            return lambda: func(*args)
+        case(_name)(_make)
+
+@case('quantitative_methods.tvm_factors')
+def _(size, rng):
+    r, n = uniform(rng, size, 0, 0.15), integers(rng, size, 1, 481)
+    return lambda: quantitative_methods.tvm_factors(r, n)
+
+@case('quantitative_methods.calculate_EAR')
+def _(size, rng):
+    rate = uniform(rng, size, 0, 0.2)
+    return lambda: quantitative_methods.calculate_EAR(rate, 12)
+
+@case('quantitative_methods.calculate_perpetuity_pv')
+def _(size, rng):
+    pmt, r = uniform(rng, size, 10, 1e4), uniform(rng, size, 0.01, 0.15)
+    return lambda: quantitative_methods.calculate_perpetuity_pv(pmt, r)
+
+@case('quantitative_methods.calculate_growing_perpetuity_pv')
+def _(size, rng):
+    pmt, r, g = uniform(rng, size, 10, 1e4), uniform(rng, size, 0.05, 0.15), uniform(rng, size, 0, 0.04)
+    return lambda: quantitative_methods.calculate_growing_perpetuity_pv(pmt, r, g)
+
+@case('quantitative_methods.perpetuity_pv')
+def _(size, rng):
+    pmt, r, g = uniform(rng, size, 10, 1e4), uniform(rng, size, 0.05, 0.15), uniform(rng, size, 0, 0.04)
+    return lambda: quantitative_methods.perpetuity_pv(pmt, r, g)
+
+@case('quantitative_methods.calculate_future_value')
+def _(size, rng):
+    args = (uniform(rng, size, 0, 1e5), uniform(rng, size, 0, 1e3), uniform(rng, size, 0, 0.01),
+            integers(rng, size, 1, 481))
+    return lambda: quantitative_methods.calculate_future_value(*args, 'begin')
+
+@case('quantitative_methods.calculate_future_value_batch')
+def _(size, rng):
+    args = (uniform(rng, size, 0, 1e5), uniform(rng, size, 0, 1e3), uniform(rng, size, 0, 0.01),
+            integers(rng, size, 1, 481), integers(rng, size, 0, 2))
+    return lambda: quantitative_methods.calculate_future_value_batch(*args)
+
+@case('quantitative_methods.future_value_series')
+def _(size, rng):
+    args = (uniform(rng, size, 0, 1e5), uniform(rng, size, 0, 1e3), uniform(rng, size, 0, 0.01),
+            integers(rng, size, 1, 481), integers(rng, size, 0, 2))
+    return lambda: quantitative_methods.future_value_series(*args)
+
+@case('quantitative_methods.calculate_future_value_of_uneven_cash_flows', max_size=LOOP_MAX)
+def _(size, rng):
+    cash_flows = rng.uniform(-100, 100, count(size)).tolist()
+    return lambda: quantitative_methods.calculate_future_value_of_uneven_cash_flows(cash_flows, 1e-5)
+
+@case('quantitative_methods.DiscountFactorTable')
+def _(size, rng):
+    table = quantitative_methods.DiscountFactorTable(np.round(np.arange(0, 2001) * 1e-4, 4), np.arange(0, 481))
+    r = np.round(integers(rng, size, 0, 2001) * 1e-4, 4)
+    n = integers(rng, size, 0, 481)
+    return lambda: table.present_value(100.0, r, n)
+
+# quantitative_methods: uneven cash flows and IRR
+
+@case('quantitative_methods.ledger_offsets')
+def _(size, rng):
+    lengths = rng.integers(0, 40, count(size))
+    return lambda: quantitative_methods.ledger_offsets(lengths)
+
+@case('quantitative_methods.pack_ledgers', max_size=LOOP_MAX)
+def _(size, rng):
+    ledgers = [rng.uniform(-100, 100, rng.integers(1, 40)).tolist() for _ in range(max(count(size) // 20, 1))]
+    return lambda: quantitative_methods.pack_ledgers(ledgers)
+
+@case('quantitative_methods.calculate_ledger_values')
+def _(size, rng):
+    # size is the number of cash flows, in ledgers of about 20
+    lengths = rng.integers(1, 40, max(count(size) // 20, 1))
+    offsets = quantitative_methods.ledger_offsets(lengths)
+    values = rng.uniform(-100, 100, offsets[-1])
+    return lambda: quantitative_methods.calculate_ledger_values(values, offsets, 0.01)
+
+@case('quantitative_methods.CashFlowAccumulator')
+def _(size, rng):
+    # size ledgers, each streamed 12 periods
+    rates = uniform(rng, size, 0, 0.1)
+    cash_flows = rng.uniform(-100, 100, (12,) + np.shape(rates))
+    return lambda: quantitative_methods.CashFlowAccumulator(rates).extend(cash_flows).result()
+
+@case('quantitative_methods.simulate_wealth', max_size=PATHS_MAX)
+def _(size, rng):
+    # size paths of 40 years of monthly contributions
+    return lambda: quantitative_methods.simulate_wealth(
+        1e4, 480, contribution=500, inflation_mean=0.002, inflation_volatility=0.003, paths=count(size), seed=0,
+    )
+
+@case('quantitative_methods.project_wealth', max_size=PATHS_MAX)
+def _(size, rng):
+    history = rng.normal(0.007, 0.04, 600)
+    return lambda: quantitative_methods.project_wealth(
+        1e6, 480, contribution=-4000, model='bootstrap', history=history, paths=count(size), seed=0,
+    )
+
+@case('quantitative_methods.wealth_quantiles')
+def _(size, rng):
+    paths = quantitative_methods.WealthPaths(rng.lognormal(13, 1, count(size)), rng.lognormal(12, 1, count(size)), None)
+    return lambda: quantitative_methods.wealth_quantiles(paths)
+
+for _name in ['npv', 'npv_with_derivative']:
+    def _make(size, rng, _name=_name):
+        func = getattr(quantitative_methods, _name)
+        cash_flows = schedules(rng, size)
+        return lambda: func(0.05, cash_flows)
+    case(f'quantitative_methods.{_name}', max_size=SCHEDULE_MAX)(_make)
+
+@case('quantitative_methods.xnpv', max_size=SCHEDULE_MAX)
+def _(size, rng):
+    cash_flows = schedules(rng, size)
+    return lambda: quantitative_methods.xnpv(0.05, cash_flows, np.arange(10) * 0.5)
+
+@case('quantitative_methods.irr', max_size=SCHEDULE_MAX)
+def _(size, rng):
+    cash_flows = schedules(rng, size)
+    return lambda: quantitative_methods.irr(cash_flows)
+
+@case('quantitative_methods.xirr', max_size=SCHEDULE_MAX)
+def _(size, rng):
+    cash_flows = schedules(rng, size)
+    return lambda: quantitative_methods.xirr(cash_flows, np.arange(10) * 0.5)
+
+@case('quantitative_methods.calculate_mwrr_batch', max_size=SCHEDULE_MAX)
+def _(size, rng):
+    cash_flows = np.atleast_2d(schedules(rng, size))
+    return lambda: quantitative_methods.calculate_mwrr_batch(cash_flows)
+
+@case('quantitative_methods.calculate_mwrr', max_size=PLOT_MAX)
+def _(size, rng):
+    # size is the number of periods of one schedule
+    cash_flows = schedules(rng, 1, periods=max(count(size), 2))[0]
+    return lambda: quantitative_methods.calculate_mwrr(cash_flows)
+
+@case('quantitative_methods.measure_return.money_weighted_rate_of_return', max_size=SCHEDULE_MAX)
+def _(size, rng):
+    cash_flows = schedules(rng, size)
+    return lambda: measure_return.money_weighted_rate_of_return(cash_flows)
+
+for _name in ['calculate_pv_inflows', 'calculate_pv_outflows']:
+    def _make(size, rng, _name=_name):
+        func = getattr(quantitative_methods, _name)
+        cash_flows = rng.uniform(1, 10, count(size)).tolist()
+        return lambda: func(cash_flows, 1e-6)
+    case(f'quantitative_methods.{_name}', max_size=LOOP_MAX)(_make)
+
+# quantitative_methods: returns and rates
+
+@case('quantitative_methods.holding_period_return')
+def _(size, rng):
+    args = (uniform(rng, size, 0, 5), uniform(rng, size, 50, 150), uniform(rng, size, 50, 150))
+    return lambda: quantitative_methods.holding_period_return(*args)
+
+@case('quantitative_methods.annualized_return')
+def _(size, rng):
+    hpr, years = uniform(rng, size, -0.5, 2), uniform(rng, size, 0.5, 30)
+    return lambda: quantitative_methods.annualized_return(hpr, years)
+
+@case('quantitative_methods.arithmetic_mean_return')
+def _(size, rng):
+    returns = rng.normal(0.01, 0.05, count(size))
+    return lambda: quantitative_methods.arithmetic_mean_return(returns)
+
+@case('quantitative_methods.real_return')
+def _(size, rng):
+    nominal, inflation = uniform(rng, size, 0, 0.2), uniform(rng, size, 0, 0.1)
+    return lambda: quantitative_methods.real_return(nominal, inflation)
+
+@case('quantitative_methods.leveraged_return')
+def _(size, rng):
+    args = (uniform(rng, size, 0, 0.2), uniform(rng, size, 0, 3), uniform(rng, size, 0, 0.1))
+    return lambda: quantitative_methods.leveraged_return(*args)
+
+@case('quantitative_methods.calculate_nominal_risk_free_rate')
+def _(size, rng):
+    real, inflation = uniform(rng, size, 0, 0.05), uniform(rng, size, 0, 0.1)
+    return lambda: quantitative_methods.calculate_nominal_risk_free_rate(real, inflation)
+
+@case('quantitative_methods.calculate_total_interest_rate')
+def _(size, rng):
+    args = [uniform(rng, size, 0, 0.05) for _ in range(5)]
+    return lambda: quantitative_methods.calculate_total_interest_rate(*args)
+
+@case('quantitative_methods.calculate_required_rate_of_return')
+def _(size, rng):
+    args = [uniform(rng, size, 0, 0.05) for _ in range(5)]
+    return lambda: quantitative_methods.calculate_required_rate_of_return(*args)
+
+@case('quantitative_methods.calculate_maturity_risk_premium')
+def _(size, rng):
+    maturity = uniform(rng, size, 0.5, 30)
+    return lambda: quantitative_methods.calculate_maturity_risk_premium(maturity, 0.0005)
+
+@case('quantitative_methods.calculate_default_risk_premium')
+def _(size, rng):
+    ratings = str(rng.choice(list(RATINGS))) if size is None else rng.choice(list(RATINGS), size)
+    return lambda: quantitative_methods.calculate_default_risk_premium(ratings, RATINGS)
+
+@case('quantitative_methods.RatingIndex')
+def _(size, rng):
+    ratings = rng.choice(list(RATINGS), count(size))
+    return lambda: quantitative_methods.RatingIndex(RATINGS).premia(ratings)
+
+@case('quantitative_methods.calculate_required_return_matrix')
+def _(size, rng):
+    rows = count(size)
+    ratings = pd.Categorical(rng.choice(list(RATINGS), rows))
+    maturity, liquidity = rng.uniform(0.5, 30, rows), rng.uniform(0, 0.01, rows)
+    return lambda: quantitative_methods.calculate_required_return_matrix(
+        0.02, 0.03, maturity, 0.0005, liquidity, ratings, RATINGS)
+
+# quantitative_methods: means and modes
+
+for _name in ['arithmetic_mean', 'harmonic_mean', 'geometric_mean']:
+    def _make(size, rng, _name=_name):
+        func = getattr(quantitative_methods, _name)
+        data = rng.uniform(0.5, 2, count(size))
+        return lambda: func(data)
+    case(f'quantitative_methods.{_name}', max_size=10**7)(_make)
+
+for _name in ['ArithmeticMeanAccumulator', 'GeometricMeanAccumulator', 'HarmonicMeanAccumulator',
+              'GeometricMeanReturnAccumulator']:
+    def _make(size, rng, _name=_name):
+        cls = getattr(quantitative_methods, _name)
+        chunks = np.array_split(rng.uniform(0.5, 2, count(size)), 8)
+        return lambda: cls.from_chunks(chunks).result()
+    case(f'quantitative_methods.{_name}')(_make)
+
+@case('quantitative_methods.geometric_mean_return')
+def _(size, rng):
+    returns = rng.normal(0.01, 0.05, count(size))
+    return lambda: quantitative_methods.geometric_mean_return(returns)
+
+@case('quantitative_methods.measure_return.geometric_mean_return')
+def _(size, rng):
+    returns = rng.normal(0.01, 0.05, count(size))
+    return lambda: measure_return.geometric_mean_return(returns)
+
+@case('quantitative_methods.rolling_geometric_mean_return')
+def _(size, rng):
+    returns = rng.normal(0.01, 0.05, max(count(size), 12))
+    return lambda: quantitative_methods.rolling_geometric_mean_return(returns, 12)
+
+@case('quantitative_methods.expanding_geometric_mean_return')
+def _(size, rng):
+    returns = rng.normal(0.01, 0.05, count(size))
+    return lambda: quantitative_methods.expanding_geometric_mean_return(returns)
+
+@case('quantitative_methods.find_modes')
+def _(size, rng):
+    data = rng.integers(0, 1000, count(size))
+    return lambda: quantitative_methods.find_modes(data)
+
+@case('quantitative_methods.calculate_mode')
+def _(size, rng):
+    data = rng.integers(0, 1000, count(size))
+    return lambda: quantitative_methods.calculate_mode(data)
+
+@case('quantitative_methods.calculate_bin_width')
+def _(size, rng):
+    data = rng.normal(size=count(size))
+    return lambda: quantitative_methods.calculate_bin_width(data, 50)
+
+@case('quantitative_methods.identify_modal_interval')
+def _(size, rng):
+    data = rng.normal(size=count(size))
+    return lambda: quantitative_methods.identify_modal_interval(data, 50)
+
+@case('quantitative_methods.HistogramAccumulator')
+def _(size, rng):
+    chunks = np.array_split(rng.normal(size=count(size)), 8)
+    return lambda: quantitative_methods.HistogramAccumulator.from_chunks(chunks, 50).modal_interval()
+
+# quantitative_methods: categorical analysis, loading and charts
+
+@case('quantitative_methods.ContingencyEngine')
+def _(size, rng):
+    data = survey(rng, size)
+    return lambda: quantitative_methods.ContingencyEngine(data, data.columns).chi_square()
+
+@case('quantitative_methods.chi_square_test')
+def _(size, rng):
+    data = survey(rng, size)
+    return lambda: quantitative_methods.chi_square_test(data, list(data.columns), verbose=False)
+
+@case('quantitative_methods.contingency_table')
+def _(size, rng):
+    data = survey(rng, size)
+    return lambda: quantitative_methods.contingency_table(data, list(data.columns), verbose=False)
+
+for _name in ['heat_map', 'tree_map']:
+    def _make(size, rng, _name=_name):
+        func = getattr(quantitative_methods, _name)
+        data = survey(rng, size)
+        output_dir = scratch_dir()
+        return lambda: func(data, list(data.columns), output_dir=output_dir)
+    case(f'quantitative_methods.{_name}', max_size=LOOP_MAX)(_make)
+
+for _name in ['load_csv', 'load_data']:
+    def _make(size, rng, _name=_name):
+        func = getattr(quantitative_methods, _name)
+        path = os.path.join(scratch_dir(), 'data.csv')
+        data = survey(rng, size)
+        data['Amount'] = rng.integers(0, 1000, count(size))
+        data.to_csv(path, index=False)
+        return lambda: func(path)
+    case(f'quantitative_methods.{_name}', max_size=LOOP_MAX)(_make)
+
+for _name in ['grouped_bar_chart', 'stacked_bar_chart']:
+    def _make(size, rng, _name=_name):
+        func = getattr(quantitative_methods, _name)
+        labels = [str(i) for i in range(count(size))]
+        first, second = rng.uniform(1, 10, count(size)), rng.uniform(1, 10, count(size))
+        return png(func, labels, first, second, 'Title', 'X', 'Y')
+    case(f'quantitative_methods.{_name}', max_size=BAR_MAX)(_make)
+
+@case('quantitative_methods.bubble_line_chart', max_size=PLOT_MAX)
+def _(size, rng):
+    x, y, z = (rng.uniform(1, 100, count(size)) for _ in range(3))
+    return png(quantitative_methods.bubble_line_chart, x, y, z, 'Title', 'X', 'Y')
+
+@case('quantitative_methods.plot_histogram', max_size=LOOP_MAX)
+def _(size, rng):
+    return png(quantitative_methods.plot_histogram, rng.normal(size=count(size)), 50)
+
+@case('quantitative_methods.FigureRenderer', max_size=LOOP_MAX)
+def _(size, rng):
+    data = rng.normal(size=count(size))
+    renderer = quantitative_methods.FigureRenderer()
+    return lambda: renderer.render(lambda ax: ax.hist(data, bins=50))
+
+@case('quantitative_methods.render_batch', max_size=BAR_MAX)
+def _(size, rng):
+    labels = [str(i) for i in range(count(size))]
+    first, second = rng.uniform(1, 10, count(size)), rng.uniform(1, 10, count(size))
+    jobs = [(quantitative_methods.grouped_bar_chart, (labels, first, second, 'Title', 'X', 'Y'), {}, None)]
+    return lambda: quantitative_methods.render_batch(jobs)
+
+# economics
+
+@case('economics.calculate_own_price_elasticity')
+def _(size, rng):
+    args = (uniform(rng, size, 500, 1000), uniform(rng, size, 400, 900), uniform(rng, size, 1, 50),
+            uniform(rng, size, 51, 100))
+    return lambda: economics.calculate_own_price_elasticity(*args)
+
+@case('economics.calculate_elasticity_coefficient')
+def _(size, rng):
+    args = (uniform(rng, size, 51, 100), uniform(rng, size, 400, 900), uniform(rng, size, 500, 1000),
+            uniform(rng, size, 1, 50))
+    return lambda: economics.calculate_elasticity_coefficient(*args)
+
+for _name in ['own_price_elasticities', 'arc_elasticities', 'point_elasticities', 'find_unitary_elasticity',
+              'fit_demand', 'find_demand_function']:
+    def _make(size, rng, _name=_name):
+        func = getattr(economics, _name)
+        prices, quantities = demand_curves(rng, size)
+        return lambda: func(prices, quantities)
+    case(f'economics.{_name}', max_size=LOOP_MAX)(_make)
+
+@case('economics.DemandCurve', max_size=LOOP_MAX)
+def _(size, rng):
+    curve = economics.fit_demand(*demand_curves(rng, size))
+    grid = np.linspace(1, 100, 10)
+    return lambda: curve(grid)
+
+@case('economics.calculate_unitary_elasticity_point')
+def _(size, rng):
+    # size is the number of points on one demand curve
+    prices, quantities = demand_curves(rng, None, points=max(count(size), 3))
+    return lambda: economics.calculate_unitary_elasticity_point(prices[0], quantities[0])
+
+@case('economics.plot_demand_curve', max_size=PLOT_MAX)
+def _(size, rng):
+    prices, quantities = demand_curves(rng, None, points=max(count(size), 3))
+    return png(economics.plot_demand_curve, prices[0], quantities[0], -1.2, (50.0, 300.0))
+
+@case('economics.plot_demand_curves', max_size=PLOT_MAX)
+def _(size, rng):
+    income = np.arange(count(size), dtype=float)
+    return png(economics.plot_demand_curves, income * 2 + 10, 100 - income * 0.01, income)
+
+@case('economics.calculate_keyesian_multiplier')
+def _(size, rng):
+    mpc = uniform(rng, size, 0.1, 0.95)
+    return lambda: economics.calculate_keyesian_multiplier(mpc)
+
+@case('economics.calculate_mpc')
+def _(size, rng):
+    income, consumption = uniform(rng, size, 100, 1000), uniform(rng, size, 10, 100)
+    return lambda: economics.calculate_mpc(income, consumption)
+
+@case('economics.simulate_multiplier_effect', max_size=LOOP_MAX)
+def _(size, rng):
+    # size is the number of rounds
+    return lambda: economics.simulate_multiplier_effect(1000.0, 0.8, rounds=count(size))
+
+@case('economics.simulate_multiplier_effect_batch')
+def _(size, rng):
+    spending, mpc = uniform(rng, size, 100, 1000), uniform(rng, size, 0.1, 0.95)
+    return lambda: economics.simulate_multiplier_effect_batch(spending, mpc, rounds=20, totals_only=True)
+
+def _mpc_data(rng, size):
+    rows = count(size)
+    return pd.DataFrame({
+        'Income Level': pd.Categorical(rng.choice(['Low', 'Middle', 'High'], rows)),
+        'Income Change': rng.uniform(100, 1000, rows),
+        'Consumption Change': rng.uniform(10, 900, rows),
+    })
+
+@case('economics.analyze_mpc_data')
+def _(size, rng):
+    data = _mpc_data(rng, size)
+    return lambda: economics.analyze_mpc_data(data, verbose=False)
+
+@case('economics.analyze_mpc_data_chunked')
+def _(size, rng):
+    data = _mpc_data(rng, size)
+    chunks = [data.iloc[i:i + 10**6] for i in range(0, len(data), 10**6)]
+    return lambda: economics.analyze_mpc_data_chunked(chunks)
+
+def _productivity_panel(rng, size):
+    # Firms of 8 labor inputs each, with an S-shaped total product
+    firms = max(count(size) // 8, 1)
+    labor = np.tile(np.arange(8), firms)
+    scale = np.repeat(rng.uniform(10, 50, firms), 8)
+    return pd.DataFrame({
+        'Firm': np.repeat(np.arange(firms), 8),
+        'Labor Input': labor,
+        'Total Product': scale * labor ** 2 * (12 - labor) / 10,
+    })
+
+@case('economics.calculate_productivity_measures')
+def _(size, rng):
+    labor = np.arange(count(size))
+    return lambda: economics.calculate_productivity_measures(labor, labor * (20.0 - labor / count(size)))
+
+@case('economics.calculate_panel_productivity_measures')
+def _(size, rng):
+    panel = _productivity_panel(rng, size)
+    return lambda: economics.calculate_panel_productivity_measures(panel)
+
+@case('economics.find_diminishing_returns_onset')
+def _(size, rng):
+    measures = economics.calculate_panel_productivity_measures(_productivity_panel(rng, size))
+    return lambda: economics.find_diminishing_returns_onset(measures)
+
+@case('economics.show_diminishing_marginal_returns')
+def _(size, rng):
+    labor = np.arange(count(size))
+    measures = economics.calculate_productivity_measures(labor, labor * (20.0 - labor / count(size)))
+    return quiet(economics.show_diminishing_marginal_returns, measures)
+
+@case('economics.plot_productivity_curves', max_size=PLOT_MAX)
+def _(size, rng):
+    labor = np.arange(count(size))
+    measures = economics.calculate_productivity_measures(labor, labor * (20.0 - labor / count(size)))
+    return png(economics.plot_productivity_curves, measures)
+
+# corporate_finance
+
+@case('corporate_finance.calculate_cost')
+def _(size, rng):
+    book = quotes(rng, size)
+    if size is None:
+        args = [Decimal(str(round(value, 2))) for value in book.iloc[0]]
+    else:
+        args = [book[name].to_numpy() for name in book.columns]
+    return lambda: corporate_finance.calculate_cost(*args)
+
+@case('corporate_finance.calculate_cost_decimal', max_size=PLOT_MAX)
+def _(size, rng):
+    # size quotes priced one call at a time
+    rows = [[Decimal(str(round(value, 2))) for value in row] for row in quotes(rng, size).itertuples(index=False)]
+    return lambda: [corporate_finance.calculate_cost_decimal(*row) for row in rows]
+
+@case('corporate_finance.calculate_cost_batch')
+def _(size, rng):
+    args = [column.to_numpy() for _, column in quotes(rng, size).items()]
+    return lambda: corporate_finance.calculate_cost_batch(*args)
+
+@case('corporate_finance.calculate_quote_costs')
+def _(size, rng):
+    book = quotes(rng, size)
+    return lambda: corporate_finance.calculate_quote_costs(book)
+
+@case('corporate_finance.FundingBook', max_size=LOOP_MAX)
+def _(size, rng):
+    # Re-price one quote and re-allocate, the incremental path
+    book = corporate_finance.FundingBook(quotes(rng, size))
+    ids = book.ids
+    def run():
+        book.update_quote(ids[int(rng.integers(len(ids)))], interest=float(rng.uniform(100, 1e5)))
+        return book.allocate(book.total_capacity / 2)
+    return run
+
+@case('corporate_finance.allocate_funding', max_size=LOOP_MAX)
+def _(size, rng):
+    book = quotes(rng, size)
+    return lambda: corporate_finance.allocate_funding(book['loan_amount'].sum() / 2, book)
+
+def public_names():
+    """
+    Every public callable of the packages, as 'package.name', minus data types and
+    constants, plus the MODULE_FUNCTIONS as 'package.module.name'.
+    """
+    names = dict(MODULE_FUNCTIONS)
+    for package in PACKAGES:
+        for name in package.__all__:
+            value = getattr(package, name)
+            if isinstance(value, type) and issubclass(value, tuple):
+                continue  # namedtuple result types
+            names[f'{package.__name__}.{name}'] = value
+    return names
+
+def measure(thunk, min_time):
+    """Best wall time over repeats (after one warm-up run) and the peak traced memory of one run."""
+    thunk()
+    times = []
+    while sum(times) < min_time and len(times) < 1000:
+        start = time.perf_counter()
+        thunk()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        thunk()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak, len(times)
+
+def size_label(size):
+    return 'scalar' if size is None else size
+
+def parse_sizes(text):
+    return [None if s == 'scalar' else int(float(s)) for s in text.split(',')]
+
+def compare(results, baseline, threshold):
+    """Records that are slower, or peak higher, than the baseline by more than threshold."""
+    previous = {(r['name'], r['size']): r for r in baseline['results'] if 'seconds' in r}
+    regressions = []
+    for result in results:
+        base = previous.get((result['name'], result['size']))
+        if base is None or 'seconds' not in result:
+            continue
+        time_ratio = result['seconds'] / base['seconds']
+        if time_ratio > 1 + threshold:
+            regressions.append((result['name'], result['size'], 'time', time_ratio))
+        if max(result['peak_bytes'], base['peak_bytes']) >= MEMORY_FLOOR:
+            memory_ratio = result['peak_bytes'] / max(base['peak_bytes'], 1)
+            if memory_ratio > 1 + threshold:
+                regressions.append((result['name'], result['size'], 'memory', memory_ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='scalar,1e3,1e6,1e7', help='comma-separated sizes; scalar for one item')
+    parser.add_argument('--filter', default=None, help='only run names matching this regular expression')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds of repeats per measurement')
+    parser.add_argument('--output', default=None, help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=None, help='results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.5, help='allowed slowdown, 0.5 = 50%%')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    quantitative_methods.use_headless()
+    names = public_names()
+    missing = sorted(set(names) - set(CASES) - set(EXCLUDED))
+    if missing:
+        print(f"No benchmark case for: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    sizes = parse_sizes(args.sizes)
+    pattern = re.compile(args.filter) if args.filter else None
+    results = []
+    print(f"{'function':<58} {'size':>9} {'seconds':>11} {'items/s':>11} {'peak MB':>9}")
+    for name in sorted(CASES):
+        if pattern and not pattern.search(name):
+            continue
+        make, max_size = CASES[name]
+        # Sizes past a case's cap are measured once, at the cap
+        capped = [size if size is None else min(size, max_size) for size in sizes]
+        for size in dict.fromkeys(capped):
+            record = {'name': name, 'size': size_label(size), 'items': count(size)}
+            try:
+                thunk = make(size, np.random.default_rng(args.seed))
+                seconds, peak, repeats = measure(thunk, args.min_time)
+            except Exception as error:  # a broken function is reported, not fatal to the run
+                record['error'] = f"{type(error).__name__}: {error}"
+                print(f"{name:<58} {size_label(size):>9} {'ERROR':>11} {record['error']}")
+            else:
+                record.update(seconds=seconds, throughput=count(size) / seconds, peak_bytes=peak, repeats=repeats)
+                print(f"{name:<58} {size_label(size):>9} {seconds:>11.3e} {count(size) / seconds:>11.3e} "
+                      f"{peak / 2**20:>9.1f}")
+            results.append(record)
+
+    report = {
+        'environment': {
+            'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'machine': platform.machine(), 'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'excluded': EXCLUDED,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+
+    status = 0
+    errors = [r for r in results if 'error' in r]
+    if errors:
+        print(f"\n{len(errors)} case(s) failed", file=sys.stderr)
+        status = 1
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for name, size, kind, ratio in regressions:
+            print(f"REGRESSION {name} [{size}] {kind} x{ratio:.2f}", file=sys.stderr)
+        if regressions:
+            status = 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+"""
+Corporate finance calculators, loaded lazily (PEP 562) like the other packages.
+"""
+from lazy_exports import lazy_exports
+
+# Submodule -> public names re-exported at package level
+_SUBMODULE_EXPORTS = {
+    'funding_optimizer': ['FundingAllocation', 'FundingBook', 'allocate_funding'],
+    'short_term_funding': [
+        'calculate_cost', 'calculate_cost_decimal', 'calculate_cost_batch', 'calculate_quote_costs',
+    ],
+}
+
+__all__, __getattr__, __dir__ = lazy_exports(globals(), _SUBMODULE_EXPORTS)
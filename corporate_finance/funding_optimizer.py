@@ -0,0 +1,201 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from corporate_finance.short_term_funding import QUOTE_COLUMNS, calculate_cost_batch
+from quantitative_methods import instrumentation
+
+# Result of FundingBook.allocate: amount drawn per quote plus totals
+FundingAllocation = namedtuple('FundingAllocation', ['allocation', 'total_cost', 'average_cost', 'shortfall'])
+
+class FundingBook:
+    """
+    A book of short-term funding quotes kept sorted by cost for fast allocation.
+
+    Each quote is a line of credit, banker's acceptance or commercial paper
+    program priced with calculate_cost_batch, with a capacity (the most that can
+    be drawn on it). Costs are treated as rates, so drawing part of a quote costs
+    the same per unit as drawing all of it. Under that model filling the cheapest
+    quotes first is optimal, and the book keeps the sorted order and running
+    capacity so each allocation is a binary search. update_quote re-prices one
+    quote and moves it within the order instead of re-sorting the book.
+    """
+
+    def __init__(self, quotes):
+        """
+        Parameters:
+        quotes (pd.DataFrame): One row per quote, indexed by a unique quote id, with
+            any of the QUOTE_COLUMNS (missing ones are 0) and optionally 'capacity'.
+            The capacity defaults to the loan amount.
+        """
+        if not quotes.index.is_unique:
+            raise ValueError("Invalid quotes. Please use a unique index of quote ids.")
+        self.ids = quotes.index
+        self._fields = np.column_stack([
+            quotes[name].to_numpy(dtype=float) if name in quotes else np.zeros(len(quotes))
+            for name in QUOTE_COLUMNS
+        ])
+        capacity = quotes['capacity'] if 'capacity' in quotes else quotes['loan_amount']
+        self.capacity = np.array(capacity, dtype=float)  # a copy, since update_quote writes to it
+        self.cost = calculate_cost_batch(*self._fields.T)
+        self._order = np.lexsort((np.arange(len(self.ids)), self._sort_key(self.cost)))
+        self._sorted_cost = self._sort_key(self.cost)[self._order]
+        self._cumulative = np.cumsum(self._usable(self._order))
+
+    @staticmethod
+    def _sort_key(cost):
+        """Quotes that cannot be priced (NaN cost) sort last."""
+        return np.where(np.isnan(cost), np.inf, cost)
+
+    def _usable(self, positions):
+        """Capacity that can be drawn at the given positions; none on unpriced quotes."""
+        return np.where(np.isnan(self.cost[positions]), 0.0, np.maximum(self.capacity[positions], 0.0))
+
+    @property
+    def total_capacity(self):
+        """Total capacity of the priced quotes."""
+        return float(self._cumulative[-1]) if len(self._cumulative) else 0.0
+
+    def ranking(self):
+        """
+        The quotes from cheapest to most expensive.
+
+        Returns:
+        pd.DataFrame: cost and capacity per quote, in allocation order.
+        """
+        return pd.DataFrame(
+            {'cost': self.cost[self._order], 'capacity': self.capacity[self._order]},
+            index=self.ids[self._order],
+        )
+
+    def update_quote(self, quote_id, **fields):
+        """
+        Change one quote and re-position it in the book.
+
+        Parameters:
+        quote_id: Index label of the quote.
+        **fields: New values for any of the QUOTE_COLUMNS or 'capacity'.
+        """
+        position = self.ids.get_loc(quote_id)
+        for name, value in fields.items():
+            if name == 'capacity':
+                self.capacity[position] = value
+            elif name in QUOTE_COLUMNS:
+                self._fields[position, QUOTE_COLUMNS.index(name)] = value
+            else:
+                raise ValueError(f"Invalid quote field '{name}'. Please use one of {QUOTE_COLUMNS + ['capacity']}.")
+        self.cost[position] = calculate_cost_batch(*self._fields[position])
+
+        # Move the quote from its old slot to the slot for its new cost
+        old_slot = int(np.flatnonzero(self._order == position)[0])
+        order = np.delete(self._order, old_slot)
+        sorted_cost = np.delete(self._sorted_cost, old_slot)
+        key = self._sort_key(self.cost[position])
+        new_slot = int(np.searchsorted(sorted_cost, key, side='right'))
+        self._order = np.insert(order, new_slot, position)
+        self._sorted_cost = np.insert(sorted_cost, new_slot, key)
+
+        # Running capacity only changes from the first slot that moved
+        start = min(old_slot, new_slot)
+        base = self._cumulative[start - 1] if start else 0.0
+        self._cumulative[start:] = base + np.cumsum(self._usable(self._order[start:]))
+
+    def allocate(self, need, method='greedy'):
+        """
+        Cheapest way to raise a funding need from the book.
+
+        Parameters:
+        need (float): Amount to raise.
+        method (str): 'greedy' fills the cheapest quotes first using the sorted
+            book; 'lp' solves the same problem as a linear program with SciPy.
+
+        Returns:
+        FundingAllocation: allocation (pd.Series of amounts per quote id),
+        total_cost (sum of amount * cost), average_cost (total_cost per unit raised)
+        and shortfall (the part of the need the book cannot cover).
+        """
+        if need < 0:
+            raise ValueError("Invalid funding need. Please use a non-negative amount.")
+        amounts = np.zeros(len(self.ids))
+        if method == 'greedy':
+            # Quotes before the cut are drawn in full, the quote at the cut only in part
+            cut = int(np.searchsorted(self._cumulative, need, side='left'))
+            filled = self._order[:cut]
+            amounts[filled] = self._usable(filled)
+            if cut < len(self._order):
+                drawn = self._cumulative[cut - 1] if cut else 0.0
+                amounts[self._order[cut]] = need - drawn
+        elif method == 'lp':
+            amounts = self._solve_lp(need)
+        else:
+            raise ValueError("Invalid method. Please use 'greedy' or 'lp'.")
+
+        priced = ~np.isnan(self.cost)
+        total_cost = float(np.dot(amounts[priced], self.cost[priced]))
+        raised = amounts.sum()
+        return FundingAllocation(
+            allocation=pd.Series(amounts, index=self.ids, name='amount'),
+            total_cost=total_cost,
+            average_cost=total_cost / raised if raised else np.nan,
+            shortfall=max(need - self.total_capacity, 0.0),
+        )
+
+    def _solve_lp(self, need):
+        """Minimise sum(cost * amount) subject to sum(amount) == need and 0 <= amount <= capacity."""
+        from scipy.optimize import linprog
+        priced = np.flatnonzero(~np.isnan(self.cost))
+        amounts = np.zeros(len(self.ids))
+        if need >= self.total_capacity:
+            # Everything is drawn; skip the solver, whose bound sums can round below the cumsum
+            amounts[priced] = self._usable(priced)
+            return amounts
+        result = linprog(
+            self.cost[priced],
+            A_eq=np.ones((1, priced.size)),
+            b_eq=[need],
+            bounds=np.column_stack([np.zeros(priced.size), self._usable(priced)]),
+            method='highs',
+        )
+        instrumentation.add_iterations(result.nit)
+        if not result.success:
+            raise ValueError(f"Funding LP failed: {result.message}")
+        amounts[priced] = result.x
+        return amounts
+
+def allocate_funding(need, quotes, method='greedy'):
+    """
+    Cheapest allocation of a funding need across a book of quotes.
+
+    Parameters:
+    need (float): Amount to raise.
+    quotes (pd.DataFrame): Quotes as accepted by FundingBook.
+    method (str): 'greedy' or 'lp'.
+
+    Returns:
+    FundingAllocation: See FundingBook.allocate.
+    """
+    return FundingBook(quotes).allocate(need, method=method)
+
+if __name__ == "__main__":
+    # Example usage: a small book of facilities, then a changed CP quote
+    quotes = pd.DataFrame({
+        'interest': [1000, 500, 750, 400],
+        'commitment_fee': [50, 0, 0, 0],
+        'loan_amount': [10000, 10000, 15000, 8000],
+        'dealer_commission': [0, 0, 25, 15],
+        'backup_costs': [0, 0, 10, 5],
+        'capacity': [20000, 10000, 15000, 8000],
+    }, index=['LOC Bank A', 'BA Bank B', 'CP Program 1', 'CP Program 2'])
+
+    book = FundingBook(quotes)
+    print(book.ranking())
+    result = book.allocate(30000)
+    print(result.allocation)
+    print(f"Total cost: {result.total_cost:,.2f}, average cost: {result.average_cost:.2%}")
+
+    book.update_quote('CP Program 1', interest=300)
+    result = book.allocate(30000)
+    print(result.allocation)
+    print(f"Total cost: {result.total_cost:,.2f}, average cost: {result.average_cost:.2%}")
+    print(f"LP total cost: {book.allocate(30000, method='lp').total_cost:,.2f}")
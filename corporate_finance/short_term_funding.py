@@ -1,35 +1,125 @@
-from decimal import Decimal, getcontext
+from decimal import Context, Decimal, localcontext
 
-getcontext().prec = 6  # Set precision for decimal calculations
+import numpy as np
 
-def calculate_cost(interest, commitment_fee=0, loan_amount=0, dealer_commission=0, backup_costs=0):
+# Precision of the Decimal path; applied in a local context so other Decimal users are unaffected
+DECIMAL_PRECISION = 6
+
+# Quote columns read by calculate_quote_costs, in calculate_cost argument order
+QUOTE_COLUMNS = ['interest', 'commitment_fee', 'loan_amount', 'dealer_commission', 'backup_costs']
+
+def calculate_cost_decimal(interest, commitment_fee=0, loan_amount=0, dealer_commission=0, backup_costs=0,
+                           precision=DECIMAL_PRECISION):
     """
-    Calculates the cost of short-term funding based on different scenarios.
+    Calculates the cost of one short-term funding quote with Decimal arithmetic.
+
+    The facility is identified from the costs supplied: a commitment fee means a
+    line of credit, a dealer commission or backup costs mean commercial paper, and
+    anything else is an all-inclusive quote such as a banker's acceptance.
 
     Args:
         interest (Decimal): Interest amount.
         commitment_fee (Decimal, optional): Commitment fee for lines of credit. Defaults to 0.
-        loan_amount (Decimal, optional): Total loan amount. Defaults to 0.
+        loan_amount (Decimal): Total loan amount.
         dealer_commission (Decimal, optional): Dealer commission for commercial paper. Defaults to 0.
         backup_costs (Decimal, optional): Backup costs for commercial paper. Defaults to 0.
+        precision (int, optional): Significant digits of the result. Defaults to DECIMAL_PRECISION.
 
     Returns:
         Decimal: Calculated cost of borrowing.
     """
+    if loan_amount <= 0:
+        raise ValueError("Invalid loan amount. Please use a positive loan amount.")
 
-    if commitment_fee > 0:
-        # Line of credit with commitment fee
-        cost = (interest + commitment_fee) / loan_amount
-    elif loan_amount > 0:
+    with localcontext(Context(prec=precision)):
+        interest = Decimal(interest)
+        if commitment_fee > 0:
+            # Line of credit with commitment fee
+            return (interest + Decimal(commitment_fee)) / Decimal(loan_amount)
+
+        # Interest is deducted up front, so the borrower receives the net proceeds
+        net_proceeds = Decimal(loan_amount) - interest
+        if net_proceeds <= 0:
+            raise ValueError("Invalid interest. Please use interest below the loan amount.")
+        if dealer_commission > 0 or backup_costs > 0:
+            # Commercial paper: dealer commission and backup lines add to the cost
+            return (interest + Decimal(dealer_commission) + Decimal(backup_costs)) / net_proceeds
         # All-inclusive interest rate (e.g., Banker's Acceptances)
-        net_proceeds = loan_amount - interest
-        cost = interest / net_proceeds
-    else:
-        # All-inclusive interest rate with additional costs (e.g., Commercial Paper)
-        net_proceeds = loan_amount - interest
-        cost = (interest + dealer_commission + backup_costs) / net_proceeds
+        return interest / net_proceeds
+
+def calculate_cost_batch(interest, commitment_fee=0, loan_amount=0, dealer_commission=0, backup_costs=0):
+    """
+    Calculates the cost of many short-term funding quotes at once in float64.
+
+    Uses the same facility rules as calculate_cost_decimal, applied element-wise
+    to broadcast arrays. Quotes without a positive loan amount or net proceeds
+    get NaN instead of raising.
+
+    Args:
+        interest (array-like): Interest amounts.
+        commitment_fee (array-like, optional): Commitment fees for lines of credit. Defaults to 0.
+        loan_amount (array-like): Total loan amounts.
+        dealer_commission (array-like, optional): Dealer commissions for commercial paper. Defaults to 0.
+        backup_costs (array-like, optional): Backup costs for commercial paper. Defaults to 0.
+
+    Returns:
+        np.ndarray or pd.Series: Cost of borrowing per quote, a Series when a Series was given.
+    """
+    args = (interest, commitment_fee, loan_amount, dealer_commission, backup_costs)
+    template = next((a for a in args if hasattr(a, 'index') and hasattr(a, 'to_numpy')), None)
+    interest, commitment_fee, loan_amount, dealer_commission, backup_costs = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in args)
+    )
+
+    line_of_credit = commitment_fee > 0
+    commercial_paper = ~line_of_credit & ((dealer_commission > 0) | (backup_costs > 0))
+    numerator = interest + np.where(line_of_credit, commitment_fee, 0.0)
+    numerator = numerator + np.where(commercial_paper, dealer_commission + backup_costs, 0.0)
+    denominator = np.where(line_of_credit, loan_amount, loan_amount - interest)
+    valid = (loan_amount > 0) & (denominator > 0)
+    cost = np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=valid)
+
+    if template is not None:
+        return type(template)(cost, index=template.index)
+    return cost[()] if cost.ndim == 0 else cost
+
+def calculate_quote_costs(quotes):
+    """
+    Calculates the cost of every quote in a DataFrame.
+
+    Args:
+        quotes (pd.DataFrame): One row per quote with any of the QUOTE_COLUMNS;
+            missing columns are treated as 0.
 
-    return cost
+    Returns:
+        pd.Series: Cost of borrowing per quote, aligned with quotes.
+    """
+    import pandas as pd
+    args = [quotes[name].to_numpy() if name in quotes else 0 for name in QUOTE_COLUMNS]
+    cost = np.broadcast_to(calculate_cost_batch(*args), len(quotes))
+    return pd.Series(cost, index=quotes.index, name='cost')
+
+def calculate_cost(interest, commitment_fee=0, loan_amount=0, dealer_commission=0, backup_costs=0):
+    """
+    Calculates the cost of short-term funding based on different scenarios.
+
+    Decimal inputs are priced exactly with calculate_cost_decimal. Arrays, Series
+    and plain floats take the vectorized float64 path, calculate_cost_batch.
+
+    Args:
+        interest (Decimal or array-like): Interest amount.
+        commitment_fee (Decimal or array-like, optional): Commitment fee for lines of credit. Defaults to 0.
+        loan_amount (Decimal or array-like): Total loan amount.
+        dealer_commission (Decimal or array-like, optional): Dealer commission for commercial paper. Defaults to 0.
+        backup_costs (Decimal or array-like, optional): Backup costs for commercial paper. Defaults to 0.
+
+    Returns:
+        Decimal, float, np.ndarray or pd.Series: Calculated cost of borrowing.
+    """
+    args = (interest, commitment_fee, loan_amount, dealer_commission, backup_costs)
+    if any(isinstance(a, Decimal) for a in args) and all(np.ndim(a) == 0 for a in args):
+        return calculate_cost_decimal(*args)
+    return calculate_cost_batch(*args)
 
 # Example usage (for testing within the module)
 if __name__ == "__main__":
@@ -52,4 +142,16 @@ if __name__ == "__main__":
     loan_amount = Decimal('15000')
 
     cost_commercial_paper = calculate_cost(interest, dealer_commission=dealer_commission, backup_costs=backup_costs, loan_amount=loan_amount)
-    print(f"Cost of Commercial Paper: {cost_commercial_paper:.2%}")
\ No newline at end of file
+    print(f"Cost of Commercial Paper: {cost_commercial_paper:.2%}")
+
+    # The same three quotes priced together on the float64 path
+    import pandas as pd
+
+    quotes = pd.DataFrame({
+        'interest': [1000, 500, 750],
+        'commitment_fee': [50, 0, 0],
+        'loan_amount': [10000, 10000, 15000],
+        'dealer_commission': [0, 0, 25],
+        'backup_costs': [0, 0, 10],
+    }, index=['Line of credit', "Banker's Acceptance", 'Commercial Paper'])
+    print(calculate_quote_costs(quotes).map('{:.2%}'.format))
@@ -0,0 +1,27 @@
+"""
+Economics calculators.
+
+The public functions are loaded lazily (PEP 562), so importing the package does
+not pull in pandas, matplotlib or sympy until a function that needs them is used.
+"""
+from lazy_exports import lazy_exports
+
+# Submodule -> public names re-exported at package level
+_SUBMODULE_EXPORTS = {
+    'elasticity': [
+        'calculate_own_price_elasticity', 'calculate_elasticity_coefficient', 'calculate_unitary_elasticity_point',
+        'own_price_elasticities', 'arc_elasticities', 'point_elasticities', 'find_unitary_elasticity',
+        'plot_demand_curve', 'DemandCurve', 'fit_demand', 'find_demand_function',
+    ],
+    'law_of_diminishing_marginal_returns': [
+        'calculate_productivity_measures', 'plot_productivity_curves', 'show_diminishing_marginal_returns',
+        'calculate_panel_productivity_measures', 'find_diminishing_returns_onset',
+    ],
+    'mpc': [
+        'calculate_keyesian_multiplier', 'simulate_multiplier_effect', 'simulate_multiplier_effect_batch', 'calculate_mpc',
+        'analyze_mpc_data', 'analyze_mpc_data_chunked',
+    ],
+    'normal_inferior_goods': ['plot_demand_curves'],
+}
+
+__all__, __getattr__, __dir__ = lazy_exports(globals(), _SUBMODULE_EXPORTS)
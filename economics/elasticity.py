@@ -1,6 +1,6 @@
-import matplotlib.pyplot as plt
 import numpy as np
-from sympy import symbols, Eq, solve
+
+from quantitative_methods.rendering import finish, new_axes
 
 def calculate_own_price_elasticity(initial_quantity, final_quantity, initial_price, final_price):
     """
@@ -40,6 +40,118 @@ def calculate_elasticity_coefficient(price, quantity, initial_quantity, initial_
     elasticity = percentage_change_quantity / percentage_change_price
     return elasticity
 
+def _as_curves(prices, quantities):
+    """Broadcast prices and quantities to float arrays of shape (curves, points)."""
+    prices, quantities = np.broadcast_arrays(
+        np.atleast_2d(np.asarray(prices, dtype=float)),
+        np.atleast_2d(np.asarray(quantities, dtype=float)),
+    )
+    return prices, quantities
+
+def own_price_elasticities(prices, quantities, reference=0):
+    """
+    Calculates the own-price elasticity of every point on one or more demand curves
+    relative to a reference point, as calculate_elasticity_coefficient does per point.
+
+    Args:
+        prices (array-like): Prices, one curve per row for a batch (SKU x price grid).
+        quantities (array-like): Quantities demanded, same shape as prices.
+        reference (int): Index of the reference point on each curve.
+
+    Returns:
+        numpy array: Elasticities shaped like the curves; NaN at the reference point.
+    """
+    shape = np.broadcast_shapes(np.shape(prices), np.shape(quantities))
+    prices, quantities = _as_curves(prices, quantities)
+    p0, q0 = prices[:, reference:reference + 1], quantities[:, reference:reference + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = ((quantities - q0) / q0) / ((prices - p0) / p0)
+    return result.reshape(shape)
+
+def arc_elasticities(prices, quantities):
+    """
+    Calculates the arc (midpoint) elasticity between consecutive points on demand curves.
+
+    Args:
+        prices (array-like): Prices, one curve per row for a batch.
+        quantities (array-like): Quantities demanded, same shape as prices.
+
+    Returns:
+        numpy array: One elasticity per segment, with one fewer point per curve;
+        1-D for a single curve.
+    """
+    single = max(np.ndim(prices), np.ndim(quantities)) < 2
+    prices, quantities = _as_curves(prices, quantities)
+    dq, dp = np.diff(quantities, axis=-1), np.diff(prices, axis=-1)
+    mid_q = (quantities[:, 1:] + quantities[:, :-1]) / 2
+    mid_p = (prices[:, 1:] + prices[:, :-1]) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = (dq / mid_q) / (dp / mid_p)
+    return result[0] if single else result
+
+def point_elasticities(prices, quantities):
+    """
+    Calculates the point elasticity (dQ/dP) * (P/Q) at every point on demand curves,
+    with dQ/dP from central differences (one-sided at the ends).
+
+    Args:
+        prices (array-like): Prices, one curve per row for a batch.
+        quantities (array-like): Quantities demanded, same shape as prices.
+
+    Returns:
+        numpy array: Elasticities shaped like the curves.
+    """
+    shape = np.broadcast_shapes(np.shape(prices), np.shape(quantities))
+    prices, quantities = _as_curves(prices, quantities)
+    if prices.shape[-1] < 2:
+        return np.full(shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.gradient(quantities, axis=-1) / np.gradient(prices, axis=-1)
+        return (slope * prices / quantities).reshape(shape)
+
+def find_unitary_elasticity(prices, quantities, method='point'):
+    """
+    Locates where demand becomes unitary elastic (|elasticity| = 1) on each curve.
+
+    The first sign change of |elasticity| - 1 along the curve is found and the
+    price and quantity are linearly interpolated between the bracketing points.
+
+    Args:
+        prices (array-like): Prices, one curve per row for a batch.
+        quantities (array-like): Quantities demanded, same shape as prices.
+        method (str): 'point' for point elasticities, or 'arc' for midpoint
+            elasticities placed at the segment midpoints.
+
+    Returns:
+        tuple: (prices, quantities) arrays with one entry per curve, NaN where the
+        curve never crosses unitary elasticity.
+    """
+    prices, quantities = _as_curves(prices, quantities)
+    if method == 'point':
+        elasticity = point_elasticities(prices, quantities)
+    elif method == 'arc':
+        elasticity = arc_elasticities(prices, quantities)
+        prices = (prices[:, 1:] + prices[:, :-1]) / 2
+        quantities = (quantities[:, 1:] + quantities[:, :-1]) / 2
+    else:
+        raise ValueError("Invalid method. Please use 'point' or 'arc'.")
+
+    gap = np.abs(elasticity) - 1
+    if gap.shape[1] < 2:
+        # No segment to scan, e.g. one point, or two points with 'arc'
+        missing = np.full(gap.shape[0], np.nan)
+        return missing, missing.copy()
+    crossing = (gap[:, :-1] * gap[:, 1:] <= 0) & np.isfinite(gap[:, :-1]) & np.isfinite(gap[:, 1:])
+    found = crossing.any(axis=1)
+    i = np.argmax(crossing, axis=1)
+    rows = np.arange(gap.shape[0])
+    g0, g1 = gap[rows, i], gap[rows, i + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(g0 == g1, 0.0, g0 / (g0 - g1))
+    price = prices[rows, i] + t * (prices[rows, i + 1] - prices[rows, i])
+    quantity = quantities[rows, i] + t * (quantities[rows, i + 1] - quantities[rows, i])
+    return np.where(found, price, np.nan), np.where(found, quantity, np.nan)
+
 def calculate_unitary_elasticity_point(prices, quantities):
     """
     Calculates the price and quantity at which demand is unitary elastic.
@@ -52,17 +164,12 @@ def calculate_unitary_elasticity_point(prices, quantities):
         tuple: A tuple containing the price and quantity at unitary elasticity.
     """
 
-    for i in range(1, len(prices)):  # Start from the second price point
-        # Calculate the elasticity between the current and previous point
-        elasticity = calculate_elasticity_coefficient(prices[i], quantities[i], quantities[i - 1], prices[i - 1])
-
-        # Check if the elasticity is close to 1 (unitary elasticity)
-        if abs(elasticity - 1) < 0.01:  # Allow for small rounding errors
-            return prices[i], quantities[i]
-
-    return None, None  # Return None if no unitary elasticity point is found
+    price, quantity = find_unitary_elasticity(prices, quantities)
+    if np.isnan(price[0]):
+        return None, None  # Return None if no unitary elasticity point is found
+    return float(price[0]), float(quantity[0])
 
-def plot_demand_curve(prices, quantities, elasticity, unitary_elasticity_point):
+def plot_demand_curve(prices, quantities, elasticity, unitary_elasticity_point, ax=None, output=None):
     """
     Plots a demand curve and highlights the elasticity point and unitary elasticity point.
 
@@ -71,46 +178,156 @@ def plot_demand_curve(prices, quantities, elasticity, unitary_elasticity_point):
         quantities (list): A list of corresponding quantities demanded.
         elasticity (float): The own-price elasticity of demand.
         unitary_elasticity_point (tuple): A tuple containing the price and quantity at unitary elasticity.
+        ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
+        output (str or file-like, optional): Write the chart here instead of showing it.
     """
 
-    plt.figure(figsize=(8, 6))
-    plt.plot(prices, quantities, label="Demand Curve")
-    plt.xlabel("Price")
-    plt.ylabel("Quantity Demanded")
-    plt.title("Demand Curve with Elasticity and Unitary Elasticity Points")
+    fig, ax, owned = new_axes(ax, figsize=(8, 6))
+    ax.plot(prices, quantities, label="Demand Curve")
+    ax.set_xlabel("Price")
+    ax.set_ylabel("Quantity Demanded")
+    ax.set_title("Demand Curve with Elasticity and Unitary Elasticity Points")
 
     # Find the point on the curve with the given elasticity
     elasticity_point = np.interp(elasticity, quantities, prices)
     elasticity_quantity = np.interp(elasticity_point, prices, quantities)
 
     # Highlight the elasticity point
-    plt.scatter(elasticity_point, elasticity_quantity, color="red", label="Elasticity Point")
+    ax.scatter(elasticity_point, elasticity_quantity, color="red", label="Elasticity Point")
 
     # Highlight the unitary elasticity point
     if unitary_elasticity_point:
         unitary_price, unitary_quantity = unitary_elasticity_point
-        plt.scatter(unitary_price, unitary_quantity, color="green", label="Unitary Elasticity Point")
+        ax.scatter(unitary_price, unitary_quantity, color="green", label="Unitary Elasticity Point")
+
+    ax.legend()
+    ax.grid(True)
+    return finish(fig, output, owned)
+
+# Demand forms as (transform of price, transform of quantity, inverse of the quantity transform)
+DEMAND_FORMS = {
+    'linear': (lambda p: p, lambda q: q, lambda y: y),          # Q = a + b * P
+    'log-log': (np.log, np.log, np.exp),                       # ln Q = a + b * ln P, elasticity b
+    'semi-log': (lambda p: p, np.log, np.exp),                 # ln Q = a + b * P
+}
 
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+class DemandCurve:
+    """
+    Fitted demand curves for one or more SKUs, callable on prices.
+
+    Attributes:
+        form (str): 'linear', 'log-log' or 'semi-log'.
+        intercept (numpy array): Intercept a of each curve.
+        slope (numpy array): Slope b of each curve.
+        r_squared (numpy array): Goodness of fit of each curve in the transformed space.
+        single (bool): True when fitted from one 1-D curve; calls then return arrays
+            shaped like the prices instead of (curves, points).
+    """
+
+    def __init__(self, form, intercept, slope, r_squared, single=False):
+        self.form = form
+        self.intercept = intercept
+        self.slope = slope
+        self.r_squared = r_squared
+        self.single = single
+        self._price_transform, _, self._inverse = DEMAND_FORMS[form]
+
+    def __call__(self, prices):
+        """
+        Evaluates the quantity demanded.
+
+        Args:
+            prices (array-like): A price grid shared by every curve, or one row of prices per curve.
+
+        Returns:
+            numpy array: Quantities of shape (curves, points); shaped like the prices
+            for a single curve called on a scalar or 1-D grid.
+        """
+        x = self._price_transform(np.atleast_2d(np.asarray(prices, dtype=float)))
+        quantities = self._inverse(self.intercept[:, None] + self.slope[:, None] * x)
+        if self.single and np.ndim(prices) <= 1:
+            return quantities[0].reshape(np.shape(prices))[()]
+        return quantities
+
+    def __len__(self):
+        return len(self.intercept)
+
+    def __str__(self):
+        templates = {
+            'linear': "Q = {a:.6g} {op} {b:.6g}*P",
+            'log-log': "Q = exp({a:.6g}) * P**{slope:.6g}",
+            'semi-log': "Q = exp({a:.6g} {op} {b:.6g}*P)",
+        }
+        return "\n".join(
+            templates[self.form].format(a=a, b=abs(b), slope=b, op='-' if b < 0 else '+')
+            for a, b in zip(self.intercept, self.slope)
+        )
+
+    def to_sympy(self, index=0):
+        """
+        Returns the demand function of one curve as a SymPy expression in p (requires sympy).
+        """
+        from sympy import exp, symbols
+
+        p = symbols('p')
+        a, b = float(self.intercept[index]), float(self.slope[index])
+        if self.form == 'linear':
+            return a + b * p
+        if self.form == 'log-log':
+            return exp(a) * p ** b
+        return exp(a + b * p)
+
+def fit_demand(prices, quantities, form='linear'):
+    """
+    Fits demand curves by least squares, for many SKUs at once.
+
+    Each curve is a simple regression of the transformed quantity on the
+    transformed price, solved in closed form along the last axis. NaN points are
+    ignored, so curves of different lengths can be padded with NaN.
+
+    Args:
+        prices (array-like): Prices, one curve per row for a batch (SKU x points).
+        quantities (array-like): Quantities demanded, same shape as prices.
+        form (str): 'linear', 'log-log' (constant elasticity) or 'semi-log'.
+
+    Returns:
+        DemandCurve: The fitted coefficients, callable on new prices.
+    """
+    if form not in DEMAND_FORMS:
+        raise ValueError(f"Invalid form. Please use one of {', '.join(DEMAND_FORMS)}.")
+    price_transform, quantity_transform, _ = DEMAND_FORMS[form]
+    single = np.ndim(prices) <= 1 and np.ndim(quantities) <= 1
+    prices, quantities = _as_curves(prices, quantities)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x, y = price_transform(prices), quantity_transform(quantities)
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+
+    n = valid.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean, y_mean = x.sum(axis=-1) / n, y.sum(axis=-1) / n
+        dx = np.where(valid, x - x_mean[:, None], 0.0)
+        dy = np.where(valid, y - y_mean[:, None], 0.0)
+        sxx, syy, sxy = (dx * dx).sum(axis=-1), (dy * dy).sum(axis=-1), (dx * dy).sum(axis=-1)
+        slope = sxy / sxx
+        r_squared = sxy * sxy / (sxx * syy)
+    intercept = y_mean - slope * x_mean
+    return DemandCurve(form, intercept, slope, r_squared, single)
 
 def find_demand_function(prices, quantities):
     """
-    Finds a linear demand function using SymPy.
+    Finds a linear demand function Q = a + b * P by least squares.
 
     Args:
         prices (list): A list of prices.
         quantities (list): A list of corresponding quantities demanded.
 
     Returns:
-        sympy.core.expr.Expr: The demand function.
+        DemandCurve: The fitted demand function; call it on prices, print it, or use
+        to_sympy() for a SymPy expression.
     """
 
-    p = symbols('p')
-    q = symbols('q')
-    equation = Eq(q, prices[0] - (prices[0] - prices[1]) / (quantities[0] - quantities[1]) * (p - quantities[0]))
-    return solve(equation, q)[0]
+    return fit_demand(prices, quantities, 'linear')
 
 if __name__ == "__main__":
     # Example usage:
@@ -126,10 +343,11 @@ if __name__ == "__main__":
     prices = [5, 6, 7, 8, 9, 10, 11, 12]
     quantities = [120, 110, 100, 90, 80, 70, 60, 50]
 
-    # Calculate the elasticity coefficient at each point
-    for i in range(len(prices)):
-        coefficient = calculate_elasticity_coefficient(prices[i], quantities[i], quantities[0], prices[0])
-        print(f"Elasticity coefficient at price {prices[i]}: {coefficient:.2f}")
+    # Calculate the elasticity coefficient at each point relative to the first one
+    coefficients = own_price_elasticities(prices, quantities)
+    for price, coefficient in zip(prices, coefficients):
+        print(f"Elasticity coefficient at price {price}: {coefficient:.2f}")
+    print(f"Point elasticities: {np.round(point_elasticities(prices, quantities), 2)}")
 
     # Calculate the unitary elasticity point
     unitary_price, unitary_quantity = calculate_unitary_elasticity_point(prices, quantities)
@@ -1,5 +1,27 @@
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from quantitative_methods.rendering import finish, new_axes
+
+def _average_and_marginal_product(labor_input, total_product, first):
+  """
+  Computes average and marginal product arrays for schedules laid end to end.
+
+  Args:
+    labor_input: Float array of labor inputs, sorted within each schedule.
+    total_product: Float array of total product values.
+    first: Boolean array marking the first row of each schedule.
+
+  Returns:
+    A tuple (average_product, marginal_product). Average product is NaN at zero
+    labor, and marginal product is 0 on the first row of each schedule.
+  """
+  average_product = np.divide(total_product, labor_input, out=np.full_like(total_product, np.nan), where=labor_input != 0)
+  d_labor = np.diff(labor_input, prepend=np.nan)
+  d_product = np.diff(total_product, prepend=np.nan)
+  step = ~first & (d_labor != 0)
+  marginal_product = np.divide(d_product, d_labor, out=np.zeros_like(total_product), where=step)
+  return average_product, marginal_product
 
 def calculate_productivity_measures(labor_input, total_product):
   """
@@ -10,15 +32,16 @@ def calculate_productivity_measures(labor_input, total_product):
     total_product: A list of total product values corresponding to the labor inputs.
 
   Returns:
-    A pandas DataFrame containing the calculated productivity measures.
+    A pandas DataFrame containing the calculated productivity measures. Average
+    product is NaN at zero labor; marginal product is the change in total product
+    per unit of labor, 0 for the first labor input.
   """
 
-  # Calculate average product
-  average_product = [total_product[i] / labor_input[i] for i in range(len(labor_input))]
-
-  # Calculate marginal product
-  marginal_product = [total_product[i] - total_product[i-1] for i in range(1, len(total_product))]
-  marginal_product.insert(0, 0)  # Add a 0 for the first labor input
+  labor = np.asarray(labor_input, dtype=float)
+  product = np.asarray(total_product, dtype=float)
+  first = np.zeros(len(labor), dtype=bool)
+  first[:1] = True
+  average_product, marginal_product = _average_and_marginal_product(labor, product, first)
 
   # Create a pandas DataFrame
   df = pd.DataFrame({
@@ -30,25 +53,80 @@ def calculate_productivity_measures(labor_input, total_product):
 
   return df
 
-def plot_productivity_curves(df):
+def calculate_panel_productivity_measures(panel, firm='Firm', labor='Labor Input', output='Total Product'):
+  """
+  Calculates average and marginal product for many firms' production schedules at once.
+
+  Args:
+    panel: A long-format pandas DataFrame with one row per (firm, labor input).
+    firm: Name of the firm column.
+    labor: Name of the labor input column.
+    output: Name of the total product column.
+
+  Returns:
+    The panel sorted by firm and labor input, with 'Average Product' and
+    'Marginal Product' columns added.
+  """
+  df = panel.sort_values([firm, labor], kind='stable', ignore_index=True)
+  codes = pd.factorize(df[firm])[0]
+  first = np.ones(len(df), dtype=bool)
+  first[1:] = codes[1:] != codes[:-1]
+  average_product, marginal_product = _average_and_marginal_product(
+    df[labor].to_numpy(dtype=float), df[output].to_numpy(dtype=float), first
+  )
+  df['Average Product'] = average_product
+  df['Marginal Product'] = marginal_product
+  return df
+
+def find_diminishing_returns_onset(df, firm='Firm', labor='Labor Input', output='Total Product'):
+  """
+  Finds where diminishing marginal returns set in for each firm.
+
+  The onset is the last labor input before marginal product first falls, i.e.
+  the peak of the marginal product curve and the inflection point of total product.
+
+  Args:
+    df: The result of calculate_panel_productivity_measures.
+    firm: Name of the firm column.
+    labor: Name of the labor input column.
+    output: Name of the total product column.
+
+  Returns:
+    A DataFrame indexed by firm with the labor input, total product and marginal
+    product at the onset; NaN for firms whose marginal product never falls.
+  """
+  codes, firms = pd.factorize(df[firm])
+  marginal_product = df['Marginal Product'].to_numpy()
+  falling = np.flatnonzero((np.diff(marginal_product) < 0) & (codes[1:] == codes[:-1]))
+  # First falling step of each firm; the onset is the row before it
+  firm_of_step, first_step = np.unique(codes[falling + 1], return_index=True)
+  onset = falling[first_step]
+
+  result = pd.DataFrame(np.nan, index=pd.Index(firms, name=firm), columns=[labor, output, 'Marginal Product'])
+  result.iloc[firm_of_step] = df[[labor, output, 'Marginal Product']].to_numpy(dtype=float)[onset]
+  return result
+
+def plot_productivity_curves(df, ax=None, output=None):
   """
   Plots the total product, average product, and marginal product curves.
 
   Args:
     df: A pandas DataFrame containing the productivity measures.
+    ax: Optional matplotlib axes to draw into instead of a new figure.
+    output: Optional path or file-like object to write the chart to instead of showing it.
   """
 
-  plt.figure(figsize=(10, 6))
-  plt.plot(df['Labor Input'], df['Total Product'], label='Total Product')
-  plt.plot(df['Labor Input'], df['Average Product'], label='Average Product')
-  plt.plot(df['Labor Input'], df['Marginal Product'], label='Marginal Product')
+  fig, ax, owned = new_axes(ax, figsize=(10, 6))
+  ax.plot(df['Labor Input'], df['Total Product'], label='Total Product')
+  ax.plot(df['Labor Input'], df['Average Product'], label='Average Product')
+  ax.plot(df['Labor Input'], df['Marginal Product'], label='Marginal Product')
 
-  plt.xlabel('Labor Input')
-  plt.ylabel('Output')
-  plt.title('Productivity Curves')
-  plt.legend()
-  plt.grid(True)
-  plt.show()
+  ax.set_xlabel('Labor Input')
+  ax.set_ylabel('Output')
+  ax.set_title('Productivity Curves')
+  ax.legend()
+  ax.grid(True)
+  return finish(fig, output, owned)
 
 def show_diminishing_marginal_returns(df):
   """
@@ -56,12 +134,17 @@ def show_diminishing_marginal_returns(df):
 
   Args:
     df: A pandas DataFrame containing the productivity measures.
+
+  Returns:
+    True if marginal product never rises from one labor input to the next.
   """
 
-  if all(df['Marginal Product'][i] >= df['Marginal Product'][i+1] for i in range(len(df['Marginal Product']) - 1)):
+  present = bool(np.all(np.diff(df['Marginal Product'].to_numpy()) <= 0))
+  if present:
     print("Diminishing marginal returns are present.")
   else:
     print("Diminishing marginal returns are not present.")
+  return present
 
 if __name__ == "__main__":
   # Example usage
@@ -72,4 +155,13 @@ if __name__ == "__main__":
   print(productivity_df)
 
   plot_productivity_curves(productivity_df)
-  show_diminishing_marginal_returns(productivity_df)
\ No newline at end of file
+  show_diminishing_marginal_returns(productivity_df)
+
+  # Panel of firms: onset of diminishing returns per firm
+  panel = pd.DataFrame({
+    'Firm': ['A'] * 8 + ['B'] * 8,
+    'Labor Input': labor_input * 2,
+    'Total Product': total_product + [0, 30, 55, 75, 90, 100, 105, 108],
+  })
+  panel_df = calculate_panel_productivity_measures(panel)
+  print(find_diminishing_returns_onset(panel_df))
\ No newline at end of file
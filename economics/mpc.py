@@ -23,11 +23,38 @@ def simulate_multiplier_effect(initial_spending, mpc, rounds=5):
   Returns:
     A list of total spending for each round, including the initial spending.
   """
-  total_spending = [initial_spending]
-  for _ in range(rounds):
-    new_spending = total_spending[-1] * mpc
-    total_spending.append(total_spending[-1] + new_spending)
-  return total_spending
+  return simulate_multiplier_effect_batch(initial_spending, mpc, rounds)[0].tolist()
+
+def simulate_multiplier_effect_batch(initial_spending, mpc, rounds=5, totals_only=False):
+  """Simulates the multiplier effect for many (initial spending, MPC) scenarios at once.
+
+  Round k adds initial_spending * mpc ** k, so the cumulative spending after k
+  rounds is the geometric series initial_spending * (1 - mpc ** (k + 1)) / (1 - mpc),
+  which converges to initial_spending * calculate_keyesian_multiplier(mpc).
+
+  Args:
+    initial_spending: Initial spending, a scalar or one value per scenario.
+    mpc: The MPC, a scalar or one value per scenario.
+    rounds: The number of rounds to simulate.
+    totals_only: Return only the cumulative spending after the last round, without
+      building the scenarios x rounds matrix.
+
+  Returns:
+    An array of shape (scenarios, rounds + 1) with the cumulative spending after
+    each round, or of shape (scenarios,) when totals_only is True.
+  """
+  initial_spending, mpc = np.broadcast_arrays(
+    np.atleast_1d(np.asarray(initial_spending, dtype=float)),
+    np.atleast_1d(np.asarray(mpc, dtype=float)),
+  )
+  exponents = rounds + 1 if totals_only else np.arange(1, rounds + 2)
+  if not totals_only:
+    initial_spending, mpc = initial_spending[:, None], mpc[:, None]
+  one = mpc == 1
+  # (1 - mpc ** k) / (1 - mpc) tends to k as mpc -> 1
+  with np.errstate(divide='ignore', invalid='ignore'):
+    series = np.where(one, exponents, (1 - mpc ** exponents) / np.where(one, 1.0, 1 - mpc))
+  return initial_spending * series
 
 def calculate_mpc(income_change, consumption_change):
   """
@@ -42,31 +69,100 @@ def calculate_mpc(income_change, consumption_change):
   """
   return consumption_change / income_change
 
-def analyze_mpc_data(data):
+def _keys(keys):
+  """Group keys as a list; a single column name is one key."""
+  return [keys] if isinstance(keys, str) else list(keys)
+
+def _mpc_sums(data, keys):
+  """Single grouped pass: consumption and income change sums and row counts per group."""
+  data = data[keys + ['Consumption Change', 'Income Change']]
+  # Group on categorical codes rather than raw strings
+  data = data.astype({key: 'category' for key in keys if not isinstance(data[key].dtype, pd.CategoricalDtype)})
+  return data.groupby(keys, observed=True).agg(
+    consumption_change=('Consumption Change', 'sum'),
+    income_change=('Income Change', 'sum'),
+    count=('Income Change', 'size'),
+  )
+
+def _with_categories(index, categories):
+  """The grouped index with each level recoded to the given categories."""
+  levels = [pd.Categorical(index.get_level_values(i), categories=level) for i, level in enumerate(categories)]
+  if len(levels) == 1:
+    return pd.CategoricalIndex(levels[0], name=index.names[0])
+  return pd.MultiIndex.from_arrays(levels, names=index.names)
+
+def _merge_sums(totals, sums):
+  """Adds the grouped sums of a chunk to the running totals, unioning the key categories."""
+  categories = []
+  for i in range(totals.index.nlevels):
+    left = totals.index.get_level_values(i).categories
+    right = sums.index.get_level_values(i).categories
+    if left.equals(right):
+      categories.append(left)
+    else:
+      categories.append(left.union(right))  # sorted, as one astype('category') over all rows gives
+  totals = totals.set_axis(_with_categories(totals.index, categories))
+  sums = sums.set_axis(_with_categories(sums.index, categories))
+  return pd.concat([totals, sums]).groupby(level=list(range(len(categories))), observed=True).sum()
+
+def _mpc_summary(sums):
+  """Adds MPC and multiplier columns to grouped sums."""
+  summary = sums.copy()
+  summary['mpc'] = calculate_mpc(summary['income_change'], summary['consumption_change'])
+  summary['multiplier'] = calculate_keyesian_multiplier(summary['mpc'])
+  return summary
+
+def analyze_mpc_data(data, keys=('Income Level',), verbose=True):
   """
   Analyzes MPC data and provides insights.
 
   Args:
     data: A pandas DataFrame containing income change and consumption change data.
+    keys: Column or columns to group by, e.g. ('Income Level', 'Region', 'Period').
+    verbose: Print the average MPC and the MPC of each group.
 
   Returns:
-    A summary of the analysis, including average MPC, MPC by income level, and potential economic implications.
+    A DataFrame indexed by keys with the consumption and income change sums, the
+    row count, the MPC and the Keynesian multiplier of each group.
+  """
+  keys = _keys(keys)
+  summary = _mpc_summary(_mpc_sums(data, keys))
+
+  if verbose:
+    average_mpc = summary['consumption_change'].sum() / summary['income_change'].sum()
+    print(f"Average MPC: {average_mpc:.2f}")
+    print(f"\nMPC by {', '.join(keys)}:")
+    print(summary['mpc'])
+
+  return summary
+
+def analyze_mpc_data_chunked(chunks, keys=('Income Level',)):
   """
-  # Calculate average MPC
-  average_mpc = data['Consumption Change'].sum() / data['Income Change'].sum()
+  Analyzes MPC data that does not fit in memory, one chunk at a time.
 
-  # Group data by income level and calculate MPC for each group
-  mpc_by_income = data.groupby('Income Level')['Consumption Change'].sum() / data.groupby('Income Level')['Income Change'].sum()
+  Each chunk is reduced to per-group sums and counts, which are folded into a
+  running total, so only one chunk and the group totals are held in memory.
+  The MPC is taken from the merged sums, so the result equals analyze_mpc_data
+  on the concatenated data.
 
-  # Provide insights based on the analysis
-  print(f"Average MPC: {average_mpc:.2f}")
-  print("\nMPC by Income Level:")
-  print(mpc_by_income)
+  Args:
+    chunks: An iterable of DataFrames, e.g. pd.read_csv(path, chunksize=10_000_000).
+    keys: Column or columns to group by.
 
-  # Additional insights could be added here, such as:
-  # - Identifying potential trends in MPC based on income level
-  # - Relating MPC to economic indicators like GDP growth
-  # - Suggesting potential policy implications based on the MPC analysis
+  Returns:
+    The same DataFrame as analyze_mpc_data.
+  """
+  keys = _keys(keys)
+  totals = None
+  for chunk in chunks:
+    sums = _mpc_sums(chunk, keys)
+    if totals is None:
+      totals = sums
+    else:
+      totals = _merge_sums(totals, sums)
+  if totals is None:
+    raise ValueError("No data to analyze.")
+  return _mpc_summary(totals.sort_index())
 
 if __name__ == "__main__":
   # Example usage:
@@ -78,6 +174,19 @@ if __name__ == "__main__":
 
   analyze_mpc_data(data)
 
+  # Chunked analysis over a larger panel gives the same result as a single pass
+  rng = np.random.default_rng(0)
+  panel = pd.DataFrame({
+    'Income Change': rng.uniform(100, 5000, 100_000),
+    'Income Level': rng.choice(['Low', 'Medium', 'High'], 100_000),
+    'Region': rng.choice(['North', 'South'], 100_000),
+  })
+  panel['Consumption Change'] = panel['Income Change'] * rng.uniform(0.4, 0.95, 100_000)
+  keys = ('Income Level', 'Region')
+  chunked = analyze_mpc_data_chunked((panel[i:i + 25_000] for i in range(0, len(panel), 25_000)), keys)
+  print(chunked)
+  print(f"Matches single pass: {np.allclose(chunked['mpc'], analyze_mpc_data(panel, keys, verbose=False)['mpc'])}")
+
   # Example usage of Keynesian multiplier functions
   mpc = 0.75  # Marginal propensity to consume
   initial_spending = 100  # Initial government spending
@@ -88,4 +197,10 @@ if __name__ == "__main__":
   spending_rounds = simulate_multiplier_effect(initial_spending, mpc, rounds=5)
   print("Total Spending per Round:")
   for i, spending in enumerate(spending_rounds):
-    print(f"Round {i+1}: ${spending:,.2f}")
\ No newline at end of file
+    print(f"Round {i+1}: ${spending:,.2f}")
+
+  # Batched policy sweep: after enough rounds the totals reach spending * multiplier
+  mpcs = np.linspace(0.5, 0.9, 5)
+  totals = simulate_multiplier_effect_batch(initial_spending, mpcs, rounds=1000, totals_only=True)
+  expected = initial_spending * calculate_keyesian_multiplier(mpcs)
+  print(f"\nTotals after 1000 rounds match the multiplier: {np.allclose(totals, expected)}")
\ No newline at end of file
@@ -1,6 +1,6 @@
-import matplotlib.pyplot as plt
+from quantitative_methods.rendering import finish, new_axes
 
-def plot_demand_curves(normal_demand, inferior_demand, income_levels):
+def plot_demand_curves(normal_demand, inferior_demand, income_levels, ax=None, output=None):
     """
     Plots the demand curves for normal and inferior goods.
 
@@ -8,19 +8,22 @@ def plot_demand_curves(normal_demand, inferior_demand, income_levels):
         normal_demand (list): Demand values for the normal good at each income level.
         inferior_demand (list): Demand values for the inferior good at each income level.
         income_levels (list): List of income levels.
+        ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
+        output (str or file-like, optional): Write the chart here instead of showing it.
 
     Returns:
-        None
+        The output, or None when the chart was shown.
     """
 
-    plt.plot(income_levels, normal_demand, label="Normal Good")
-    plt.plot(income_levels, inferior_demand, label="Inferior Good")
+    fig, ax, owned = new_axes(ax)
+    ax.plot(income_levels, normal_demand, label="Normal Good")
+    ax.plot(income_levels, inferior_demand, label="Inferior Good")
 
-    plt.xlabel("Income")
-    plt.ylabel("Demand")
-    plt.title("Demand for Normal and Inferior Goods")
-    plt.legend()
-    plt.show()
+    ax.set_xlabel("Income")
+    ax.set_ylabel("Demand")
+    ax.set_title("Demand for Normal and Inferior Goods")
+    ax.legend()
+    return finish(fig, output, owned)
 
 # Example usage:
 if __name__ == "__main__":
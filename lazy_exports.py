@@ -0,0 +1,36 @@
+"""
+Lazy package exports (PEP 562) shared by the quantitative_methods, economics
+and corporate_finance packages.
+"""
+import importlib
+
+def lazy_exports(namespace, submodule_exports):
+    """
+    Build the lazy export hooks of a package.
+
+    A name is imported from its submodule the first time it is used and then
+    cached in the package namespace, so later lookups skip __getattr__.
+
+    Parameters:
+    namespace (dict): The package's globals().
+    submodule_exports (dict): Submodule -> public names re-exported at package level.
+
+    Returns:
+    tuple: (__all__, __getattr__, __dir__) to assign in the package.
+    """
+    package = namespace['__name__']
+    exports = {name: module for module, names in submodule_exports.items() for name in names}
+    names = sorted(exports)
+
+    def __getattr__(name):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{package}.{module}"), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(names))
+
+    return names, __getattr__, __dir__
@@ -16,11 +16,11 @@ if __name__ == "__main__":
   # Example usage:
   piggy_bank_nominal_rate = 0.0495
   piggy_bank_compounding_periods = 12  # Monthly compounding
-  piggy_bank_ear = calculate_effective_annual_rate(piggy_bank_nominal_rate, piggy_bank_compounding_periods)
+  piggy_bank_ear = calculate_EAR(piggy_bank_nominal_rate, piggy_bank_compounding_periods)
 
   porky_bank_nominal_rate = 0.05
   porky_bank_compounding_periods = 2  # Semi-annual compounding
-  porky_bank_ear = calculate_effective_annual_rate(porky_bank_nominal_rate, porky_bank_compounding_periods)
+  porky_bank_ear = calculate_EAR(porky_bank_nominal_rate, porky_bank_compounding_periods)
 
   print("Piggy Bank EAR:", piggy_bank_ear * 100, "%")
   print("Porky Bank EAR:", porky_bank_ear * 100, "%")
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Quantitative methods calculators.
+
+The public functions are loaded lazily (PEP 562): importing the package only
+imports a submodule when one of its names is first used, so calculators such as
+calculate_EAR do not pull in matplotlib, seaborn, scipy or squarify.
+"""
+from lazy_exports import lazy_exports
+
+# Submodule -> public names re-exported at package level. Names that clash with a
+# submodule (present_value, money_weighted_rate_of_return) are left on their modules.
+_SUBMODULE_EXPORTS = {
+    'EAR': ['calculate_EAR'],
+    'annuity': ['calculate_annuity_pv', 'calculate_annuity_fv', 'calculate_annuity_due_pv', 'calculate_annuity_due_fv'],
+    'calculate_mean': [
+        'arithmetic_mean', 'geometric_mean', 'harmonic_mean', 'geometric_mean_return',
+        'rolling_geometric_mean_return', 'expanding_geometric_mean_return',
+        'ArithmeticMeanAccumulator', 'GeometricMeanAccumulator', 'HarmonicMeanAccumulator',
+        'GeometricMeanReturnAccumulator',
+    ],
+    'charting': [
+        'load_data', 'chi_square_test', 'contingency_table', 'heat_map', 'tree_map',
+        'grouped_bar_chart', 'stacked_bar_chart', 'bubble_line_chart',
+    ],
+    'contingency': ['ContingencyEngine'],
+    'data_loader': ['load_csv'],
+    'discount_table': ['DiscountFactorTable'],
+    'irr_engine': ['npv', 'npv_with_derivative', 'irr', 'xnpv', 'xirr'],
+    'measure_return': [
+        'holding_period_return', 'annualized_return', 'arithmetic_mean_return', 'real_return', 'leveraged_return',
+    ],
+    'mode_analysis': [
+        'find_modes', 'calculate_mode', 'HistogramAccumulator', 'calculate_bin_width',
+        'identify_modal_interval', 'plot_histogram',
+    ],
+    'money_weighted_rate_of_return': ['calculate_pv_outflows', 'calculate_pv_inflows', 'calculate_mwrr', 'calculate_mwrr_batch'],
+    'nominal_risk_free_rate': ['calculate_total_interest_rate', 'calculate_nominal_risk_free_rate'],
+    'perpetuity': ['calculate_perpetuity_pv', 'calculate_growing_perpetuity_pv'],
+    'present_value': ['calculate_present_value'],
+    'rendering': ['FigureRenderer', 'render_batch', 'use_headless'],
+    'required_rate_of_return': [
+        'calculate_required_rate_of_return', 'calculate_maturity_risk_premium', 'calculate_default_risk_premium',
+        'RatingIndex', 'BUILD_UP_COLUMNS', 'calculate_required_return_matrix',
+    ],
+    'series_of_cashflow': ['calculate_future_value', 'calculate_future_value_batch'],
+    'time_value_of_money': [
+        'future_value', 'payment', 'future_value_with_payment', 'present_value_with_payment',
+        'calculate_future_value_of_uneven_cash_flows',
+    ],
+    'tvm_kernel': [
+        'TVMFactors', 'tvm_factors', 'tvm_grid', 'annuity_pv', 'annuity_fv', 'perpetuity_pv', 'future_value_series',
+    ],
+    'uneven_cash_flows': [
+        'LedgerValues', 'ledger_offsets', 'pack_ledgers', 'calculate_ledger_values', 'CashFlowAccumulator',
+    ],
+    'wealth_simulation': ['WealthPaths', 'simulate_wealth', 'wealth_quantiles', 'project_wealth'],
+}
+
+__all__, __getattr__, __dir__ = lazy_exports(globals(), _SUBMODULE_EXPORTS)
@@ -1,4 +1,4 @@
-import pandas as pd
+from quantitative_methods import tvm_kernel
 
 def calculate_annuity_pv(pmt, r, n):
   """Calculates the present value of an ordinary annuity.
@@ -11,7 +11,7 @@ def calculate_annuity_pv(pmt, r, n):
   Returns:
     The present value of the annuity.
   """
-  return pmt * (1 - (1 + r)**-n) / r
+  return tvm_kernel.annuity_pv(pmt, r, n)
 
 def calculate_annuity_fv(pmt, r, n):
   """Calculates the future value of an ordinary annuity.
@@ -24,7 +24,7 @@ def calculate_annuity_fv(pmt, r, n):
   Returns:
     The future value of the annuity.
   """
-  return pmt * ((1 + r)**n - 1) / r
+  return tvm_kernel.annuity_fv(pmt, r, n)
 
 def calculate_annuity_due_pv(pmt, r, n):
   """Calculates the present value of an annuity due.
@@ -37,7 +37,7 @@ def calculate_annuity_due_pv(pmt, r, n):
   Returns:
     The present value of the annuity due.
   """
-  return calculate_annuity_pv(pmt, r, n) * (1 + r)
+  return tvm_kernel.annuity_pv(pmt, r, n, due=True)
 
 def calculate_annuity_due_fv(pmt, r, n):
   """Calculates the future value of an annuity due.
@@ -50,7 +50,7 @@ def calculate_annuity_due_fv(pmt, r, n):
   Returns:
     The future value of the annuity due.
   """
-  return calculate_annuity_fv(pmt, r, n) * (1 + r)
+  return tvm_kernel.annuity_fv(pmt, r, n, due=True)
 
 if __name__ == "__main__":
   # Example usage for testing
@@ -1,3 +1,104 @@
+import numpy as np
+
+class _MeanAccumulator:
+  """Streaming mean over a transformed space, mergeable across workers.
+
+  Subclasses define _transform (applied to each chunk before summing) and
+  _finish (maps the mean in the transformed space back to the result).
+  """
+
+  name = "Mean"
+
+  def __init__(self):
+    self.count = 0
+    self.total = 0.0
+
+  def _transform(self, chunk):
+    return chunk
+
+  def _finish(self, mean):
+    return mean
+
+  def update(self, chunk):
+    """Adds a chunk (scalar, list or NumPy array) to the running totals.
+
+    Returns:
+      The accumulator itself, so calls can be chained.
+    """
+    chunk = np.asarray(chunk, dtype=float).ravel()
+    if chunk.size:
+      self.total += float(np.sum(self._transform(chunk)))
+      self.count += chunk.size
+    return self
+
+  def merge(self, other):
+    """Folds the totals of another accumulator of the same type into this one.
+
+    Returns:
+      The accumulator itself, so calls can be chained.
+    """
+    if type(other) is not type(self):
+      raise TypeError(f"Cannot merge {type(other).__name__} into {type(self).__name__}.")
+    self.count += other.count
+    self.total += other.total
+    return self
+
+  def result(self):
+    """Returns the statistic over everything seen so far."""
+    if self.count == 0:
+      raise ValueError(f"{self.name} cannot be calculated without data.")
+    return self._finish(self.total / self.count)
+
+  @classmethod
+  def from_chunks(cls, chunks):
+    """Builds an accumulator from an iterable of chunks in a single pass."""
+    accumulator = cls()
+    for chunk in chunks:
+      accumulator.update(chunk)
+    return accumulator
+
+class ArithmeticMeanAccumulator(_MeanAccumulator):
+  """Streaming arithmetic mean."""
+
+  name = "Arithmetic mean"
+
+class GeometricMeanAccumulator(_MeanAccumulator):
+  """Streaming geometric mean, summed in log space so long series cannot overflow."""
+
+  name = "Geometric mean"
+
+  def _transform(self, chunk):
+    if np.any(chunk <= 0):
+      raise ValueError("Geometric mean cannot be calculated with non-positive values.")
+    return np.log(chunk)
+
+  def _finish(self, mean):
+    return float(np.exp(mean))
+
+class HarmonicMeanAccumulator(_MeanAccumulator):
+  """Streaming harmonic mean."""
+
+  name = "Harmonic mean"
+
+  def _transform(self, chunk):
+    if np.any(chunk <= 0):
+      raise ValueError("Harmonic mean cannot be calculated with non-positive values.")
+    return 1 / chunk
+
+  def _finish(self, mean):
+    return float(1 / mean)
+
+class GeometricMeanReturnAccumulator(_MeanAccumulator):
+  """Streaming geometric mean return of holding period returns, summed as log(1 + r)."""
+
+  name = "Geometric mean return"
+
+  def _transform(self, chunk):
+    return _log_growth(chunk)
+
+  def _finish(self, mean):
+    return float(np.expm1(mean))
+
 def arithmetic_mean(data):
   """Calculates the arithmetic mean of a list of numbers.
 
@@ -7,7 +108,7 @@ def arithmetic_mean(data):
   Returns:
     The arithmetic mean of the data.
   """
-  return sum(data) / len(data)
+  return ArithmeticMeanAccumulator().update(data).result()
 
 def geometric_mean(data):
   """Calculates the geometric mean of a list of numbers.
@@ -18,12 +119,7 @@ def geometric_mean(data):
   Returns:
     The geometric mean of the data.
   """
-  product = 1
-  for x in data:
-    if x <= 0:
-      raise ValueError("Geometric mean cannot be calculated with non-positive values.")
-    product *= x
-  return product ** (1 / len(data))
+  return GeometricMeanAccumulator().update(data).result()
 
 def harmonic_mean(data):
   """Calculates the harmonic mean of a list of numbers.
@@ -34,28 +130,86 @@ def harmonic_mean(data):
   Returns:
     The harmonic mean of the data.
   """
-  if any(x <= 0 for x in data):
-    raise ValueError("Harmonic mean cannot be calculated with non-positive values.")
-  return len(data) / sum(1 / x for x in data)
+  return HarmonicMeanAccumulator().update(data).result()
 
-def geometric_mean_return(returns):
-    """
-    Calculate the geometric mean return of a time series of holding period returns.
+def _log_growth(returns):
+  """Converts holding period returns to log growth, log(1 + r)."""
+  returns = np.asarray(returns, dtype=float)
+  if np.any(returns <= -1):
+    raise ValueError("Geometric mean return cannot be calculated with returns of -100% or less.")
+  return np.log1p(returns)
 
-    Parameters:
-        returns (numpy array): Time series of holding period returns
+def geometric_mean_return(returns, axis=-1):
+  """Calculates the geometric mean return of holding period returns.
 
-    Returns:
-        float: Geometric mean return
-    """
-    returns = np.array(returns)
-    T = len(returns)
-    product = np.prod(1 + returns)
-    geometric_mean = (product ** (1 / T)) - 1
-    return geometric_mean
+  Args:
+    returns: A list or array of holding period returns. A 2-D array is read as
+      assets x periods and reduced along axis.
+    axis: The periods axis.
+
+  Returns:
+    The geometric mean return, a float for 1-D input and an array otherwise.
+  """
+  result = np.expm1(np.mean(_log_growth(returns), axis=axis))
+  return float(result) if np.ndim(result) == 0 else result
+
+def rolling_geometric_mean_return(returns, window):
+  """Calculates trailing geometric mean returns over one or more window lengths.
+
+  Every window is read off a single cumulative sum of log(1 + r), so the cost is
+  O(n) per window length rather than O(n * window).
+
+  Args:
+    returns: A 1-D array of returns, or a 2-D array of assets x periods.
+    window: The window length in periods, or a list of window lengths.
+
+  Returns:
+    An array shaped like returns, NaN where fewer than window periods are available.
+    For a list of windows, a dict mapping each window length to such an array.
+  """
+  log_growth = np.atleast_2d(_log_growth(returns))
+  cumulative = np.zeros((log_growth.shape[0], log_growth.shape[1] + 1))
+  np.cumsum(log_growth, axis=1, out=cumulative[:, 1:])
+
+  def trailing(w):
+    if w < 1:
+      raise ValueError("Window length must be at least 1.")
+    result = np.full(log_growth.shape, np.nan)
+    result[:, w - 1:] = np.expm1((cumulative[:, w:] - cumulative[:, :-w]) / w)
+    return result.reshape(np.shape(returns))
+
+  if np.ndim(window) == 0:
+    return trailing(int(window))
+  return {int(w): trailing(int(w)) for w in window}
+
+def expanding_geometric_mean_return(returns):
+  """Calculates the geometric mean return from the first period up to each period.
+
+  Args:
+    returns: A 1-D array of returns, or a 2-D array of assets x periods.
+
+  Returns:
+    An array shaped like returns.
+  """
+  log_growth = _log_growth(returns)
+  periods = np.arange(1, log_growth.shape[-1] + 1)
+  return np.expm1(np.cumsum(log_growth, axis=-1) / periods)
 
 if __name__ == "__main__":
   data = [1, 2, 3, 4, 5]
   print(f"Arithmetic Mean: {arithmetic_mean(data)}")
   print(f"Geometric Mean: {geometric_mean(data)}")
-  print(f"Harmonic Mean: {harmonic_mean(data)}")
\ No newline at end of file
+  print(f"Harmonic Mean: {harmonic_mean(data)}")
+
+  # Streaming usage: reduce chunks in separate accumulators, then merge them
+  chunks = [np.random.lognormal(0, 0.5, 100_000) for _ in range(4)]
+  left = GeometricMeanAccumulator.from_chunks(chunks[:2])
+  right = GeometricMeanAccumulator.from_chunks(chunks[2:])
+  print(f"Streaming Geometric Mean: {left.merge(right).result()}")
+
+  # Trailing 3- and 5-period geometric returns for two assets
+  returns = np.array([[0.05, -0.02, 0.07, 0.01, 0.03, 0.04],
+                      [0.10, 0.02, -0.05, 0.06, 0.00, 0.02]])
+  print(f"Geometric Mean Return: {geometric_mean_return(returns)}")
+  for window, values in rolling_geometric_mean_return(returns, [3, 5]).items():
+    print(f"Trailing {window}-period: {values}")
\ No newline at end of file
@@ -1,58 +1,113 @@
-import matplotlib.pyplot as plt
-import numpy as np
+import os
 
-import pandas as pd
 import numpy as np
-from scipy.stats import chi2_contingency
-import seaborn as sns
-import matplotlib.pyplot as plt
-import squarify
-
-def load_data(file_path):
-    """Load data from a CSV file"""
-    return pd.read_csv(file_path)
-
-def chi_square_test(data, variables):
-    """Perform Chi-Square test on multiple categorical variables"""
-    for i in range(len(variables)):
-        for j in range(i+1, len(variables)):
-            contingency_table = pd.crosstab(data[variables[i]], data[variables[j]])
-            chi2, p, dof, expected = chi2_contingency(contingency_table)
-            print(f"Chi-Square statistic for {variables[i]} and {variables[j]}: {chi2}")
-            print(f"p-value for {variables[i]} and {variables[j]}: {p}")
-
-def contingency_table(data, variables):
-    """Create a contingency table for multiple categorical variables"""
-    for i in range(len(variables)):
-        for j in range(i+1, len(variables)):
-            table = pd.crosstab(data[variables[i]], data[variables[j]])
-            print(f"Contingency table for {variables[i]} and {variables[j]}:")
-            print(table)
 
-def heat_map(data, variables):
-    """Create a heat map for multiple categorical variables"""
-    for i in range(len(variables)):
-        for j in range(i+1, len(variables)):
-            contingency_table = pd.crosstab(data[variables[i]], data[variables[j]])
-            plt.figure(figsize=(10, 8))
-            sns.heatmap(contingency_table, annot=True, cmap="Blues")
-            plt.xlabel(variables[i])
-            plt.ylabel(variables[j])
-            plt.title(f"Heat Map for {variables[i]} and {variables[j]}")
-            plt.show()
-
-def tree_map(data, variables):
-    """Create a tree map for multiple categorical variables"""
-    for i in range(len(variables)):
-        for j in range(i+1, len(variables)):
-            contingency_table = pd.crosstab(data[variables[i]], data[variables[j]])
-            squarify.plot(sizes=contingency_table.values.flatten(), label=contingency_table.index, alpha=0.6)
-            plt.axis('off')
-            plt.title(f"Tree Map for {variables[i]} and {variables[j]}")
-            plt.show()
-
-
-def grouped_bar_chart(labels, men_means, women_means, title, xlabel, ylabel):
+from quantitative_methods.contingency import ContingencyEngine
+from quantitative_methods.data_loader import load_csv
+from quantitative_methods.rendering import FigureRenderer, finish, new_axes
+
+def load_data(file_path, usecols=None, chunksize=1_000_000, cache_dir=None):
+    """Load data from a CSV file in chunks, with categorical and small-integer dtypes"""
+    return load_csv(file_path, usecols=usecols, chunksize=chunksize, cache_dir=cache_dir)
+
+def _engine(data, variables, engine):
+    """The engine to use, checking that data and variables agree with a passed engine"""
+    if engine is None:
+        return ContingencyEngine(data, variables)
+    if data is not None and data is not engine.data:
+        raise ValueError("Invalid data. Please pass the data the engine was built from, or None.")
+    if variables is not None and list(variables) != engine.variables:
+        raise ValueError("Invalid variables. Please pass the variables the engine was built with, or None.")
+    return engine
+
+def chi_square_test(data, variables, engine=None, processes=None, verbose=True):
+    """
+    Perform Chi-Square test on multiple categorical variables
+
+    Parameters:
+    data (pd.DataFrame): The source data; None when an engine is passed.
+    variables (list): Names of the categorical columns; None when an engine is passed.
+    engine (ContingencyEngine, optional): Engine whose cached tables should be reused.
+        data and variables, if given, must be the ones it was built with.
+    processes (int, optional): Worker processes to spread the pairs across.
+    verbose (bool): Print the statistic and p-value of every pair.
+
+    Returns:
+    pd.DataFrame: One row per pair with columns var1, var2, chi2, p_value, dof.
+    """
+    engine = _engine(data, variables, engine)
+    results = engine.chi_square(processes=processes)
+    if verbose:
+        for row in results.itertuples(index=False):
+            print(f"Chi-Square statistic for {row.var1} and {row.var2}: {row.chi2}")
+            print(f"p-value for {row.var1} and {row.var2}: {row.p_value}")
+    return results
+
+def contingency_table(data, variables, engine=None, verbose=True):
+    """
+    Create a contingency table for multiple categorical variables, from engine when given
+
+    Parameters:
+    data (pd.DataFrame): The source data; None when an engine is passed.
+    variables (list): Names of the categorical columns; None when an engine is passed.
+    engine (ContingencyEngine, optional): Engine whose cached tables should be reused.
+    verbose (bool): Print every table.
+
+    Returns:
+    dict: (var1, var2) -> pd.DataFrame of counts, one entry per pair.
+    """
+    engine = _engine(data, variables, engine)
+    tables = {}
+    for a, b in engine.pairs():
+        tables[a, b] = table = engine.table(a, b)
+        if verbose:
+            print(f"Contingency table for {a} and {b}:")
+            print(table)
+    return tables
+
+def _draw_heat_map(ax, contingency_table, a, b):
+    import seaborn as sns
+    sns.heatmap(contingency_table, annot=True, cmap="Blues", ax=ax)
+    ax.set_xlabel(a)
+    ax.set_ylabel(b)
+    ax.set_title(f"Heat Map for {a} and {b}")
+
+def _draw_tree_map(ax, contingency_table, a, b):
+    import squarify
+    # One label per cell, in the same row-major order as the flattened sizes
+    labels = [f"{row}, {col}" for row in contingency_table.index for col in contingency_table.columns]
+    squarify.plot(sizes=contingency_table.values.flatten(), label=labels, alpha=0.6, ax=ax)
+    ax.axis('off')
+    ax.set_title(f"Tree Map for {a} and {b}")
+
+def _pairwise_charts(draw, name, data, variables, engine, output_dir, format, figsize):
+    """Draw one chart per variable pair, shown interactively or rendered headlessly into output_dir"""
+    engine = _engine(data, variables, engine)
+    if output_dir is None:
+        for a, b in engine.pairs():
+            fig, ax, owned = new_axes(figsize=figsize)
+            draw(ax, engine.table(a, b), a, b)
+            finish(fig, owned=owned)
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    with FigureRenderer(figsize=figsize or (8, 6), format=format) as renderer:
+        for a, b in engine.pairs():
+            table = engine.table(a, b)
+            path = os.path.join(output_dir, f"{name}_{a}_{b}.{format}")
+            paths.append(renderer.render(lambda ax: draw(ax, table, a, b), path, format=format))
+    return paths
+
+def heat_map(data, variables, engine=None, output_dir=None, format='png'):
+    """Create a heat map for multiple categorical variables, written to output_dir when given"""
+    return _pairwise_charts(_draw_heat_map, 'heat_map', data, variables, engine, output_dir, format, (10, 8))
+
+def tree_map(data, variables, engine=None, output_dir=None, format='png'):
+    """Create a tree map for multiple categorical variables, written to output_dir when given"""
+    return _pairwise_charts(_draw_tree_map, 'tree_map', data, variables, engine, output_dir, format, None)
+
+
+def grouped_bar_chart(labels, men_means, women_means, title, xlabel, ylabel, ax=None, output=None):
     """
     Create a Grouped Bar Chart.
 
@@ -63,11 +118,13 @@ def grouped_bar_chart(labels, men_means, women_means, title, xlabel, ylabel):
     title (str): Title of the chart.
     xlabel (str): Label for the x-axis.
     ylabel (str): Label for the y-axis.
+    ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
+    output (str or file-like, optional): Write the chart here instead of showing it.
     """
     x = np.arange(len(labels))
     width = 0.35
 
-    fig, ax = plt.subplots()
+    fig, ax, owned = new_axes(ax)
     rects1 = ax.bar(x - width/2, men_means, width, label='Men')
     rects2 = ax.bar(x + width/2, women_means, width, label='Women')
 
@@ -77,9 +134,9 @@ def grouped_bar_chart(labels, men_means, women_means, title, xlabel, ylabel):
     ax.set_xticklabels(labels)
     ax.legend()
 
-    plt.show()
+    return finish(fig, output, owned)
 
-def stacked_bar_chart(labels, men_means, women_means, title, xlabel, ylabel):
+def stacked_bar_chart(labels, men_means, women_means, title, xlabel, ylabel, ax=None, output=None):
     """
     Create a Stacked Bar Chart.
 
@@ -90,11 +147,13 @@ def stacked_bar_chart(labels, men_means, women_means, title, xlabel, ylabel):
     title (str): Title of the chart.
     xlabel (str): Label for the x-axis.
     ylabel (str): Label for the y-axis.
+    ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
+    output (str or file-like, optional): Write the chart here instead of showing it.
     """
     x = np.arange(len(labels))
     width = 0.35
 
-    fig, ax = plt.subplots()
+    fig, ax, owned = new_axes(ax)
     ax.bar(x, men_means, width, label='Men')
     ax.bar(x, women_means, width, bottom=men_means, label='Women')
 
@@ -104,9 +163,9 @@ def stacked_bar_chart(labels, men_means, women_means, title, xlabel, ylabel):
     ax.set_xticklabels(labels)
     ax.legend()
 
-    plt.show()
+    return finish(fig, output, owned)
 
-def bubble_line_chart(x, y, z, title, xlabel, ylabel):
+def bubble_line_chart(x, y, z, title, xlabel, ylabel, ax=None, output=None):
     """
     Create a Bubble Line Chart.
 
@@ -117,15 +176,17 @@ def bubble_line_chart(x, y, z, title, xlabel, ylabel):
     title (str): Title of the chart.
     xlabel (str): Label for the x-axis.
     ylabel (str): Label for the y-axis.
+    ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
+    output (str or file-like, optional): Write the chart here instead of showing it.
     """
-    fig, ax = plt.subplots()
+    fig, ax, owned = new_axes(ax)
     ax.scatter(x, y, s=z)
 
     ax.set_ylabel(ylabel)
     ax.set_title(title)
     ax.set_xlabel(xlabel)
 
-    plt.show()
+    return finish(fig, output, owned)
 
 if __name__ == "__main__":
     # Example usage
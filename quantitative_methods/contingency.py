@@ -0,0 +1,140 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+# Column codes shared with worker processes through the pool initializer
+_worker_codes = {}
+
+def _init_worker(codes):
+    _worker_codes.clear()
+    _worker_codes.update(codes)
+
+def _count_table(codes_a, codes_b, n_a, n_b):
+    """
+    Build a contingency table of two factorized columns with np.bincount.
+
+    Missing values (code -1) are dropped, and so are levels that never occur
+    together with a non-missing value of the other column, as pd.crosstab does.
+
+    Returns:
+    tuple: (counts, row_levels, col_levels) with the level positions kept.
+    """
+    mask = (codes_a >= 0) & (codes_b >= 0)
+    if not mask.all():
+        codes_a, codes_b = codes_a[mask], codes_b[mask]
+    counts = np.bincount(codes_a * n_b + codes_b, minlength=n_a * n_b).reshape(n_a, n_b)
+    rows = np.flatnonzero(counts.sum(axis=1))
+    cols = np.flatnonzero(counts.sum(axis=0))
+    return counts[np.ix_(rows, cols)], rows, cols
+
+def _chi_square(counts):
+    """Chi-square statistic, p-value and degrees of freedom of a count table."""
+    from scipy.stats import chi2_contingency
+    if min(counts.shape) < 2:
+        return np.nan, np.nan, 0
+    chi2, p, dof, _ = chi2_contingency(counts)
+    return chi2, p, dof
+
+def _pair_worker(pairs):
+    """Pool task: tables and chi-square results for a batch of variable pairs."""
+    results = []
+    for a, b in pairs:
+        (codes_a, n_a), (codes_b, n_b) = _worker_codes[a], _worker_codes[b]
+        table = _count_table(codes_a, codes_b, n_a, n_b)
+        results.append((a, b, table, _chi_square(table[0])))
+    return results
+
+class ContingencyEngine:
+    """
+    Pairwise contingency tables and chi-square tests over categorical columns.
+
+    Every column is factorized to integer codes once. Each table is counted with
+    np.bincount and cached, so tests and charts over the same pairs share the work.
+    """
+
+    def __init__(self, data, variables):
+        """
+        Parameters:
+        data (pd.DataFrame): The source data.
+        variables (list): Names of the categorical columns to analyse.
+        """
+        self.data = data
+        self.variables = list(variables)
+        self._codes = {}
+        self._levels = {}
+        for name in self.variables:
+            codes, levels = pd.factorize(data[name], sort=True)
+            self._codes[name] = (codes.astype(np.int64), len(levels))
+            self._levels[name] = levels
+        self._tables = {}
+        self._results = {}
+
+    def pairs(self):
+        """All unordered pairs of variables, in the order the charting functions use."""
+        return list(combinations(self.variables, 2))
+
+    def _store(self, a, b, table, result=None):
+        self._tables[(a, b)] = table
+        if result is not None:
+            self._results[(a, b)] = result
+
+    def _raw_table(self, a, b):
+        if (a, b) not in self._tables:
+            (codes_a, n_a), (codes_b, n_b) = self._codes[a], self._codes[b]
+            self._store(a, b, _count_table(codes_a, codes_b, n_a, n_b))
+        return self._tables[(a, b)]
+
+    def table(self, a, b):
+        """
+        Contingency table of two variables, equivalent to pd.crosstab(data[a], data[b]).
+
+        Returns:
+        pd.DataFrame: Counts with the levels of a as rows and of b as columns.
+        """
+        counts, rows, cols = self._raw_table(a, b)
+        return pd.DataFrame(
+            counts,
+            index=pd.Index(self._levels[a][rows], name=a),
+            columns=pd.Index(self._levels[b][cols], name=b),
+        )
+
+    def chi_square(self, pairs=None, processes=None, chunk_size=256):
+        """
+        Run the chi-square test of independence for each pair of variables.
+
+        Parameters:
+        pairs (list, optional): Pairs to test. Defaults to every pair.
+        processes (int, optional): Worker processes to spread the pairs across.
+            Runs in this process when None or 1.
+        chunk_size (int): Pairs per task sent to a worker.
+
+        Returns:
+        pd.DataFrame: One row per pair with columns var1, var2, chi2, p_value, dof.
+        """
+        pairs = self.pairs() if pairs is None else [tuple(pair) for pair in pairs]
+        pending = [pair for pair in pairs if pair not in self._results]
+
+        if processes and processes > 1 and len(pending) > chunk_size:
+            tasks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+            with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(self._codes,)) as pool:
+                for batch in pool.map(_pair_worker, tasks):
+                    for a, b, table, result in batch:
+                        self._store(a, b, table, result)
+        else:
+            for a, b in pending:
+                self._results[(a, b)] = _chi_square(self._raw_table(a, b)[0])
+
+        rows = [(a, b) + tuple(self._results[(a, b)]) for a, b in pairs]
+        return pd.DataFrame(rows, columns=['var1', 'var2', 'chi2', 'p_value', 'dof'])
+
+if __name__ == "__main__":
+    # Example usage: random survey answers
+    rng = np.random.default_rng(0)
+    survey = pd.DataFrame({
+        f"Q{i}": rng.choice(['Yes', 'No', 'Maybe'], size=5000) for i in range(6)
+    })
+    engine = ContingencyEngine(survey, survey.columns)
+    print(engine.chi_square(processes=2, chunk_size=4))
+    print(engine.table('Q0', 'Q1'))
@@ -0,0 +1,217 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Bytes read from each end of the file for the content part of the cache key
+HASH_SAMPLE_BYTES = 1 << 20
+
+def _cache_key(file_path, options):
+    """
+    Build a cache key from the file's size, mtime, a hash of its first and last
+    HASH_SAMPLE_BYTES bytes, and the loader options.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, options)).encode())
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(HASH_SAMPLE_BYTES))
+        if stat.st_size > 2 * HASH_SAMPLE_BYTES:
+            f.seek(-HASH_SAMPLE_BYTES, os.SEEK_END)
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def _compress_chunk(chunk, categorical_columns):
+    """
+    Downcast integers and convert the chosen text columns to category.
+
+    A categorical column that this chunk parsed as numbers is turned back into
+    text first, so every chunk's categories are strings and can be unioned.
+    """
+    for name in chunk.columns:
+        column = chunk[name]
+        if name in categorical_columns:
+            if not pd.api.types.is_string_dtype(column):
+                column = column.astype('str')
+            chunk[name] = column.astype('category')
+        elif pd.api.types.is_integer_dtype(column):
+            chunk[name] = pd.to_numeric(column, downcast='integer')
+    return chunk
+
+def _combine(parts):
+    """
+    Build the frame from per-column lists of chunk columns, one column at a time,
+    unioning categories so categorical columns stay categorical. Each list is
+    released as soon as its column is built.
+    """
+    columns = {}
+    for name in list(parts):
+        pieces = parts.pop(name)
+        if len(pieces) == 1:
+            columns[name] = pieces[0].reset_index(drop=True)
+        elif isinstance(pieces[0].dtype, pd.CategoricalDtype):
+            columns[name] = pd.Series(union_categoricals(pieces), name=name)
+        elif all(isinstance(piece.dtype, np.dtype) and piece.dtype.kind in 'biuf' for piece in pieces):
+            # Plain NumPy columns: one allocation, where pd.concat would peak at several
+            columns[name] = pd.Series(np.concatenate([piece.to_numpy() for piece in pieces]), name=name)
+        else:
+            columns[name] = pd.concat(pieces, ignore_index=True)
+        del pieces
+    return pd.DataFrame(columns, copy=False)
+
+def _text(values):
+    """Strings of a text column as a fixed-width unicode array plus a missing-value mask."""
+    if pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+        raise TypeError("Only text, categorical and numeric columns can be cached.")
+    missing = pd.isna(values)
+    return np.where(missing, '', np.asarray(values, dtype=object)).astype(str), np.asarray(missing)
+
+def _save_npz(data, f):
+    """
+    Columnar NPZ fallback: categoricals are stored as codes plus categories and
+    text as unicode arrays, so the file loads without pickle.
+    """
+    arrays = {'columns': np.array([str(name) for name in data.columns])}
+    for i, name in enumerate(data.columns):
+        column = data[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            arrays[f'c{i}_codes'] = column.cat.codes.to_numpy()
+            arrays[f'c{i}_categories'], _ = _text(column.cat.categories)
+        elif column.dtype.kind in 'biuf':
+            arrays[f'c{i}'] = column.to_numpy()
+        else:
+            arrays[f'c{i}_text'], arrays[f'c{i}_missing'] = _text(column)
+    np.savez(f, **arrays)
+
+def _load_npz(path):
+    with np.load(path, allow_pickle=False) as arrays:
+        columns = {}
+        for i, name in enumerate(arrays['columns'].tolist()):
+            if f'c{i}_codes' in arrays:
+                columns[name] = pd.Categorical.from_codes(arrays[f'c{i}_codes'], arrays[f'c{i}_categories'])
+            elif f'c{i}_text' in arrays:
+                text = arrays[f'c{i}_text'].astype(object)
+                text[arrays[f'c{i}_missing']] = np.nan
+                columns[name] = pd.Series(text)
+            else:
+                columns[name] = arrays[f'c{i}']
+    return pd.DataFrame(columns)
+
+def _write_atomic(path, write):
+    """Write through a temporary file in the same directory, so readers never see a partial file."""
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            write(f)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+def _save_cache(data, cache_path):
+    """
+    Write data as Parquet when pyarrow/fastparquet can store it, NPZ otherwise.
+
+    Returns:
+    str or None: The cache file, or None when neither format can hold the data
+    (the data is then simply not cached).
+    """
+    try:
+        _write_atomic(cache_path + '.parquet', lambda f: data.to_parquet(f))
+        return cache_path + '.parquet'
+    except Exception:
+        pass  # no Parquet engine, or one that rejects the data (e.g. mixed-type columns)
+    try:
+        _write_atomic(cache_path + '.npz', lambda f: _save_npz(data, f))
+        return cache_path + '.npz'
+    except (TypeError, ValueError):
+        return None
+
+def _load_cache(cache_path):
+    """The cached frame, or None on a miss or an unreadable cache file."""
+    try:
+        if os.path.exists(cache_path + '.parquet'):
+            return pd.read_parquet(cache_path + '.parquet')
+        if os.path.exists(cache_path + '.npz'):
+            return _load_npz(cache_path + '.npz')
+    except Exception:
+        pass  # a corrupt or foreign file is a miss; the CSV is parsed again
+    return None
+
+def load_csv(file_path, usecols=None, chunksize=1_000_000, max_category_ratio=0.5, cache_dir=None):
+    """
+    Load a CSV file in chunks with compact dtypes.
+
+    The file is parsed once, chunk by chunk. Text columns whose share of distinct
+    values in the first chunk is at most max_category_ratio become category in
+    every chunk; where a later chunk parses such a column as numbers they are
+    turned back into text (so '007' is read as '7'). Integer columns are downcast
+    to the smallest integer type. The frame is assembled one column at a time from
+    the compressed chunks.
+
+    With cache_dir set, the parsed frame is stored in a columnar format and later
+    calls with the same file and options read it back without parsing the CSV.
+    The cache key covers the file's path, size and mtime, the options and a hash
+    of only the first and last HASH_SAMPLE_BYTES bytes: an edit in the middle of a
+    large file that keeps its size and mtime would be missed.
+
+    Parameters:
+    file_path (str): Path to the CSV file.
+    usecols (list, optional): Columns to read.
+    chunksize (int): Rows parsed per chunk.
+    max_category_ratio (float): Distinct/rows ratio up to which text becomes category.
+    cache_dir (str, optional): Directory for the parsed-data cache.
+
+    Returns:
+    pd.DataFrame: The loaded data.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        options = (tuple(usecols) if usecols is not None else None, max_category_ratio)
+        cache_path = os.path.join(cache_dir, _cache_key(file_path, options))
+        cached = _load_cache(cache_path)
+        if cached is not None:
+            return cached
+
+    # The first chunk decides the categorical columns; every chunk is then
+    # compressed and split into columns, so only compact columns are kept
+    parts = {}
+    categorical_columns = None
+    for chunk in pd.read_csv(file_path, usecols=usecols, chunksize=chunksize):
+        if categorical_columns is None:
+            limit = max_category_ratio * len(chunk)
+            categorical_columns = {
+                name for name in chunk.columns
+                if pd.api.types.is_string_dtype(chunk[name]) and chunk[name].nunique() <= limit
+            }
+        for name, column in _compress_chunk(chunk, categorical_columns).items():
+            parts.setdefault(name, []).append(column)
+        del chunk
+    if not parts:
+        return pd.read_csv(file_path, usecols=usecols)
+    data = _combine(parts)
+
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        _save_cache(data, cache_path)
+    return data
+
+if __name__ == "__main__":
+    # Example usage: write a small CSV, load it twice through the cache
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'survey.csv')
+        pd.DataFrame({
+            'Region': rng.choice(['North', 'South', 'East', 'West'], 10000),
+            'Answer': rng.choice(['Yes', 'No'], 10000),
+            'Age': rng.integers(18, 90, 10000),
+        }).to_csv(path, index=False)
+
+        data = load_csv(path, chunksize=2500, cache_dir=os.path.join(tmp, 'cache'))
+        print(data.dtypes)
+        print(f"Memory: {data.memory_usage(deep=True).sum():,} bytes")
+        cached = load_csv(path, chunksize=2500, cache_dir=os.path.join(tmp, 'cache'))
+        print(f"Cache round trip equal: {cached.equals(data)}")
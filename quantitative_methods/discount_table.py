@@ -0,0 +1,218 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from quantitative_methods import tvm_kernel
+
+# Factor planes stored in the table, in TVMFactors order
+FACTORS = tvm_kernel.TVMFactors._fields
+
+class DiscountFactorTable:
+    """
+    Precomputed growth, discount and annuity factors over a rate x period grid.
+
+    Lookups on grid points are a gather from the table. Off-grid requests inside
+    the grid are interpolated when interpolate is True: log1p(r) is interpolated
+    between the neighbouring grid rates, which keeps every factor exact in n. Everything else is computed exactly
+    with tvm_kernel, with scalar requests memoised in an LRU cache. The table can
+    be saved to a directory and opened memory-mapped, so worker processes share one
+    copy through the page cache; pickling a memory-mapped table sends only its path.
+
+    Counters: hits (grid points), interpolated, misses (exact computations) and
+    cache_info() for the LRU.
+    """
+
+    def __init__(self, rates, periods, interpolate=False, maxsize=65536, _table=None, _path=None):
+        """
+        Parameters:
+        rates (array-like): Grid of rates per period, strictly increasing.
+        periods (array-like): Grid of periods, strictly increasing.
+        interpolate (bool): Interpolate off-grid requests inside the grid instead
+            of computing them exactly. Exact computation is as fast for arrays and,
+            through the LRU, faster for repeated scalars; interpolation is for
+            callers that want values consistent with the grid.
+        maxsize (int): Size of the LRU cache for exact scalar requests.
+        """
+        self.rates = np.asarray(rates, dtype=float)
+        self.periods = np.asarray(periods, dtype=float)
+        if np.any(np.diff(self.rates) <= 0) or np.any(np.diff(self.periods) <= 0):
+            raise ValueError("Invalid grid. Please use strictly increasing rates and periods.")
+        if _table is None:
+            _table = np.stack(tvm_kernel.tvm_factors(self.rates[:, None], self.periods[None, :]))
+        self.table = _table
+        self.path = _path
+        self.interpolate = interpolate
+        self.maxsize = maxsize
+        self._log1p_rates = np.log1p(self.rates)
+        self._rate_step = self._uniform_step(self.rates)
+        self._period_step = self._uniform_step(self.periods)
+        self._rate_positions = {rate: i for i, rate in enumerate(self.rates.tolist())}
+        self._period_positions = {period: j for j, period in enumerate(self.periods.tolist())}
+        self._exact = lru_cache(maxsize=maxsize)(self._exact_factors)
+        self.reset_counters()
+
+    @staticmethod
+    def _exact_factors(r, n):
+        return tuple(float(f) for f in tvm_kernel.tvm_factors(r, n))
+
+    def reset_counters(self):
+        """Zero the hit, interpolation and miss counters and clear the LRU cache."""
+        self.hits = 0
+        self.interpolated = 0
+        self.misses = 0
+        self._exact.cache_clear()
+
+    def cache_info(self):
+        """LRU statistics for exact scalar requests (functools.lru_cache cache_info)."""
+        return self._exact.cache_info()
+
+    def stats(self):
+        """All counters as a dict."""
+        info = self.cache_info()
+        return {
+            'hits': self.hits, 'interpolated': self.interpolated, 'misses': self.misses,
+            'lru_hits': info.hits, 'lru_misses': info.misses, 'lru_size': info.currsize,
+        }
+
+    def save(self, directory):
+        """
+        Write the grid and table as .npy files so load() can memory-map them.
+
+        Returns:
+        str: The directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'rates.npy'), self.rates)
+        np.save(os.path.join(directory, 'periods.npy'), self.periods)
+        np.save(os.path.join(directory, 'table.npy'), self.table)
+        return directory
+
+    @classmethod
+    def load(cls, directory, interpolate=False, maxsize=65536, mmap=True):
+        """
+        Open a table written by save(), memory-mapped read-only by default.
+        """
+        table = np.load(os.path.join(directory, 'table.npy'), mmap_mode='r' if mmap else None)
+        return cls(
+            np.load(os.path.join(directory, 'rates.npy')),
+            np.load(os.path.join(directory, 'periods.npy')),
+            interpolate=interpolate, maxsize=maxsize, _table=table, _path=directory if mmap else None,
+        )
+
+    def __reduce__(self):
+        if self.path is not None:
+            # Workers re-open the shared file instead of receiving a copy
+            return (type(self).load, (self.path, self.interpolate, self.maxsize))
+        return (type(self), (self.rates, self.periods, self.interpolate, self.maxsize, np.asarray(self.table)))
+
+    def factor(self, name, r, n):
+        """
+        Look up one factor for each (rate, periods) pair.
+
+        Parameters:
+        name (str): 'growth', 'discount', 'annuity_fv' or 'annuity_pv'.
+        r (float or array-like): Rates per period.
+        n (float or array-like): Numbers of periods.
+
+        Returns:
+        float or np.ndarray: The factor, broadcast over r and n.
+        """
+        plane = FACTORS.index(name)
+        if np.ndim(r) == 0 and np.ndim(n) == 0:
+            return self._scalar(plane, float(r), float(n))
+        return self._array(plane, *np.broadcast_arrays(np.asarray(r, dtype=float), np.asarray(n, dtype=float)))
+
+    def _scalar(self, plane, r, n):
+        i = self._rate_positions.get(r)
+        j = self._period_positions.get(n)
+        if i is not None and j is not None:
+            self.hits += 1
+            return float(self.table[plane, i, j])
+        if self.interpolate and self._inside(r, n):
+            self.interpolated += 1
+            return float(self._interpolate(plane, np.array([r]), np.array([n]))[0])
+        self.misses += 1
+        return self._exact(r, n)[plane]
+
+    @staticmethod
+    def _uniform_step(axis):
+        """The spacing of an evenly spaced axis, or None."""
+        steps = np.diff(axis)
+        if len(steps) and np.allclose(steps, steps[0], rtol=1e-9, atol=0):
+            return steps[0]
+        return None
+
+    @staticmethod
+    def _nearest(axis, step, values):
+        """Index of the grid point nearest each value: arithmetic on even axes, a binary search otherwise."""
+        if step is not None:
+            index = np.rint((values - axis[0]) / step)
+            return np.clip(index, 0, len(axis) - 1).astype(np.intp)
+        index = np.clip(np.searchsorted(axis, values), 1, len(axis) - 1)
+        return index - (values - axis[index - 1] < axis[index] - values)
+
+    def _inside(self, r, n):
+        return (self.rates[0] <= r) & (r <= self.rates[-1]) & (self.periods[0] <= n) & (n <= self.periods[-1])
+
+    def _array(self, plane, r, n):
+        out = np.empty(r.shape)
+        i = self._nearest(self.rates, self._rate_step, r)
+        j = self._nearest(self.periods, self._period_step, n)
+        on_grid = (self.rates[i] == r) & (self.periods[j] == n)
+        out[on_grid] = self.table[plane, i[on_grid], j[on_grid]]
+        self.hits += int(np.count_nonzero(on_grid))
+
+        remaining = ~on_grid
+        if self.interpolate:
+            inside = remaining & self._inside(r, n)
+            out[inside] = self._interpolate(plane, r[inside], n[inside])
+            self.interpolated += int(np.count_nonzero(inside))
+            remaining &= ~inside
+        if remaining.any():
+            out[remaining] = tvm_kernel.tvm_factors(r[remaining], n[remaining])[plane]
+            self.misses += int(np.count_nonzero(remaining))
+        return out[()] if out.ndim == 0 else out
+
+    def _interpolate(self, plane, r, n):
+        """
+        Interpolate log1p(r) linearly between the neighbouring grid rates and derive
+        the factor from it, which is exact in n and agrees with the table on the grid.
+        """
+        i = np.clip(np.searchsorted(self.rates, r, side='right') - 1, 0, len(self.rates) - 2)
+        u = (r - self.rates[i]) / (self.rates[i + 1] - self.rates[i])
+        log1p_rate = (1 - u) * self._log1p_rates[i] + u * self._log1p_rates[i + 1]
+        return tvm_kernel.tvm_factors(np.expm1(log1p_rate), n)[plane]
+
+    def present_value(self, fv, r, n):
+        """Present value of a single amount using the table's discount factors."""
+        return fv * self.factor('discount', r, n)
+
+    def future_value(self, pv, r, n):
+        """Future value of a single amount using the table's growth factors."""
+        return pv * self.factor('growth', r, n)
+
+    def annuity_pv(self, pmt, r, n):
+        """Present value of an ordinary annuity using the table's annuity factors."""
+        return pmt * self.factor('annuity_pv', r, n)
+
+    def annuity_fv(self, pmt, r, n):
+        """Future value of an ordinary annuity using the table's annuity factors."""
+        return pmt * self.factor('annuity_fv', r, n)
+
+if __name__ == "__main__":
+    # Example usage: rates in 1bp steps up to 20%, monthly periods up to 40 years
+    import tempfile
+
+    table = DiscountFactorTable(np.round(np.arange(0, 2001) * 1e-4, 4), np.arange(0, 481), interpolate=True)
+    print(f"Grid point:   {table.present_value(1000, 0.05, 10):.6f}")
+    print(f"Interpolated: {table.present_value(1000, 0.05005, 10.5):.6f}")
+    print(f"Exact:        {tvm_kernel.present_value(1000, 0.05005, 10.5):.6f}")
+    print(f"Off grid:     {table.annuity_pv(100, 0.25, 12):.6f}")
+    print(f"Batch:        {table.annuity_pv(100, np.array([0.01, 0.02, 0.3]), 12)}")
+    print(table.stats())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = DiscountFactorTable.load(table.save(tmp))
+        print(f"Memory-mapped: {type(shared.table).__name__}, {shared.present_value(1000, 0.05, 10):.6f}")
+        del shared
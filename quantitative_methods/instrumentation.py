@@ -0,0 +1,359 @@
+import bisect
+import functools
+import heapq
+import importlib
+import inspect
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+# Packages whose public functions enable() instruments
+PACKAGES = ('quantitative_methods', 'economics', 'corporate_finance')
+
+# Upper bounds of the wall and CPU time histogram buckets, in seconds (+Inf is implied)
+TIME_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0, 100.0)
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+class CallStats:
+    """Counters of one instrumented function."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.wall_buckets = [0] * (len(TIME_BUCKETS) + 1)
+        self.cpu_buckets = [0] * (len(TIME_BUCKETS) + 1)
+        self.input_items = 0
+        self.max_input_items = 0
+        self.iterations = 0
+
+    def add(self, wall, cpu, items, iterations, failed):
+        self.calls += 1
+        self.errors += failed
+        self.wall_seconds += wall
+        self.cpu_seconds += cpu
+        self.wall_buckets[bisect.bisect_left(TIME_BUCKETS, wall)] += 1
+        self.cpu_buckets[bisect.bisect_left(TIME_BUCKETS, cpu)] += 1
+        self.input_items += items
+        self.max_input_items = max(self.max_input_items, items)
+        self.iterations += iterations
+
+    def as_dict(self):
+        return {
+            'calls': self.calls, 'errors': self.errors,
+            'wall_seconds': self.wall_seconds, 'cpu_seconds': self.cpu_seconds,
+            'wall_buckets': self.wall_buckets, 'cpu_buckets': self.cpu_buckets,
+            'input_items': self.input_items, 'max_input_items': self.max_input_items,
+            'iterations': self.iterations,
+        }
+
+_lock = threading.Lock()
+_local = threading.local()  # per-thread stack of the iteration counters of active calls
+_stats = {}
+_patched = []  # (namespace, attribute, original) replaced by enable()
+_enabled = False
+_profile_slowest = 0
+_profiler = 'cprofile'
+_profiles = []  # min-heap of (wall, sequence, name, profile) for the slowest calls
+_sequence = itertools.count()
+
+def _input_items(args, kwargs):
+    """Size of the largest argument: elements of an array, length of a sequence, 1 for a scalar."""
+    items = 1
+    for value in itertools.chain(args, kwargs.values()):
+        size = getattr(value, 'size', None)
+        if not isinstance(size, int):
+            if isinstance(value, (str, bytes)) or not hasattr(value, '__len__'):
+                continue
+            size = len(value)
+        items = max(items, size)
+    return items
+
+def _start_profile():
+    if _profiler == 'pyinstrument':
+        from pyinstrument import Profiler
+        profile = Profiler()
+        profile.start()
+        return profile
+    import cProfile
+    profile = cProfile.Profile()
+    profile.enable()
+    return profile
+
+def _stop_profile(profile):
+    if _profiler == 'pyinstrument':
+        profile.stop()
+    else:
+        profile.disable()
+
+def _keep_profile(wall, name, profile):
+    """Keep the profile if the call is among the _profile_slowest slowest so far."""
+    entry = (wall, next(_sequence), name, profile)
+    with _lock:
+        if len(_profiles) < _profile_slowest:
+            heapq.heappush(_profiles, entry)
+        elif wall > _profiles[0][0]:
+            heapq.heapreplace(_profiles, entry)
+
+def instrument(func, name=None):
+    """
+    Wrap a function so its calls are recorded while instrumentation is enabled.
+
+    enable() applies this to every public function; it can also be used as a
+    decorator. A disabled wrapper only checks a flag before calling func.
+
+    Parameters:
+    func (callable): The function to record.
+    name (str, optional): Metric label. Defaults to module.qualname.
+
+    Returns:
+    callable: The wrapper.
+    """
+    name = name or f'{func.__module__}.{func.__qualname__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        counter = [0]
+        # Only the outermost instrumented call is profiled; profilers do not nest
+        profile = _start_profile() if _profile_slowest and not stack else None
+        stack.append(counter)
+        failed = True
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            stack.pop()
+            if profile is not None:
+                _stop_profile(profile)
+                _keep_profile(wall, name, profile)
+            items = _input_items(args, kwargs)
+            with _lock:
+                stats = _stats.get(name)
+                if stats is None:
+                    stats = _stats[name] = CallStats()
+                stats.add(wall, cpu, items, counter[0], failed)
+
+    wrapper.__wrapped_name__ = name
+    return wrapper
+
+def add_iterations(count):
+    """
+    Credit solver iterations to the instrumented calls in progress.
+
+    Solvers call this once per solve; it returns at once when instrumentation is
+    disabled. The count is added to every active call on this thread, so a
+    wrapper such as calculate_mwrr reports the iterations of the irr it calls.
+    """
+    if not _enabled:
+        return
+    for counter in getattr(_local, 'stack', ()):
+        counter[0] += count
+
+def _public_functions(packages):
+    """(package name, attribute, function) for every public function of the packages."""
+    for package_name in packages:
+        package = importlib.import_module(package_name)
+        for module_name, names in package._SUBMODULE_EXPORTS.items():
+            module = importlib.import_module(f'{package_name}.{module_name}')
+            for name in names:
+                value = getattr(module, name)
+                if inspect.isfunction(value):
+                    yield package_name, name, value
+
+def enable(packages=PACKAGES, profile_slowest=0, profiler='cprofile'):
+    """
+    Start recording calls to the public functions of the packages.
+
+    Every module of the packages that refers to a public function, including the
+    package namespace and modules that imported it by name, is pointed at an
+    instrumented wrapper; disable() restores the originals, so there is no
+    overhead while instrumentation is off. Calling enable() again first restores
+    the originals, then instruments the packages given this time. Calls made in
+    worker processes are recorded in those processes, not here.
+
+    Parameters:
+    packages (sequence): Package names to instrument.
+    profile_slowest (int): Keep a profile of this many of the slowest calls (0 for none).
+        Every outermost call is profiled while this is set, which slows calls down.
+    profiler (str): 'cprofile', or 'pyinstrument' when it is installed.
+    """
+    global _enabled, _profile_slowest, _profiler
+    if profiler not in PROFILERS:
+        raise ValueError("Invalid profiler. Please use 'cprofile' or 'pyinstrument'.")
+    _profile_slowest, _profiler = profile_slowest, profiler
+    if isinstance(packages, str):
+        packages = (packages,)
+    # Restore first, so a second call never keeps the previous package set
+    _restore()
+    wrappers = {}
+    exports = []
+    for package_name, name, func in _public_functions(packages):
+        wrappers.setdefault(id(func), (func, instrument(func, f'{package_name}.{name}')))
+        exports.append((sys.modules[package_name], name, func))
+    prefixes = tuple(f'{package}.' for package in packages)
+    modules = [module for module_name, module in list(sys.modules.items())
+               if module is not None and (module_name in packages or module_name.startswith(prefixes))]
+    for module in modules:
+        if module.__name__ == __name__:
+            continue
+        for attribute, value in list(vars(module).items()):
+            original, wrapper = wrappers.get(id(value), (None, None))
+            if original is value:
+                _patched.append((module, attribute, value))
+                setattr(module, attribute, wrapper)
+    # Names the lazy package namespace has not cached yet are set too, so
+    # disable() leaves no wrapper behind in it
+    for package, name, func in exports:
+        if name not in vars(package):
+            _patched.append((package, name, func))
+            setattr(package, name, wrappers[id(func)][1])
+    _enabled = True
+
+def _restore():
+    while _patched:
+        module, attribute, original = _patched.pop()
+        setattr(module, attribute, original)
+
+def disable():
+    """Stop recording and restore the original functions. Recorded data is kept."""
+    global _enabled
+    _enabled = False
+    _restore()
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    """Clear all recorded data and kept profiles."""
+    with _lock:
+        _stats.clear()
+        _profiles.clear()
+
+def snapshot():
+    """
+    Recorded data as a JSON-serialisable dict.
+
+    Returns:
+    dict: time_buckets, and per function name its calls, errors, wall/CPU seconds
+    and bucket counts, input items (total and largest) and solver iterations.
+    """
+    with _lock:
+        functions = {name: stats.as_dict() for name, stats in sorted(_stats.items())}
+    return {'time_buckets': list(TIME_BUCKETS), 'functions': functions}
+
+def write_json(path):
+    """Write snapshot() to a JSON file."""
+    with open(path, 'w') as f:
+        json.dump(snapshot(), f, indent=2)
+    return path
+
+def _histogram(lines, metric, label, buckets, total, count):
+    running = 0
+    for bound, bucket in zip(TIME_BUCKETS + (float('inf'),), buckets):
+        running += bucket
+        le = '+Inf' if bound == float('inf') else repr(bound)
+        lines.append(f'{metric}_bucket{{{label},le="{le}"}} {running}')
+    lines.append(f'{metric}_sum{{{label}}} {total!r}')
+    lines.append(f'{metric}_count{{{label}}} {count}')
+
+def to_prometheus():
+    """
+    Recorded data in the Prometheus text exposition format.
+
+    Returns:
+    str: Counters, histograms and gauges labelled by function.
+    """
+    functions = snapshot()['functions']
+    metrics = [
+        ('cfa_calls_total', 'counter', 'Calls per function.', 'calls'),
+        ('cfa_errors_total', 'counter', 'Calls that raised an exception.', 'errors'),
+        ('cfa_input_items_total', 'counter', 'Size of the largest argument, summed over calls.', 'input_items'),
+        ('cfa_input_items_max', 'gauge', 'Largest argument size seen.', 'max_input_items'),
+        ('cfa_solver_iterations_total', 'counter', 'Solver iterations run by the calls.', 'iterations'),
+    ]
+    lines = []
+    for metric, kind, help_text, key in metrics:
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+        lines += [f'{metric}{{function="{name}"}} {stats[key]}' for name, stats in functions.items()]
+    for metric, help_text, kind in [('cfa_wall_seconds', 'Wall time per call.', 'wall'),
+                                    ('cfa_cpu_seconds', 'CPU time per call.', 'cpu')]:
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+        for name, stats in functions.items():
+            _histogram(lines, metric, f'function="{name}"', stats[f'{kind}_buckets'],
+                       stats[f'{kind}_seconds'], stats['calls'])
+    return '\n'.join(lines) + '\n'
+
+def write_prometheus(path):
+    """Write to_prometheus() to a text file, e.g. for the node_exporter textfile collector."""
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        f.write(to_prometheus())
+    os.replace(temporary, path)  # scrapers never see a half-written file
+    return path
+
+def slowest_profiles():
+    """
+    The kept profiles, slowest first.
+
+    Returns:
+    list: (wall seconds, function name, profile) tuples; profile is a
+    cProfile.Profile (use pstats.Stats(profile)) or a pyinstrument Profiler.
+    """
+    with _lock:
+        return [(wall, name, profile) for wall, _, name, profile in sorted(_profiles, reverse=True)]
+
+def write_profiles(directory):
+    """
+    Write the kept profiles to a directory, slowest first: .prof files for cProfile
+    (readable with pstats or snakeviz), .txt reports for pyinstrument.
+
+    Returns:
+    list: The written paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for rank, (wall, name, profile) in enumerate(slowest_profiles()):
+        stem = os.path.join(directory, f'{rank:03d}_{name}')
+        if hasattr(profile, 'dump_stats'):
+            profile.dump_stats(stem + '.prof')
+            paths.append(stem + '.prof')
+        else:
+            with open(stem + '.txt', 'w') as f:
+                f.write(profile.output_text())
+            paths.append(stem + '.txt')
+    return paths
+
+if __name__ == "__main__":
+    # Example usage: instrument a few calculators and print the metrics. The package
+    # module is used, since solvers report iterations to it rather than to __main__
+    import numpy as np
+
+    import quantitative_methods
+    from quantitative_methods import instrumentation
+
+    instrumentation.enable(profile_slowest=2)
+    rng = np.random.default_rng(0)
+    cash_flows = rng.uniform(1, 10, (1000, 10))
+    cash_flows[:, 0] = -cash_flows[:, 1:].sum(axis=1) * 0.8
+    quantitative_methods.irr(cash_flows)
+    quantitative_methods.calculate_mwrr([-100, 50, 75, 120])
+    for _ in range(100):
+        quantitative_methods.calculate_annuity_pv(100, 0.05, 10)
+    instrumentation.disable()
+
+    print(instrumentation.to_prometheus())
+    for wall, name, profile in instrumentation.slowest_profiles():
+        print(f"{name}: {wall * 1e3:.2f} ms")
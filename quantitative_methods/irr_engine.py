@@ -0,0 +1,272 @@
+import numpy as np
+
+from quantitative_methods import instrumentation
+
+# Candidate rates scanned to bracket a root before the Halley iterations start
+BRACKET_GRID = np.array([-0.99, -0.9, -0.5, -0.25, 0.0, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 100.0])
+
+DAYS_PER_YEAR = 365.0
+
+def _as_rows(cash_flows):
+    """Return cash_flows as a 2-D float array and whether the input was 1-D."""
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    return np.atleast_2d(cash_flows), cash_flows.ndim == 1
+
+def _solved(result, single):
+    """Return a solver's (rates, converged) as scalars when the input was one schedule."""
+    rates, converged = result
+    return (float(rates[0]), bool(converged[0])) if single else (rates, converged)
+
+def _npv_derivatives(cash_flows, rate):
+    """
+    Evaluate the NPV of each row of cash_flows and its first two derivatives
+    with respect to the rate in a single Horner pass over the discount factor.
+
+    Parameters:
+    cash_flows (numpy array): 2-D array, one equally spaced schedule per row.
+    rate (numpy array): One rate per row.
+
+    Returns:
+    tuple: (npv, d_npv, d2_npv) arrays of length n_rows.
+    """
+    v = 1.0 / (1.0 + rate)
+    value = cash_flows[:, -1].copy()
+    d1 = np.zeros_like(value)
+    d2 = np.zeros_like(value)
+    for k in range(cash_flows.shape[1] - 2, -1, -1):
+        d2 = d2 * v + 2 * d1
+        d1 = d1 * v + value
+        value = value * v + cash_flows[:, k]
+    # Chain rule from the discount factor v = 1 / (1 + r) back to r
+    return value, -d1 * v ** 2, d2 * v ** 4 + 2 * d1 * v ** 3
+
+def _xnpv_derivatives(cash_flows, times, rate):
+    """
+    Evaluate the NPV of irregularly timed cash flows and its first two derivatives.
+
+    Parameters:
+    cash_flows (numpy array): 2-D array, one schedule per row.
+    times (numpy array): Year fractions from the first cash flow, same shape as cash_flows.
+    rate (numpy array): One rate per row.
+
+    Returns:
+    tuple: (npv, d_npv, d2_npv) arrays of length n_rows.
+    """
+    log_growth = np.log1p(rate)[:, None]
+    discounted = cash_flows * np.exp(-times * log_growth)
+    growth = 1.0 + rate
+    value = discounted.sum(axis=1)
+    d1 = -(discounted * times).sum(axis=1) / growth
+    d2 = (discounted * times * (times + 1)).sum(axis=1) / growth ** 2
+    return value, d1, d2
+
+def _year_fractions(dates, shape):
+    """Convert dates to year fractions measured from the first date of each row."""
+    dates = np.asarray(dates)
+    if np.issubdtype(dates.dtype, np.number):
+        times = dates.astype(float)
+    else:
+        days = dates.astype('datetime64[D]').astype(np.int64)
+        times = (days - days[..., :1]) / DAYS_PER_YEAR
+    return np.broadcast_to(np.atleast_2d(times), shape)
+
+def _bracket_roots(evaluate, n_rows, guess):
+    """
+    Scan BRACKET_GRID for a sign change of the NPV in each row.
+
+    Returns:
+    tuple: (lower, upper, npv_lower, npv_upper, bracketed, exact) where exact holds
+    the grid rate that is already a root (NaN otherwise).
+    """
+    grid = BRACKET_GRID
+    rows = np.arange(n_rows)
+    with np.errstate(all='ignore'):
+        npvs = np.column_stack([evaluate(rows, np.full(n_rows, g))[0] for g in grid])
+    signs = np.sign(npvs)
+    change = signs[:, :-1] * signs[:, 1:] < 0
+    # Prefer the bracket closest to the initial guess when several roots exist
+    mid = 0.5 * (grid[:-1] + grid[1:])
+    distance = np.where(change, np.abs(mid - guess[:, None]), np.inf)
+    j = np.argmin(distance, axis=1)
+    bracketed = change[rows, j]
+    zero = npvs == 0
+    exact = np.where(zero.any(axis=1), grid[np.argmax(zero, axis=1)], np.nan)
+    return grid[j], grid[j + 1], npvs[rows, j], npvs[rows, j + 1], bracketed, exact
+
+def _solve(evaluate, n_rows, tol, max_iter, guess):
+    """
+    Find a root of evaluate for every row with bracketed Halley iterations.
+
+    Each row is solved with Halley steps; rows where a sign change was bracketed
+    fall back to bisection whenever a step leaves the bracket or is not finite.
+
+    Parameters:
+    evaluate (callable): evaluate(rows, rate) -> (f, df, d2f) for the given row indices.
+    n_rows (int): Number of rows.
+    tol (float or array-like): Convergence tolerance on the rate, scalar or one per row.
+    max_iter (int): Maximum number of iterations.
+    guess (float or array-like): Starting rate for rows without a bracket, scalar or one per row.
+
+    Returns:
+    tuple: (rates, converged) arrays of length n_rows. Rates that did not converge are NaN.
+    """
+    tol = np.broadcast_to(np.asarray(tol, dtype=float), (n_rows,))
+    guess = np.broadcast_to(np.asarray(guess, dtype=float), (n_rows,))
+
+    lower, upper, npv_lower, npv_upper, bracketed, exact = _bracket_roots(evaluate, n_rows, guess)
+    with np.errstate(all='ignore'):
+        # Regula falsi point inside the bracket is a good Halley starting value
+        start = lower - npv_lower * (upper - lower) / (npv_upper - npv_lower)
+    start = np.where(np.isfinite(start), start, 0.5 * (lower + upper))
+    rate = np.where(bracketed, start, guess)
+    rate = np.where(np.isnan(exact), rate, exact)
+
+    converged = np.zeros(n_rows, dtype=bool)
+    failed = np.zeros(n_rows, dtype=bool)
+    active = np.arange(n_rows)
+    iterations = 0
+    for iterations in range(max_iter):
+        if active.size == 0:
+            break
+        r = rate[active]
+        lo, hi, f_lo = lower[active], upper[active], npv_lower[active]
+        in_bracket = bracketed[active]
+        with np.errstate(all='ignore'):
+            f, df, d2f = evaluate(active, r)
+            candidate = r - 2 * f * df / (2 * df * df - f * d2f)
+
+        # Shrink the bracket around the current iterate
+        keep_lower_side = np.sign(f) == np.sign(f_lo)
+        lo = np.where(in_bracket & keep_lower_side, r, lo)
+        f_lo = np.where(in_bracket & keep_lower_side, f, f_lo)
+        hi = np.where(in_bracket & ~keep_lower_side, r, hi)
+
+        bad = ~np.isfinite(candidate) | (candidate <= -1)
+        outside = in_bracket & (bad | (candidate <= lo) | (candidate >= hi))
+        candidate = np.where(outside, 0.5 * (lo + hi), candidate)
+
+        root = f == 0
+        candidate = np.where(root, r, candidate)
+        step_done = np.abs(candidate - r) <= tol[active]
+        width_done = in_bracket & (hi - lo <= tol[active])
+        done = root | (np.isfinite(candidate) & (step_done | width_done))
+        diverged = ~in_bracket & bad & ~root
+
+        rate[active] = candidate
+        lower[active], upper[active], npv_lower[active] = lo, hi, f_lo
+        converged[active[done]] = True
+        failed[active[diverged]] = True
+        active = active[~(done | diverged)]
+    else:
+        iterations = max_iter
+    instrumentation.add_iterations(iterations)
+
+    converged &= ~failed
+    return np.where(converged, rate, np.nan), converged
+
+def npv(rate, cash_flows):
+    """
+    Calculate the net present value of equally spaced cash flows.
+
+    Parameters:
+    rate (float or array-like): Discount rate per period, scalar or one per schedule.
+    cash_flows (array-like): One schedule, or a 2-D array with one schedule per row, period 0 first.
+
+    Returns:
+    float or numpy array: Net present value of each schedule.
+    """
+    rows, single = _as_rows(cash_flows)
+    rate = np.broadcast_to(np.asarray(rate, dtype=float), (rows.shape[0],))
+    value = _npv_derivatives(rows, rate)[0]
+    return float(value[0]) if single else value
+
+def npv_with_derivative(rate, cash_flows):
+    """
+    Calculate the net present value and its derivative with respect to the rate.
+
+    Parameters:
+    rate (float or array-like): Discount rate per period, scalar or one per schedule.
+    cash_flows (array-like): One schedule, or a 2-D array with one schedule per row, period 0 first.
+
+    Returns:
+    tuple: (npv, d_npv) for each schedule.
+    """
+    rows, single = _as_rows(cash_flows)
+    rate = np.broadcast_to(np.asarray(rate, dtype=float), (rows.shape[0],))
+    value, d1, _ = _npv_derivatives(rows, rate)
+    if single:
+        return float(value[0]), float(d1[0])
+    return value, d1
+
+def irr(cash_flows, tol=1e-10, max_iter=50, guess=0.1):
+    """
+    Calculate the internal rate of return of equally spaced cash flows.
+
+    Parameters:
+    cash_flows (array-like): One schedule, or a 2-D array with one schedule per row, period 0 first.
+        Shorter schedules can be right-padded with zeros.
+    tol (float or array-like): Convergence tolerance on the rate, scalar or one per row.
+    max_iter (int): Maximum number of iterations.
+    guess (float or array-like): Starting rate for rows without a bracket, scalar or one per row.
+
+    Returns:
+    tuple: (rate, converged) for one schedule, or arrays with one entry per schedule.
+        Rates that did not converge are NaN.
+    """
+    rows, single = _as_rows(cash_flows)
+    solved = _solve(lambda idx, r: _npv_derivatives(rows[idx], r), rows.shape[0], tol, max_iter, guess)
+    return _solved(solved, single)
+
+def xnpv(rate, cash_flows, dates):
+    """
+    Calculate the net present value of irregularly dated cash flows (actual/365).
+
+    Parameters:
+    rate (float or array-like): Annual discount rate, scalar or one per schedule.
+    cash_flows (array-like): One schedule, or a 2-D array with one schedule per row.
+    dates (array-like): Dates of the cash flows (anything convertible to datetime64),
+        or year fractions from the first cash flow. Either one row shared by every
+        schedule or one row per schedule.
+
+    Returns:
+    float or numpy array: Net present value of each schedule.
+    """
+    rows, single = _as_rows(cash_flows)
+    times = _year_fractions(dates, rows.shape)
+    rate = np.broadcast_to(np.asarray(rate, dtype=float), (rows.shape[0],))
+    value = _xnpv_derivatives(rows, times, rate)[0]
+    return float(value[0]) if single else value
+
+def xirr(cash_flows, dates, tol=1e-10, max_iter=50, guess=0.1):
+    """
+    Calculate the annual internal rate of return of irregularly dated cash flows.
+
+    Parameters:
+    cash_flows (array-like): One schedule, or a 2-D array with one schedule per row.
+    dates (array-like): Dates of the cash flows (anything convertible to datetime64),
+        or year fractions from the first cash flow. Either one row shared by every
+        schedule or one row per schedule.
+    tol (float or array-like): Convergence tolerance on the rate, scalar or one per row.
+    max_iter (int): Maximum number of iterations.
+    guess (float or array-like): Starting rate for rows without a bracket, scalar or one per row.
+
+    Returns:
+    tuple: (rate, converged) for one schedule, or arrays with one entry per schedule.
+        Rates that did not converge are NaN.
+    """
+    rows, single = _as_rows(cash_flows)
+    times = _year_fractions(dates, rows.shape)
+    solved = _solve(lambda idx, r: _xnpv_derivatives(rows[idx], times[idx], r), rows.shape[0], tol, max_iter, guess)
+    return _solved(solved, single)
+
+if __name__ == "__main__":
+    # Example usage:
+    cash_flows = [-100, 50, 75, 120]
+    rate, converged = irr(cash_flows)
+    print(f"IRR: {rate:.4%} (converged: {converged})")
+    print(f"NPV at 10%: {npv(0.10, cash_flows):.2f}")
+
+    dates = ['2023-01-01', '2023-03-15', '2023-10-30', '2024-06-01']
+    rate, converged = xirr(cash_flows, dates)
+    print(f"XIRR: {rate:.4%} (converged: {converged})")
+    print(f"XNPV at 10%: {xnpv(0.10, cash_flows, dates):.2f}")
@@ -1,5 +1,7 @@
 import numpy as np
 
+from quantitative_methods import calculate_mean, irr_engine
+
 def holding_period_return(dividends, selling_price, purchase_price):
     """
     Calculate the holding period return (HPR)
@@ -49,27 +51,26 @@ def geometric_mean_return(returns):
     Returns:
     float: Geometric mean return
     """
-    product = 1
-    for ret in returns:
-        product *= (1 + ret)
-    return product ** (1 / len(returns)) - 1
+    return calculate_mean.geometric_mean_return(returns)
 
-def money_weighted_rate_of_return(cash_flows):
+def money_weighted_rate_of_return(cash_flows, dates=None):
     """
     Calculate the money-weighted rate of return (MWRR)
     
     Parameters:
-    cash_flows (list): List of cash inflows and outflows
+    cash_flows (list): List of cash inflows and outflows (inflows positive, outflows negative).
+        A 2-D array is treated as one schedule per row.
+    dates (list, optional): Dates of the cash flows. When given the annual XIRR is
+        returned; otherwise cash flows are assumed to be equally spaced in time.
     
     Returns:
-    float: Money-weighted rate of return
+    float or numpy array: Money-weighted rate of return (NaN where no rate was found)
     """
-    # Note: This function assumes that the cash flows are in the correct order
-    # (i.e., inflows are positive and outflows are negative)
-    # and that the cash flows are equally spaced in time.
-    # In practice, you would need to use a more sophisticated method
-    # to calculate the MWRR, such as the Newton-Raphson method.
-    return np.irr(cash_flows)
+    if dates is None:
+        rates, _ = irr_engine.irr(cash_flows)
+    else:
+        rates, _ = irr_engine.xirr(cash_flows, dates)
+    return rates
 
 def real_return(nominal_return, inflation_rate):
     """
@@ -114,4 +115,8 @@ if __name__ == "__main__":
     arithmetic_mean = arithmetic_mean_return(returns)
     geometric_mean = geometric_mean_return(returns)
     print(f"Arithmetic mean return: {arithmetic_mean:.2%}")
-    print(f"Geometric mean return: {
+    print(f"Geometric mean return: {geometric_mean:.2%}")
+
+    cash_flows = [-1000, -500, 300, 1600]
+    mwrr = money_weighted_rate_of_return(cash_flows)
+    print(f"Money-weighted rate of return: {mwrr:.2%}")
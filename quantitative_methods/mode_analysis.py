@@ -1,32 +1,165 @@
 import numpy as np
-from scipy import stats
-import matplotlib.pyplot as plt
+
+from quantitative_methods.rendering import finish, new_axes
+
+# Integer data spanning at most this many values per observation is counted with bincount
+BINCOUNT_SPAN_RATIO = 4
+
+MODE_TYPES = {1: "Unimodal", 2: "Bimodal", 3: "Trimodal"}
+
+def find_modes(data):
+    """
+    Find every mode of a dataset in one counting pass.
+
+    Integer data with a compact range is counted with np.bincount; anything else
+    with np.unique(return_counts=True). NaN values are ignored.
+
+    Parameters:
+        data (array-like): Input data.
+
+    Returns:
+        tuple: (modes, count) where modes is a sorted array of the most frequent
+        values and count is how often each of them occurs.
+    """
+    data = np.asarray(data).ravel()
+    if data.dtype.kind == 'f':
+        data = data[~np.isnan(data)]
+    if data.size == 0:
+        return data[:0], 0
+
+    if data.dtype.kind in 'iub':
+        low, high = int(data.min()), int(data.max())
+        if high - low < BINCOUNT_SPAN_RATIO * data.size + 1024:
+            counts = np.bincount((data - low).astype(np.intp, copy=False))
+            count = counts.max()
+            return (np.flatnonzero(counts == count) + low).astype(data.dtype), int(count)
+
+    values, counts = np.unique(data, return_counts=True)
+    count = counts.max()
+    return values[counts == count], int(count)
 
 def calculate_mode(data):
     """
     Calculate the mode of a dataset.
 
+    The mode type follows the number of values sharing the highest frequency.
+    When every value occurs equally often there is no mode. NaN values are ignored.
+
     Parameters:
         data (array-like): Input data.
 
     Returns:
-        mode (float): The mode of the data.
-        mode_type (str): The type of mode (unimodal, bimodal, trimodal, or no mode).
+        mode (float): The mode of the data (the smallest mode when there are
+            several, NaN when there is none).
+        mode_type (str): The type of mode (unimodal, bimodal, trimodal, multimodal or no mode).
+    """
+    data = np.asarray(data).ravel()
+    modes, count = find_modes(data)
+    if modes.size == 0:
+        raise ValueError("Mode cannot be calculated without data.")
+    observed = data.size - np.isnan(data).sum() if data.dtype.kind == 'f' else data.size
+    if count == 1 or (modes.size > 1 and count * modes.size == observed):
+        return np.nan, "No Mode"
+    return modes[0], MODE_TYPES.get(modes.size, "Multimodal")
+
+class HistogramAccumulator:
+    """
+    Streaming fixed-width histogram, mergeable across chunks and workers.
+
+    Bins follow np.histogram: num_bins equal-width bins over [lower, upper], the
+    last bin closed on the right. Values outside the range are counted separately,
+    and the running minimum and maximum are kept for the bin width.
     """
-    mode = stats.mode(data)[0][0]
-    mode_count = np.sum(data == mode)
-    unique_values = np.unique(data)
-    if len(unique_values) == len(data):
-        mode_type = "No Mode"
-    elif mode_count == 1:
-        mode_type = "Unimodal"
-    elif mode_count == 2:
-        mode_type = "Bimodal"
-    elif mode_count == 3:
-        mode_type = "Trimodal"
-    else:
-        mode_type = "Multimodal"
-    return mode, mode_type
+
+    def __init__(self, num_bins, lower, upper):
+        if not upper > lower:
+            raise ValueError("Invalid histogram range. Please use an upper bound above the lower bound.")
+        self.num_bins = int(num_bins)
+        self.edges = np.linspace(lower, upper, self.num_bins + 1)
+        self.counts = np.zeros(self.num_bins, dtype=np.int64)
+        self.below = 0
+        self.above = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, chunk):
+        """
+        Adds a chunk of observations to the histogram.
+
+        Returns:
+            The accumulator itself, so calls can be chained.
+        """
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        if chunk.size == 0:
+            return self
+        low, high = chunk.min(), chunk.max()
+        if np.isnan(low):
+            # NaN propagates through min, so the NaN filter only runs when needed
+            chunk = chunk[~np.isnan(chunk)]
+            if chunk.size == 0:
+                return self
+            low, high = chunk.min(), chunk.max()
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+        lower, upper = self.edges[0], self.edges[-1]
+        if low < lower or high > upper:
+            self.below += int(np.count_nonzero(chunk < lower))
+            self.above += int(np.count_nonzero(chunk > upper))
+        # A fixed range keeps np.histogram on its equal-width fast path and drops outliers
+        self.counts += np.histogram(chunk, bins=self.num_bins, range=(lower, upper))[0]
+        return self
+
+    def merge(self, other):
+        """
+        Folds the counts of another accumulator with the same bins into this one.
+
+        Returns:
+            The accumulator itself, so calls can be chained.
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Invalid histogram merge. Please use accumulators with the same bins.")
+        self.counts += other.counts
+        self.below += other.below
+        self.above += other.above
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def bin_width(self):
+        """Range of the data seen so far divided by the number of bins."""
+        return (self.max - self.min) / self.num_bins
+
+    def modal_interval(self):
+        """The (lower, upper) edges of the most populated bin."""
+        index = np.argmax(self.counts)
+        return (self.edges[index], self.edges[index + 1])
+
+    @classmethod
+    def from_chunks(cls, chunks, num_bins, lower=None, upper=None):
+        """
+        Builds a histogram from an iterable of chunks.
+
+        Without lower and upper the chunks are read twice, first for the data
+        range, so chunks must then be re-iterable (e.g. a list or a reader factory's output).
+        A one-shot iterator such as a generator raises TypeError in that case; pass
+        lower and upper to stream it in a single pass.
+        """
+        if lower is None or upper is None:
+            if iter(chunks) is chunks:
+                raise TypeError("Invalid chunks. Please pass lower and upper, or a re-iterable collection of chunks.")
+            bounds = cls(1, 0.0, 1.0)
+            for chunk in chunks:
+                bounds.update(chunk)
+            lower = bounds.min if lower is None else lower
+            upper = bounds.max if upper is None else upper
+            if upper == lower:
+                lower, upper = lower - 0.5, upper + 0.5
+        accumulator = cls(num_bins, lower, upper)
+        for chunk in chunks:
+            accumulator.update(chunk)
+        return accumulator
 
 def calculate_bin_width(data, num_bins):
     """
@@ -48,30 +181,33 @@ def identify_modal_interval(data, num_bins):
     Identify the modal interval in a histogram.
 
     Parameters:
-        data (array-like): Input data.
+        data (array-like or HistogramAccumulator): Input data, or a histogram
+            already accumulated over chunks of it.
         num_bins (int): Number of bins.
 
     Returns:
         modal_interval (tuple): The modal interval (lower, upper).
     """
-    hist, bins = np.histogram(data, bins=num_bins)
-    max_freq_idx = np.argmax(hist)
-    modal_interval = (bins[max_freq_idx], bins[max_freq_idx + 1])
-    return modal_interval
+    if not isinstance(data, HistogramAccumulator):
+        data = HistogramAccumulator.from_chunks([data], num_bins)
+    return data.modal_interval()
 
-def plot_histogram(data, num_bins):
+def plot_histogram(data, num_bins, ax=None, output=None):
     """
     Plot a histogram of the data.
 
     Parameters:
         data (array-like): Input data.
         num_bins (int): Number of bins.
+        ax (matplotlib.axes.Axes, optional): Axes to draw into instead of a new figure.
+        output (str or file-like, optional): Write the chart here instead of showing it.
     """
-    plt.hist(data, bins=num_bins)
-    plt.xlabel("Value")
-    plt.ylabel("Frequency")
-    plt.title("Histogram")
-    plt.show()
+    fig, ax, owned = new_axes(ax)
+    ax.hist(data, bins=num_bins)
+    ax.set_xlabel("Value")
+    ax.set_ylabel("Frequency")
+    ax.set_title("Histogram")
+    return finish(fig, output, owned)
 
 if __name__ == "__main__":
     # Example usage
@@ -86,4 +222,13 @@ if __name__ == "__main__":
     modal_interval = identify_modal_interval(data, num_bins)
     print(f"Modal Interval: {modal_interval}")
 
+    # Streaming: the same histogram built from chunks, merged across two halves
+    chunks = np.array_split(data, 8)
+    first = HistogramAccumulator.from_chunks(chunks[:4], num_bins, data.min(), data.max())
+    second = HistogramAccumulator.from_chunks(chunks[4:], num_bins, data.min(), data.max())
+    histogram = first.merge(second)
+    print(f"Streamed Bin Width: {histogram.bin_width}, Modal Interval: {histogram.modal_interval()}")
+
+    print(find_modes([1, 2, 2, 3, 3, 4]))
+
     plot_histogram(data, num_bins)
@@ -1,5 +1,14 @@
+import os
+import sys
+
 import numpy as np
 
+if not __package__:
+    # Run as a script: put the repository root on the path so the package imports resolve
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantitative_methods import irr_engine
+
 def calculate_pv_outflows(cash_flows, irr):
     """
     Calculate the present value of outflows (PVO)
@@ -18,28 +27,57 @@ def calculate_pv_inflows(cash_flows, irr):
         pv_inflows += cf * (1 + irr) ** i
     return pv_inflows
 
-def calculate_mwrr(cash_flows, initial_investment):
+def calculate_mwrr_batch(cash_flows, tol=1e-10, max_iter=50, guess=0.1):
+    """
+    Calculate the Money-Weighted Rate of Return (IRR) for many cash-flow schedules at once.
+
+    Each row is solved with bracketed Halley steps by irr_engine.irr.
+
+    Parameters:
+    cash_flows (array-like): 2-D array with one cash-flow schedule per row, period 0 first.
+        Shorter schedules can be right-padded with zeros.
+    tol (float or array-like): Convergence tolerance on the rate, scalar or one per row.
+    max_iter (int): Maximum number of iterations.
+    guess (float or array-like): Starting rate for rows without a bracket, scalar or one per row.
+
+    Returns:
+    tuple: (rates, converged) arrays of length n_rows. Rates that did not converge are NaN.
+    """
+    return irr_engine.irr(cash_flows, tol=tol, max_iter=max_iter, guess=guess)
+
+def calculate_mwrr(cash_flows, initial_investment=None):
     """
     Calculate the Money-Weighted Rate of Return (MWRR)
+
+    Parameters:
+    cash_flows (list): Cash flows per period, starting with the initial investment.
+    initial_investment (float, optional): Kept for backward compatibility; the initial
+        investment is read from the first element of cash_flows.
+
+    Returns:
+    float: Money-weighted rate of return
     """
-    irr = 0.0
-    while True:
-        pv_outflows = calculate_pv_outflows(cash_flows, irr)
-        pv_inflows = calculate_pv_inflows(cash_flows, irr)
-        if np.isclose(pv_outflows, pv_inflows, atol=1e-6):
-            break
-        elif pv_outflows > pv_inflows:
-            irr += 0.01
-        else:
-            irr -= 0.01
-    return irr
+    rates, converged = calculate_mwrr_batch([cash_flows])
+    if not converged[0]:
+        raise ValueError("MWRR did not converge for the given cash flows.")
+    return float(rates[0])
 
 def main():
     # Example usage:
     cash_flows = [-100, 50, 75, 120]  # initial investment, then 3 cash flows
     initial_investment = -100
     mwrr = calculate_mwrr(cash_flows, initial_investment)
-    print(f"The Money-Weighted Rate of Return (MWRR) is: {mwrr:.2f}%")
+    print(f"The Money-Weighted Rate of Return (MWRR) is: {mwrr:.2%}")
+
+    # Batch usage: one portfolio per row, with per-row tolerances
+    portfolios = np.array([
+        [-100, 50, 75, 120],
+        [-1000, 300, 300, 300],
+        [-500, 0, 0, 800],
+    ])
+    rates, converged = calculate_mwrr_batch(portfolios, tol=[1e-10, 1e-6, 1e-8])
+    for rate, ok in zip(rates, converged):
+        print(f"MWRR: {rate:.4%} (converged: {ok})")
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,5 @@
+from quantitative_methods.required_rate_of_return import calculate_required_rate_of_return
+
 def calculate_total_interest_rate(risk_free_rate, inflation_premium, default_risk_premium, liquidity_premium, maturity_premium):
   """
   Calculates the total interest rate based on various premiums.
@@ -12,8 +14,7 @@ def calculate_total_interest_rate(risk_free_rate, inflation_premium, default_ris
   Returns:
     The total interest rate.
   """
-  total_interest_rate = risk_free_rate + inflation_premium + default_risk_premium + liquidity_premium + maturity_premium
-  return total_interest_rate
+  return calculate_required_rate_of_return(risk_free_rate, inflation_premium, maturity_premium, liquidity_premium, default_risk_premium)
 
 def calculate_nominal_risk_free_rate(real_risk_free_rate, inflation_premium):
   """
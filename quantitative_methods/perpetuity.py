@@ -1,3 +1,5 @@
+from quantitative_methods import tvm_kernel
+
 def calculate_perpetuity_pv(pmt, r):
   """Calculates the present value of a perpetuity.
 
@@ -8,7 +10,7 @@ def calculate_perpetuity_pv(pmt, r):
   Returns:
     The present value of the perpetuity.
   """
-  return pmt / r
+  return tvm_kernel.perpetuity_pv(pmt, r)
 
 def calculate_growing_perpetuity_pv(pmt, r, g):
   """Calculates the present value of a growing perpetuity.
@@ -21,7 +23,7 @@ def calculate_growing_perpetuity_pv(pmt, r, g):
   Returns:
     The present value of the growing perpetuity.
   """
-  return pmt / (r - g)
+  return tvm_kernel.perpetuity_pv(pmt, r, g)
 
 if __name__ == "__main__":
   # Example usage for testing
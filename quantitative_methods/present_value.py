@@ -1,5 +1,7 @@
 import numpy as np
 
+from quantitative_methods import tvm_kernel
+
 def calculate_present_value(fv, r, n):
   """
   Calculates the present value of a single cash flow.
@@ -12,7 +14,7 @@ def calculate_present_value(fv, r, n):
   Returns:
     The present value of the cash flow.
   """
-  pv = fv / (1 + r)**n
+  pv = tvm_kernel.present_value(fv, r, n)
   return pv
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Renderer reused by every job a worker process runs
+_worker_renderer = None
+
+def use_headless():
+    """Switch matplotlib to the non-interactive Agg backend."""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+def new_axes(ax=None, figsize=None):
+    """
+    Return the axes a plotting function should draw into.
+
+    Parameters:
+    ax (matplotlib.axes.Axes, optional): Axes supplied by the caller.
+    figsize (tuple, optional): Size of the figure created when ax is None.
+
+    Returns:
+    tuple: (figure, axes, owned) where owned is True when a new figure was created.
+    """
+    if ax is not None:
+        return ax.figure, ax, False
+    import matplotlib.pyplot as plt
+    figure, ax = plt.subplots(figsize=figsize)
+    return figure, ax, True
+
+def finish(figure, output=None, owned=True, format=None):
+    """
+    Show or save a figure drawn by a plotting function.
+
+    With no output the figure is shown, as the plotting functions always did,
+    unless the caller supplied the axes and so manages the figure itself.
+    Otherwise it is written to output (a path or a binary file-like object).
+    Figures the plotting function created are always closed.
+
+    Returns:
+    The output, or None when the figure was shown.
+    """
+    import matplotlib.pyplot as plt
+    if output is None:
+        if owned:
+            plt.show()
+            plt.close(figure)
+        return None
+    if not isinstance(output, (str, os.PathLike)) and format is None:
+        format = 'png'
+    figure.savefig(output, format=format)
+    if owned:
+        plt.close(figure)
+    return output
+
+class FigureRenderer:
+    """
+    Renders charts headlessly into one reused Agg figure.
+
+    The figure is created without pyplot, so it never enters pyplot's figure
+    registry and is released deterministically by close().
+    """
+
+    def __init__(self, figsize=(8, 6), dpi=100, format='png'):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        self.figsize = figsize
+        self.format = format
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.figure)
+
+    def render(self, draw, output=None, format=None, figsize=None):
+        """
+        Clear the figure, draw into fresh axes and write the result.
+
+        Parameters:
+        draw (callable): draw(ax) fills the axes, e.g. a plotting function bound
+            with functools.partial.
+        output (str or file-like, optional): Destination. When None the encoded
+            image is returned as bytes.
+        format (str, optional): Image format such as 'png' or 'svg'.
+        figsize (tuple, optional): Size for this chart only.
+
+        Returns:
+        bytes or the output destination.
+        """
+        self.figure.clear()
+        self.figure.set_size_inches(figsize or self.figsize)
+        draw(self.figure.add_subplot())
+        if output is None:
+            buffer = io.BytesIO()
+            self.figure.savefig(buffer, format=format or self.format)
+            return buffer.getvalue()
+        if format is None and not isinstance(output, (str, os.PathLike)):
+            format = self.format
+        # Paths without an explicit format use their file extension
+        self.figure.savefig(output, format=format)
+        return output
+
+    def close(self):
+        """Release the figure."""
+        self.figure.clear()
+        self.figure = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _render_job(job):
+    """Pool task: render one (plot_function, args, kwargs, output) job."""
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = FigureRenderer()
+    plot_function, args, kwargs, output = job
+    return _worker_renderer.render(lambda ax: plot_function(*args, ax=ax, **kwargs), output)
+
+def render_batch(jobs, processes=None, chunksize=16):
+    """
+    Render many charts headlessly, optionally across a process pool.
+
+    Parameters:
+    jobs (iterable): (plot_function, args, kwargs, output) tuples. plot_function
+        must be a module-level function that accepts an ax keyword, such as
+        charting.grouped_bar_chart. output is a path, or None for bytes.
+    processes (int, optional): Worker processes. Renders in this process when None or 1.
+    chunksize (int): Jobs sent to a worker at a time.
+
+    Returns:
+    list: The result of each job (the output path or the encoded bytes).
+    """
+    global _worker_renderer
+    jobs = list(jobs)
+    if processes and processes > 1:
+        with ProcessPoolExecutor(processes, initializer=use_headless) as pool:
+            return list(pool.map(_render_job, jobs, chunksize=chunksize))
+    try:
+        return [_render_job(job) for job in jobs]
+    finally:
+        if _worker_renderer is not None:
+            _worker_renderer.close()
+            _worker_renderer = None
+
+if __name__ == "__main__":
+    # Example usage: render a batch of bar charts to PNG bytes
+    from quantitative_methods.charting import grouped_bar_chart
+
+    labels = ['A', 'B', 'C']
+    jobs = [
+        (grouped_bar_chart, (labels, [i, 2 * i, 3 * i], [3, 2, 1], f'Chart {i}', 'X', 'Y'), {}, None)
+        for i in range(1, 5)
+    ]
+    images = render_batch(jobs, processes=2)
+    print([len(image) for image in images])
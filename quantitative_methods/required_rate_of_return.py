@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.stats import norm
 
 def calculate_required_rate_of_return(real_risk_free_rate, inflation_premium, maturity_risk_premium, liquidity_premium, default_risk_premium):
   """
@@ -38,14 +37,124 @@ def calculate_default_risk_premium(credit_rating, historical_default_rates):
   Calculates the default risk premium based on the bond's credit rating and historical default rates.
 
   Args:
-    credit_rating: The bond's credit rating.
-    historical_default_rates: A dictionary mapping credit ratings to historical default rates.
+    credit_rating: The bond's credit rating, or an array of ratings.
+    historical_default_rates: A dictionary mapping credit ratings to historical default rates,
+      or a RatingIndex built from one.
 
   Returns:
-    The default risk premium.
+    The default risk premium, an array for an array of ratings.
   """
 
-  return historical_default_rates[credit_rating]
+  if np.ndim(credit_rating) == 0 and not isinstance(historical_default_rates, RatingIndex):
+    return historical_default_rates[credit_rating]
+  if not isinstance(historical_default_rates, RatingIndex):
+    historical_default_rates = RatingIndex(historical_default_rates)
+  return historical_default_rates.premia(credit_rating)
+
+class RatingIndex:
+  """
+  Default risk premia by rating, stored as an array for vectorized lookups.
+
+  Ratings are resolved to positions in the premium array once per distinct
+  rating (a hash lookup), so a universe of bonds costs one gather.
+  """
+
+  def __init__(self, historical_default_rates):
+    """
+    Args:
+      historical_default_rates: A dictionary mapping credit ratings to historical default rates.
+    """
+    import pandas as pd
+    self.ratings = pd.Index(list(historical_default_rates))
+    self.rates = np.array(list(historical_default_rates.values()), dtype=float)
+
+  def codes(self, credit_ratings):
+    """
+    Maps ratings to positions in the premium array.
+
+    Args:
+      credit_ratings: An array, list, Series or Categorical of ratings.
+
+    Returns:
+      An integer array of positions.
+    """
+    import pandas as pd
+    if isinstance(getattr(credit_ratings, 'dtype', None), pd.CategoricalDtype):
+      # Resolve each category once, then map the codes
+      categorical = pd.Categorical(credit_ratings)
+      positions = np.append(self.ratings.get_indexer(categorical.categories), -1)
+      codes = positions[categorical.codes]
+    else:
+      codes = self.ratings.get_indexer(np.asarray(credit_ratings).ravel()).reshape(np.shape(credit_ratings))
+    if np.any(codes < 0):
+      unknown = pd.unique(np.asarray(credit_ratings).ravel()[np.ravel(codes) < 0])
+      raise KeyError(f"Unknown credit ratings: {unknown[:10].tolist()}")
+    return codes
+
+  def premia(self, credit_ratings):
+    """Default risk premium for each rating."""
+    return self.rates[self.codes(credit_ratings)]
+
+  def premia_at(self, codes):
+    """
+    Default risk premium at each position returned by codes.
+
+    Args:
+      codes: An integer array of positions between 0 and len(rates) - 1.
+
+    Returns:
+      An array of premia.
+    """
+    codes = np.asarray(codes)
+    if codes.dtype.kind not in 'iu' or (codes.size and (codes.min() < 0 or codes.max() >= len(self.rates))):
+      raise ValueError(f"Invalid rating codes. Please use positions between 0 and {len(self.rates) - 1} from RatingIndex.codes.")
+    return self.rates[codes]
+
+# Columns of the matrix returned by calculate_required_return_matrix
+BUILD_UP_COLUMNS = [
+  'real_risk_free_rate', 'inflation_premium', 'maturity_risk_premium',
+  'liquidity_premium', 'default_risk_premium', 'required_rate_of_return',
+]
+
+def calculate_required_return_matrix(real_risk_free_rate, inflation_premium, time_to_maturity, yield_curve_slope,
+                                     liquidity_premium, credit_rating, historical_default_rates, rating_codes=None):
+  """
+  Builds up the required rate of return for a whole bond universe in one call.
+
+  Args:
+    real_risk_free_rate: The real risk-free rate of return (scalar or per bond).
+    inflation_premium: The premium demanded to compensate for inflation (scalar or per bond).
+    time_to_maturity: Array of times to maturity in years.
+    yield_curve_slope: The slope of the yield curve (scalar or per bond).
+    liquidity_premium: Array of liquidity premia (or a scalar).
+    credit_rating: Array, Series or Categorical of credit ratings (a Categorical is
+      resolved once per category), or None when rating_codes is given.
+    historical_default_rates: A dictionary mapping ratings to default rates, or a RatingIndex.
+    rating_codes: Integer positions from RatingIndex.codes, used instead of credit_rating.
+
+  Returns:
+    A (bonds, 6) float array with the components in BUILD_UP_COLUMNS order, the
+    last column being the required rate of return.
+  """
+  if not isinstance(historical_default_rates, RatingIndex):
+    historical_default_rates = RatingIndex(historical_default_rates)
+  if rating_codes is not None:
+    if credit_rating is not None:
+      raise ValueError("Invalid arguments. Please pass either credit_rating or rating_codes, not both.")
+    default_risk_premium = historical_default_rates.premia_at(rating_codes)
+  else:
+    default_risk_premium = historical_default_rates.premia(credit_rating)
+
+  time_to_maturity = np.asarray(time_to_maturity, dtype=float)
+  shape = np.broadcast_shapes(np.shape(time_to_maturity), np.shape(liquidity_premium), default_risk_premium.shape)
+  matrix = np.empty(shape + (len(BUILD_UP_COLUMNS),))
+  matrix[..., 0] = real_risk_free_rate
+  matrix[..., 1] = inflation_premium
+  matrix[..., 2] = calculate_maturity_risk_premium(time_to_maturity, np.asarray(yield_curve_slope, dtype=float))
+  matrix[..., 3] = liquidity_premium
+  matrix[..., 4] = default_risk_premium
+  np.sum(matrix[..., :5], axis=-1, out=matrix[..., 5])
+  return matrix
 
 if __name__ == "__main__":
   # Example usage:
@@ -61,4 +170,14 @@ if __name__ == "__main__":
   default_risk_premium = calculate_default_risk_premium(credit_rating, historical_default_rates)
   required_rate_of_return = calculate_required_rate_of_return(real_risk_free_rate, inflation_premium, maturity_risk_premium, liquidity_premium, default_risk_premium)
 
-  print(f"Required rate of return: {required_rate_of_return:.2%}")
\ No newline at end of file
+  print(f"Required rate of return: {required_rate_of_return:.2%}")
+
+  # The same build-up over a universe of bonds
+  rng = np.random.default_rng(0)
+  n_bonds = 1_000_000
+  ratings = rng.choice(list(historical_default_rates), n_bonds)
+  maturities = rng.uniform(0.5, 30, n_bonds)
+  liquidity = rng.uniform(0, 0.01, n_bonds)
+  matrix = calculate_required_return_matrix(real_risk_free_rate, inflation_premium, maturities, yield_curve_slope,
+                                            liquidity, ratings, historical_default_rates)
+  print(f"Mean required rate of return over {n_bonds:,} bonds: {matrix[:, -1].mean():.2%}")
\ No newline at end of file
@@ -1,5 +1,28 @@
 import numpy as np
 
+from quantitative_methods import tvm_kernel
+
+def calculate_future_value_batch(principal, dividend, interest_rate, periods, due=False):
+    """
+    Calculate the future value of many investments with regular dividends at once.
+
+    All arguments broadcast together. (1 + r) ** n is computed once per cell and
+    shared by the principal and dividend terms, and r = 0 uses the exact limit
+    (the dividends simply add up) instead of dividing by zero.
+
+    Parameters:
+    principal (array-like): The initial investment amounts.
+    dividend (array-like): The regular dividend payments.
+    interest_rate (array-like): The interest rates per period.
+    periods (array-like): The numbers of periods.
+    due (array-like of bool or int): True (1) for dividends at the beginning of
+        each period, False (0) for the end.
+
+    Returns:
+    numpy array or pandas Series: The future values, a Series when a Series was given.
+    """
+    return tvm_kernel.future_value_series(principal, dividend, interest_rate, periods, due)
+
 def calculate_future_value(principal, dividend, interest_rate, periods, payment_frequency):
     """
     Calculate the future value of an investment with regular dividends.
@@ -10,20 +33,16 @@ def calculate_future_value(principal, dividend, interest_rate, periods, payment_
     interest_rate (float): The interest rate per period.
     periods (int): The number of periods.
     payment_frequency (str): The frequency of dividend payments, either 'begin' or 'end'.
+        Arrays of the same strings are accepted alongside array arguments.
 
     Returns:
     float: The future value of the investment.
     """
-    if payment_frequency == 'begin':
-        # Calculate future value with dividend payments at the beginning of each period
-        future_value = principal * (1 + interest_rate) ** periods + dividend * (((1 + interest_rate) ** periods - 1) / interest_rate) * (1 + interest_rate)
-    elif payment_frequency == 'end':
-        # Calculate future value with dividend payments at the end of each period
-        future_value = principal * (1 + interest_rate) ** periods + dividend * (((1 + interest_rate) ** periods - 1) / interest_rate)
-    else:
+    payment_frequency = np.asarray(payment_frequency)
+    begin = payment_frequency == 'begin'
+    if not np.all(begin | (payment_frequency == 'end')):
         raise ValueError("Invalid payment frequency. Please use 'begin' or 'end'.")
-
-    return future_value
+    return calculate_future_value_batch(principal, dividend, interest_rate, periods, begin)
 
 def main():
     # Example usage:
@@ -41,5 +60,10 @@ def main():
     print("Future Value (Dividend at Beginning):", future_value_begin)
     print("Future Value (Dividend at End):", future_value_end)
 
+    # Savings plans for many customers at once, including a zero rate
+    rates = np.array([0.0, 0.03, 0.06])
+    due = np.array([True, False, True])
+    print("Future Values (batch):", calculate_future_value_batch(principal, dividend, rates, periods, due))
+
 if __name__ == "__main__":
     main()
@@ -1,3 +1,5 @@
+from quantitative_methods import tvm_kernel, uneven_cash_flows
+
 def future_value(pv, r, n):
   """
   Calculates the future value (FV) of a present value (PV) investment.
@@ -10,7 +12,7 @@ def future_value(pv, r, n):
   Returns:
     The future value of the investment.
   """
-  return pv * (1 + r) ** n
+  return tvm_kernel.future_value(pv, r, n)
 
 def present_value(fv, r, n):
   """
@@ -24,7 +26,7 @@ def present_value(fv, r, n):
   Returns:
     The present value of the investment.
   """
-  return fv / (1 + r) ** n
+  return tvm_kernel.present_value(fv, r, n)
 
 def payment(pv, r, n):
   """
@@ -38,7 +40,7 @@ def payment(pv, r, n):
   Returns:
     The required payment per period.
   """
-  return (pv * r * (1 + r) ** n) / ((1 + r) ** n - 1)
+  return tvm_kernel.payment(pv, r, n)
 
 def future_value_with_payment(pmt, r, n):
   """
@@ -52,7 +54,7 @@ def future_value_with_payment(pmt, r, n):
   Returns:
     The future value of the investment with payments.
   """
-  return pmt * (((1 + r) ** n - 1) / r)
+  return tvm_kernel.annuity_fv(pmt, r, n)
 
 def present_value_with_payment(pmt, r, n):
   """
@@ -66,7 +68,7 @@ def present_value_with_payment(pmt, r, n):
   Returns:
     The present value of the investment with payments.
   """
-  return pmt * ((1 - (1 + r) ** -n) / r)
+  return tvm_kernel.annuity_pv(pmt, r, n)
 
 def calculate_future_value_of_uneven_cash_flows(cash_flows, interest_rate):
     """
@@ -80,13 +82,9 @@ def calculate_future_value_of_uneven_cash_flows(cash_flows, interest_rate):
         float: The future value of the uneven cash flows.
     """
 
-    # Calculate the future value of each cash flow individually
-    future_values = [cash_flow * (1 + interest_rate)**(len(cash_flows) - i - 1) for i, cash_flow in enumerate(cash_flows)]
-
-    # Sum up the results to get the total future value
-    total_future_value = sum(future_values)
-
-    return total_future_value
+    # A single-ledger batch: one shared power vector instead of a power per cash flow
+    values, offsets = uneven_cash_flows.pack_ledgers([cash_flows])
+    return float(uneven_cash_flows.calculate_ledger_values(values, offsets, interest_rate).fv[0])
 
 # Example usage:
 if __name__ == "__main__":
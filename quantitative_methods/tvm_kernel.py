@@ -0,0 +1,128 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Factors for one (rate, periods) cell, all derived from a single expm1 evaluation
+TVMFactors = namedtuple('TVMFactors', ['growth', 'discount', 'annuity_fv', 'annuity_pv'])
+
+def _inputs(*args):
+    """
+    Convert arguments to float arrays, remembering the first pandas-like argument.
+
+    Returns:
+    tuple: (template, arrays) where template is the first argument with an index
+    (e.g. a pandas Series) or None.
+    """
+    template = next((a for a in args if hasattr(a, 'index') and hasattr(a, 'to_numpy')), None)
+    return template, [np.asarray(a, dtype=float) for a in args]
+
+def _output(values, template):
+    """Return values shaped like the inputs: a Series, an array or a scalar."""
+    if template is not None:
+        return type(template)(values, index=template.index)
+    return values[()] if values.ndim == 0 else values
+
+def _factors(r, n):
+    """Compute TVMFactors for float arrays r and n (broadcast together)."""
+    log_growth = n * np.log1p(r)
+    growth_minus_one = np.expm1(log_growth)
+    growth = growth_minus_one + 1
+    discount = 1 / growth
+    zero = r == 0
+    safe_r = np.where(zero, 1.0, r)
+    # At r = 0 both annuity factors reduce to n; once growth overflows the PV factor is 1 / r
+    annuity_fv = np.where(zero, n, growth_minus_one / safe_r)
+    annuity_pv = np.where(np.isinf(growth), 1 / safe_r, growth_minus_one * discount / safe_r)
+    annuity_pv = np.where(zero, n, annuity_pv)
+    return TVMFactors(growth, discount, annuity_fv, annuity_pv)
+
+def tvm_factors(r, n):
+    """
+    Calculates the growth, discount and annuity factors for each (rate, periods) cell.
+
+    (1 + r) ** n is evaluated once per cell and reused for every factor, and the
+    annuity factors use the exact r -> 0 limit (n) instead of dividing by zero.
+
+    Args:
+      r: The interest rate per period (scalar, array or Series).
+      n: The number of periods (scalar, array or Series).
+
+    Returns:
+      A TVMFactors tuple of (growth, discount, annuity_fv, annuity_pv).
+    """
+    template, (r, n) = _inputs(r, n)
+    return TVMFactors(*(_output(f, template) for f in _factors(r, n)))
+
+def future_value(pv, r, n):
+    """Future value of a single amount: pv * (1 + r) ** n."""
+    template, (pv, r, n) = _inputs(pv, r, n)
+    return _output(pv * np.exp(n * np.log1p(r)), template)
+
+def present_value(fv, r, n):
+    """Present value of a single amount: fv / (1 + r) ** n."""
+    template, (fv, r, n) = _inputs(fv, r, n)
+    return _output(fv * np.exp(-n * np.log1p(r)), template)
+
+def annuity_pv(pmt, r, n, due=False):
+    """Present value of an annuity; due=True for payments at the start of each period."""
+    template, (pmt, r, n, due) = _inputs(pmt, r, n, due)
+    factors = _factors(r, n)
+    return _output(pmt * factors.annuity_pv * np.where(due, 1 + r, 1), template)
+
+def annuity_fv(pmt, r, n, due=False):
+    """Future value of an annuity; due=True for payments at the start of each period."""
+    template, (pmt, r, n, due) = _inputs(pmt, r, n, due)
+    factors = _factors(r, n)
+    return _output(pmt * factors.annuity_fv * np.where(due, 1 + r, 1), template)
+
+def future_value_series(pv, pmt, r, n, due=False):
+    """
+    Future value of a single amount plus an annuity: pv grows for n periods and
+    pmt is paid each period, at the start when due is True. Both terms share one
+    (1 + r) ** n evaluation.
+    """
+    template, (pv, pmt, r, n, due) = _inputs(pv, pmt, r, n, due)
+    factors = _factors(r, n)
+    timing = np.where(due != 0, 1 + r, 1.0)
+    return _output(pv * factors.growth + pmt * factors.annuity_fv * timing, template)
+
+def payment(pv, r, n):
+    """Level payment per period that amortises pv over n periods."""
+    template, (pv, r, n) = _inputs(pv, r, n)
+    return _output(pv / _factors(r, n).annuity_pv, template)
+
+def perpetuity_pv(pmt, r, g=0):
+    """Present value of a (growing) perpetuity: pmt / (r - g), infinite when r == g."""
+    template, (pmt, r, g) = _inputs(pmt, r, g)
+    with np.errstate(divide='ignore'):
+        return _output(pmt / (r - g), template)
+
+def tvm_grid(r, n, amount):
+    """
+    Prices every (rate, periods, amount) cell in one pass.
+
+    Args:
+      r: The interest rate per period.
+      n: The number of periods.
+      amount: The amount per cell.
+
+    Returns:
+      A dict broadcast over the inputs with 'pv' and 'fv' of an annuity paying amount
+      each period, and the level 'payment' that amortises a loan of amount.
+    """
+    template, (r, n, amount) = _inputs(r, n, amount)
+    factors = _factors(r, n)
+    return {
+        'pv': _output(amount * factors.annuity_pv, template),
+        'fv': _output(amount * factors.annuity_fv, template),
+        'payment': _output(amount / factors.annuity_pv, template),
+    }
+
+if __name__ == "__main__":
+    # Example usage: a small rate x periods grid, including r = 0
+    rates = np.array([0.0, 0.01, 0.05])[:, None]
+    periods = np.array([1, 10, 30])
+    grid = tvm_grid(rates, periods, 100)
+    print("Annuity PV:\n", grid['pv'])
+    print("Annuity FV:\n", grid['fv'])
+    print("Payment:\n", grid['payment'])
@@ -0,0 +1,132 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Values of each ledger: fv at its last cash flow, pv at its first
+LedgerValues = namedtuple('LedgerValues', ['fv', 'pv'])
+
+def ledger_offsets(lengths):
+    """
+    Offsets of ledgers laid end to end in a flat values array (CSR layout).
+
+    Args:
+        lengths (array-like): Number of cash flows in each ledger.
+
+    Returns:
+        numpy array: k + 1 offsets; ledger i is values[offsets[i]:offsets[i + 1]].
+    """
+    return np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+
+def pack_ledgers(ledgers):
+    """
+    Flatten a list of cash-flow lists into (values, offsets).
+
+    Args:
+        ledgers (list): One sequence of cash flows per ledger.
+
+    Returns:
+        tuple: (values, offsets) as accepted by calculate_ledger_values.
+    """
+    ledgers = [np.asarray(ledger, dtype=float) for ledger in ledgers]
+    values = np.concatenate(ledgers) if ledgers else np.zeros(0)
+    return values, ledger_offsets([len(ledger) for ledger in ledgers])
+
+def calculate_ledger_values(values, offsets, interest_rate):
+    """
+    Future and present values of a ragged batch of uneven cash-flow ledgers.
+
+    Each ledger's cash flows are one period apart. The FV is measured at the
+    ledger's last cash flow (as calculate_future_value_of_uneven_cash_flows does)
+    and the PV at its first. With one rate for the whole batch the growth and
+    discount powers are computed once, up to the longest ledger, and gathered by
+    position; each ledger is then a segmented sum.
+
+    Args:
+        values (array-like): Cash flows of all ledgers, laid end to end.
+        offsets (array-like): k + 1 ledger offsets into values (see ledger_offsets).
+        interest_rate (float or array-like): One rate for the batch, or one per ledger.
+
+    Returns:
+        LedgerValues: (fv, pv) arrays with one entry per ledger; empty ledgers are 0.
+    """
+    values = np.asarray(values, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+    n_ledgers = len(lengths)
+    ledger = np.repeat(np.arange(n_ledgers), lengths)
+    position = np.arange(len(values)) - offsets[:-1][ledger]
+    # Periods from each cash flow to the end of its ledger
+    remaining = lengths[ledger] - 1 - position
+
+    if np.ndim(interest_rate) == 0:
+        max_length = int(lengths.max()) if n_ledgers else 0
+        log_growth = np.arange(max_length) * np.log1p(interest_rate)
+        growth, discount = np.exp(log_growth), np.exp(-log_growth)
+        fv_weights, pv_weights = growth[remaining], discount[position]
+    else:
+        log1p_rate = np.log1p(np.asarray(interest_rate, dtype=float))[ledger]
+        fv_weights, pv_weights = np.exp(remaining * log1p_rate), np.exp(-position * log1p_rate)
+
+    fv = np.bincount(ledger, weights=values * fv_weights, minlength=n_ledgers)
+    pv = np.bincount(ledger, weights=values * pv_weights, minlength=n_ledgers)
+    return LedgerValues(fv, pv)
+
+class CashFlowAccumulator:
+    """
+    Streaming FV and PV of cash flows that arrive one period apart.
+
+    Each new cash flow is folded in with Horner's rule, fv = fv * (1 + r) + cf,
+    and discounted by a running factor for the PV, so every update is O(1) per
+    ledger. The state is array-valued, so one accumulator can follow many ledgers
+    at once by passing one rate (and one cash flow per update) per ledger.
+    """
+
+    def __init__(self, interest_rate):
+        self.growth = 1 + np.asarray(interest_rate, dtype=float)
+        self.fv = np.zeros_like(self.growth)
+        self.pv = np.zeros_like(self.growth)
+        self._discount = np.ones_like(self.growth)
+        self.count = 0
+
+    def add(self, cash_flow):
+        """
+        Folds in the next period's cash flow.
+
+        Returns:
+            The accumulator itself, so calls can be chained.
+        """
+        if self.count:
+            self.fv = self.fv * self.growth
+            self._discount = self._discount / self.growth
+        self.fv = self.fv + cash_flow
+        self.pv = self.pv + cash_flow * self._discount
+        self.count += 1
+        return self
+
+    def extend(self, cash_flows):
+        """
+        Folds in several periods at once; the first axis of cash_flows is time.
+
+        Returns:
+            The accumulator itself, so calls can be chained.
+        """
+        for cash_flow in np.asarray(cash_flows, dtype=float):
+            self.add(cash_flow)
+        return self
+
+    def result(self):
+        """The (fv, pv) of everything folded in so far."""
+        return LedgerValues(self.fv[()], self.pv[()])
+
+if __name__ == "__main__":
+    # Example usage: three ledgers of different lengths, batch and streaming
+    ledgers = [[100, 200, 300], [-50, 25], [10, 10, 10, 10, 10]]
+    values, offsets = pack_ledgers(ledgers)
+    batch = calculate_ledger_values(values, offsets, 0.05)
+    print("FV:", batch.fv)
+    print("PV:", batch.pv)
+
+    stream = CashFlowAccumulator(0.05)
+    for cash_flow in ledgers[0]:
+        stream.add(cash_flow)
+    print("Streamed first ledger:", stream.result())
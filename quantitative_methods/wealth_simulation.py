@@ -0,0 +1,214 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from quantitative_methods import measure_return
+
+# Terminal state of every simulated path
+WealthPaths = namedtuple('WealthPaths', ['nominal', 'real', 'depleted'])
+
+# Quantiles reported by project_wealth unless others are requested
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+RETURN_MODELS = ('normal', 'lognormal', 'bootstrap')
+
+def _growth(rng, shape, model, mean, volatility, history, index):
+    """
+    One plus the return of each (period, path) cell.
+
+    A return below -100% (possible in the normal tails or in a bad history) loses
+    the whole balance rather than turning it negative, so growth is floored at 0.
+    """
+    if model == 'normal':
+        return np.maximum(1 + rng.normal(mean, volatility, shape), 0)
+    if model == 'lognormal':
+        # 1 + r is lognormal with the requested mean and volatility of r
+        sigma2 = np.log1p((volatility / (1 + mean)) ** 2)
+        return np.exp(rng.normal(np.log1p(mean) - sigma2 / 2, np.sqrt(sigma2), shape))
+    return np.maximum(1 + history[index], 0)
+
+def _simulate_block(task):
+    """
+    Simulate one block of paths from its own seed.
+
+    Returns are drawn for the whole block as a periods x paths matrix (each period
+    is a contiguous row) and converted to real returns with measure_return.real_return.
+    Wealth is then stepped through time in today's money for all paths at once, and
+    nominal wealth is the real balance at the path's final price level.
+    """
+    seed, paths, spec = task
+    rng = np.random.default_rng(seed)
+    periods = spec['periods']
+    shape = (periods, paths)
+
+    index = None
+    if spec['model'] == 'bootstrap':
+        # Returns and inflation are resampled from the same historical periods
+        index = rng.integers(0, len(spec['history']), shape)
+    growth = _growth(rng, shape, spec['model'], spec['mean_return'], spec['volatility'], spec['history'], index)
+    if spec['inflation_history'] is not None:
+        inflation = spec['inflation_history'][index]
+    elif spec['inflation_volatility'] > 0:
+        inflation = rng.normal(spec['inflation_mean'], spec['inflation_volatility'], shape)
+    else:
+        inflation = np.full(shape, float(spec['inflation_mean']))
+    real_growth = 1 + measure_return.real_return(growth - 1, inflation)
+
+    contribution = spec['contribution']
+    begin = spec['timing'] == 'begin'
+    wealth = np.full(paths, spec['initial_wealth'], dtype=float)
+    price_level = np.ones(paths)
+    depleted = np.zeros(paths, dtype=bool)
+    for t in range(periods):
+        if begin:
+            # Indexed flows are already in today's money; fixed ones are deflated
+            flow = contribution[t] if spec['indexed'] else contribution[t] / price_level
+            wealth = (wealth + flow) * real_growth[t]
+            price_level = price_level * (1 + inflation[t])
+        else:
+            price_level = price_level * (1 + inflation[t])
+            flow = contribution[t] if spec['indexed'] else contribution[t] / price_level
+            wealth = wealth * real_growth[t] + flow
+        # A withdrawal larger than the balance exhausts the portfolio
+        depleted |= wealth < 0
+        np.maximum(wealth, 0, out=wealth)
+    return wealth * price_level, wealth, depleted
+
+def simulate_wealth(initial_wealth, periods, contribution=0.0, model='lognormal', mean_return=0.005,
+                    volatility=0.04, history=None, inflation_mean=0.0, inflation_volatility=0.0,
+                    inflation_history=None, timing='end', indexed=False, paths=10000, block_size=4096,
+                    seed=None, processes=None):
+    """
+    Simulate terminal wealth over many return and inflation paths.
+
+    Each period the portfolio earns that period's return and receives the period's
+    contribution (negative for a withdrawal). Wealth cannot fall below zero: a return
+    below -100% empties the portfolio, and paths where a withdrawal exceeded the
+    balance are flagged as depleted. All rates are per period, e.g. monthly for a
+    480-period (40-year) plan. With zero volatility and inflation the result equals
+    tvm_kernel.future_value_series.
+
+    Paths are generated in blocks of block_size, so memory is bounded by one block
+    per process. Every block draws from its own stream spawned from one
+    np.random.SeedSequence, so for a given seed, paths and block_size the result is
+    the same whether it runs in this process or across any number of workers.
+
+    Parameters:
+    initial_wealth (float): Wealth at the start.
+    periods (int): Number of periods to simulate.
+    contribution (float or array-like): Cash flow per period, or one per period.
+    model (str): 'normal' or 'lognormal' returns with mean_return and volatility,
+        or 'bootstrap' to resample the periodic returns in history.
+    mean_return (float): Mean return per period for the normal and lognormal models.
+    volatility (float): Standard deviation of the return per period.
+    history (array-like, optional): Historical periodic returns for 'bootstrap'.
+    inflation_mean (float): Mean inflation per period.
+    inflation_volatility (float): Standard deviation of inflation per period; 0 for
+        constant inflation.
+    inflation_history (array-like, optional): Historical inflation aligned with
+        history. With 'bootstrap' each period resamples both from the same date.
+    timing (str): 'end' for cash flows at the end of each period, 'begin' for the start.
+    indexed (bool): Grow the contributions with realised inflation up to the date of
+        each flow (the amounts are in today's money).
+    paths (int): Number of paths.
+    block_size (int): Paths generated at a time.
+    seed (int or np.random.SeedSequence, optional): Seed for reproducible results.
+    processes (int, optional): Worker processes. Runs in this process when None or 1.
+
+    Returns:
+    WealthPaths: nominal and real (deflated by the path's price level) terminal
+    wealth and a depleted flag, one entry per path.
+    """
+    if model not in RETURN_MODELS:
+        raise ValueError("Invalid model. Please use 'normal', 'lognormal' or 'bootstrap'.")
+    if timing not in ('begin', 'end'):
+        raise ValueError("Invalid timing. Please use 'begin' or 'end'.")
+    if model == 'bootstrap':
+        if history is None or len(history) == 0:
+            raise ValueError("Invalid history. Please provide historical returns for the bootstrap model.")
+        history = np.asarray(history, dtype=float)
+    if inflation_history is not None:
+        if model != 'bootstrap':
+            raise ValueError("Invalid inflation history. Please use it with the bootstrap model.")
+        inflation_history = np.asarray(inflation_history, dtype=float)
+        if inflation_history.shape != history.shape:
+            raise ValueError("Invalid inflation history. Please align it with the return history.")
+
+    spec = {
+        'periods': int(periods),
+        'initial_wealth': float(initial_wealth),
+        'contribution': np.broadcast_to(np.asarray(contribution, dtype=float), (int(periods),)),
+        'model': model,
+        'mean_return': mean_return,
+        'volatility': volatility,
+        'history': history,
+        'inflation_mean': inflation_mean,
+        'inflation_volatility': inflation_volatility,
+        'inflation_history': inflation_history,
+        'timing': timing,
+        'indexed': indexed,
+    }
+    sizes = [min(block_size, paths - start) for start in range(0, paths, block_size)]
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    tasks = [(child, size, spec) for child, size in zip(root.spawn(len(sizes)), sizes)]
+
+    if processes and processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(min(processes, len(tasks))) as pool:
+            blocks = list(pool.map(_simulate_block, tasks))
+    else:
+        blocks = [_simulate_block(task) for task in tasks]
+    if not blocks:
+        return WealthPaths(np.zeros(0), np.zeros(0), np.zeros(0, dtype=bool))
+    return WealthPaths(*(np.concatenate(parts) for parts in zip(*blocks)))
+
+def wealth_quantiles(simulation, quantiles=DEFAULT_QUANTILES):
+    """
+    Quantiles of nominal and real terminal wealth.
+
+    Parameters:
+    simulation (WealthPaths): Result of simulate_wealth.
+    quantiles (sequence): Quantiles between 0 and 1.
+
+    Returns:
+    pd.DataFrame: nominal and real wealth indexed by quantile.
+    """
+    quantiles = np.asarray(quantiles, dtype=float)
+    return pd.DataFrame(
+        {'nominal': np.quantile(simulation.nominal, quantiles), 'real': np.quantile(simulation.real, quantiles)},
+        index=pd.Index(quantiles, name='quantile'),
+    )
+
+def project_wealth(initial_wealth, periods, quantiles=DEFAULT_QUANTILES, **kwargs):
+    """
+    Quantiles of terminal wealth from a Monte Carlo projection.
+
+    Parameters:
+    initial_wealth (float): Wealth at the start.
+    periods (int): Number of periods to simulate.
+    quantiles (sequence): Quantiles between 0 and 1.
+    **kwargs: Any other argument of simulate_wealth.
+
+    Returns:
+    pd.DataFrame: nominal and real wealth indexed by quantile.
+    """
+    return wealth_quantiles(simulate_wealth(initial_wealth, periods, **kwargs), quantiles)
+
+if __name__ == "__main__":
+    # Example usage: 40 years of monthly saving, then the same plan bootstrapped from history
+    projection = project_wealth(
+        10000, 480, contribution=500, mean_return=0.006, volatility=0.045,
+        inflation_mean=0.002, inflation_volatility=0.003, indexed=True, paths=20000, seed=42,
+    )
+    print(projection.round(0))
+
+    rng = np.random.default_rng(0)
+    history = rng.normal(0.007, 0.04, 600)
+    inflation_history = rng.normal(0.0025, 0.003, 600)
+    retirement = simulate_wealth(
+        1_000_000, 360, contribution=-5000, model='bootstrap', history=history,
+        inflation_history=inflation_history, indexed=True, paths=20000, seed=42, processes=2,
+    )
+    print(wealth_quantiles(retirement).round(0))
+    print(f"Probability of running out: {retirement.depleted.mean():.1%}")
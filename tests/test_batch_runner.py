@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import batch_runner
+
+RATINGS = {'AAA': 0.002, 'AA': 0.004, 'A': 0.01, 'BBB': 0.02}
+
+def rating_file(tmp_path, bad_row):
+    ratings = np.array(list(RATINGS))[np.arange(4000) % 4].astype(object)
+    ratings[bad_row] = 'ZZZ'
+    path = tmp_path / 'bonds.csv'
+    pd.DataFrame({'bond': np.arange(4000), 'credit_rating': ratings}).to_csv(path, index=False)
+    return str(path)
+
+def run_ratings(tmp_path, bad_row):
+    output = str(tmp_path / 'premia.csv')
+    state = batch_runner.run(
+        'calculate_default_risk_premium', rating_file(tmp_path, bad_row), output,
+        constants={'historical_default_rates': RATINGS}, keep=['bond'], chunksize=1000, progress=None,
+    )
+    return state, pd.read_csv(output)
+
+@pytest.mark.parametrize('bad_row', [3500, 10])
+def test_invalid_row_becomes_nan_and_keeps_vectorized_path(tmp_path, bad_row):
+    state, result = run_ratings(tmp_path, bad_row)
+    assert state['complete'] and state['rows'] == 4000
+    assert state['mode'] == 'vectorized'
+    assert state['errors'] == 1 and state['row_chunks'] == 1
+    assert np.isnan(result['calculate_default_risk_premium'][bad_row])
+    expected = np.array(list(RATINGS.values()))[np.arange(4000) % 4]
+    valid = result['bond'] != bad_row
+    np.testing.assert_allclose(result['calculate_default_risk_premium'][valid], expected[valid])
+
+def test_function_without_vectorized_path_switches_to_rows(tmp_path):
+    path = tmp_path / 'quotes.csv'
+    pd.DataFrame({'interest': [100.0] * 30, 'loan_amount': [1000.0] * 30}).to_csv(path, index=False)
+    state = batch_runner.run('calculate_cost_decimal', str(path), str(tmp_path / 'out.csv'), chunksize=10, progress=None)
+    assert state['mode'] == 'rows' and state['row_chunks'] == 3 and state['errors'] == 0
+
+class Interrupt(Exception):
+    pass
+
+class StopAfter:
+    """Progress stream that interrupts the job after a number of chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def write(self, text):
+        if text.strip():
+            self.chunks -= 1
+            if self.chunks == 0:
+                raise Interrupt
+
+def test_resume_with_blank_lines_and_quoted_newlines(tmp_path):
+    lines = ['label,payment,rate,term']
+    for i in range(50):
+        lines.append(f'"loan {i}\nline two",{100 + i},0.0{i % 9 + 1},{i % 30 + 1}')
+        if i % 7 == 0:
+            lines.append('')
+    path = tmp_path / 'loans.csv'
+    path.write_text('\n'.join(lines) + '\n')
+    arguments = dict(mapping={'pmt': 'payment', 'r': 'rate', 'n': 'term'}, keep=['label'], chunksize=8)
+
+    full = str(tmp_path / 'full.csv')
+    batch_runner.run('calculate_annuity_pv', str(path), full, progress=None, **arguments)
+    resumed = str(tmp_path / 'resumed.csv')
+    with pytest.raises(Interrupt):
+        batch_runner.run('calculate_annuity_pv', str(path), resumed, progress=StopAfter(3), **arguments)
+    state = batch_runner.run('calculate_annuity_pv', str(path), resumed, resume=True, progress=None, **arguments)
+
+    assert state['rows'] == 50
+    assert (tmp_path / 'full.csv').read_bytes() == (tmp_path / 'resumed.csv').read_bytes()
+
+def loans_file(tmp_path, rows=23):
+    path = tmp_path / 'loans.csv'
+    pd.DataFrame({
+        'loan': np.arange(rows), 'payment': np.linspace(100, 300, rows),
+        'rate': np.linspace(0.01, 0.1, rows), 'term': np.arange(rows) % 30 + 1,
+    }).to_csv(path, index=False)
+    return str(path)
+
+@pytest.mark.parametrize('mode', ['auto', 'rows'])
+def test_output_does_not_depend_on_chunksize(tmp_path, mode):
+    path = loans_file(tmp_path)
+    outputs = []
+    for chunksize in [1, 4, 1000]:
+        output = tmp_path / f'pv_{mode}_{chunksize}.csv'
+        batch_runner.run('calculate_annuity_pv', path, str(output), mapping={'pmt': 'payment', 'r': 'rate', 'n': 'term'},
+                         keep=['loan'], chunksize=chunksize, mode=mode, progress=None)
+        outputs.append(output.read_bytes())
+    assert outputs[0] == outputs[1] == outputs[2]
+
+@pytest.mark.parametrize('function', ['calculate_productivity_measures', 'expanding_geometric_mean_return'])
+def test_functions_over_whole_series_are_refused(tmp_path, function):
+    path = tmp_path / 'series.csv'
+    pd.DataFrame({'labor_input': [0, 1, 2, 3], 'total_product': [0, 10, 25, 35],
+                  'returns': [0.1, -0.05, 0.2, 0.03]}).to_csv(path, index=False)
+    with pytest.raises(ValueError, match='depend on other rows'):
+        batch_runner.run(function, str(path), str(tmp_path / 'out.csv'), chunksize=2, progress=None)
+
+def test_unexpected_errors_are_not_swallowed(tmp_path, monkeypatch):
+    import quantitative_methods
+
+    def broken(pmt, r, n):
+        raise RuntimeError('bug')
+
+    monkeypatch.setattr(quantitative_methods, 'calculate_annuity_pv', broken)
+    with pytest.raises(RuntimeError, match='bug'):
+        batch_runner.run('calculate_annuity_pv', loans_file(tmp_path), str(tmp_path / 'out.csv'),
+                         mapping={'pmt': 'payment', 'r': 'rate', 'n': 'term'}, progress=None)
+
+def test_parquet_input_and_output(tmp_path):
+    pytest.importorskip('pyarrow')
+    source = pd.read_csv(loans_file(tmp_path))
+    path = str(tmp_path / 'loans.parquet')
+    source.to_parquet(path, index=False, row_group_size=5)
+    arguments = dict(mapping={'pmt': 'payment', 'r': 'rate', 'n': 'term'}, keep=['loan'], chunksize=4)
+
+    full = str(tmp_path / 'full.parquet')
+    state = batch_runner.run('calculate_annuity_pv', path, full, progress=None, **arguments)
+    assert state['complete'] and state['rows'] == len(source)
+    result = pd.read_parquet(full).sort_values('loan', ignore_index=True)
+    expected = (source['payment'] * (1 - (1 + source['rate']) ** -source['term']) / source['rate']).to_numpy()
+    np.testing.assert_allclose(result['calculate_annuity_pv'], expected)
+
+    resumed = str(tmp_path / 'resumed.parquet')
+    with pytest.raises(Interrupt):
+        batch_runner.run('calculate_annuity_pv', path, resumed, progress=StopAfter(2), **arguments)
+    batch_runner.run('calculate_annuity_pv', path, resumed, resume=True, progress=None, **arguments)
+    pd.testing.assert_frame_equal(pd.read_parquet(resumed).sort_values('loan', ignore_index=True), result)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from quantitative_methods.calculate_mean import (
+    ArithmeticMeanAccumulator, GeometricMeanAccumulator, GeometricMeanReturnAccumulator, HarmonicMeanAccumulator,
+    arithmetic_mean, expanding_geometric_mean_return, geometric_mean, geometric_mean_return, harmonic_mean,
+    rolling_geometric_mean_return,
+)
+
+DATA = np.array([1.5, 2.0, 4.0, 8.0, 3.0, 0.5, 6.0])
+
+@pytest.mark.parametrize('accumulator, expected', [
+    (ArithmeticMeanAccumulator, DATA.mean()),
+    (GeometricMeanAccumulator, stats.gmean(DATA)),
+    (HarmonicMeanAccumulator, stats.hmean(DATA)),
+])
+def test_merged_accumulators_match_the_whole_sample(accumulator, expected):
+    left = accumulator.from_chunks([DATA[:2], DATA[2:4]])
+    right = accumulator().update(DATA[4:])
+    assert np.isclose(left.merge(right).result(), expected)
+
+def test_streaming_matches_one_update_and_the_list_functions():
+    streamed = HarmonicMeanAccumulator.from_chunks(np.array_split(DATA, 4))
+    assert np.isclose(streamed.result(), HarmonicMeanAccumulator().update(DATA).result())
+    data = DATA.tolist()
+    assert np.isclose(arithmetic_mean(data), DATA.mean())
+    assert np.isclose(geometric_mean(data), stats.gmean(DATA))
+    assert np.isclose(harmonic_mean(data), stats.hmean(DATA))
+
+def test_merge_rejects_another_statistic():
+    with pytest.raises(TypeError):
+        ArithmeticMeanAccumulator().merge(GeometricMeanAccumulator())
+
+def test_means_reject_empty_and_non_positive_data():
+    with pytest.raises(ValueError, match='without data'):
+        arithmetic_mean([])
+    with pytest.raises(ValueError, match='non-positive'):
+        harmonic_mean([1, 0, 2])
+    with pytest.raises(ValueError, match='non-positive'):
+        GeometricMeanAccumulator.from_chunks([[1, 2], [-1]])
+
+def test_geometric_mean_return_accumulator():
+    returns = [0.10, -0.05, 0.20]
+    expected = (1.10 * 0.95 * 1.20) ** (1 / 3) - 1
+    assert np.isclose(GeometricMeanReturnAccumulator.from_chunks([returns[:1], returns[1:]]).result(), expected)
+    assert np.isclose(geometric_mean_return(returns), expected)
+    np.testing.assert_allclose(geometric_mean_return([returns, returns]), [expected, expected])
+
+def test_rolling_geometric_mean_matches_a_direct_window():
+    returns = np.array([0.10, -0.05, 0.20, 0.03, -0.10, 0.07])
+    result = rolling_geometric_mean_return(returns, 3)
+    assert np.isnan(result[:2]).all()
+    expected = [np.prod(1 + returns[i - 2:i + 1]) ** (1 / 3) - 1 for i in range(2, len(returns))]
+    np.testing.assert_allclose(result[2:], expected)
+
+    windows = rolling_geometric_mean_return(np.vstack([returns, returns]), [1, 3])
+    np.testing.assert_allclose(windows[1][0], returns)
+    np.testing.assert_allclose(windows[3][1], result, equal_nan=True)
+    np.testing.assert_allclose(expanding_geometric_mean_return(returns)[2], expected[0])
+
+@pytest.mark.parametrize('function', [
+    geometric_mean_return,
+    expanding_geometric_mean_return,
+    lambda returns: rolling_geometric_mean_return(returns, 2),
+    lambda returns: GeometricMeanReturnAccumulator().update(returns),
+])
+def test_returns_of_minus_100_percent_or_less_are_rejected(function):
+    for returns in ([0.10, -1.0, 0.05], [0.10, -1.5, 0.05]):
+        with pytest.raises(ValueError, match='-100%'):
+            function(returns)
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from quantitative_methods.charting import chi_square_test, contingency_table
+from quantitative_methods.contingency import ContingencyEngine
+
+DATA = pd.DataFrame({
+    'sex': ['M', 'F', 'F', 'M', 'F', 'M'],
+    'smoker': ['y', 'n', 'n', 'n', 'y', 'y'],
+    'region': ['N', 'S', 'N', 'S', 'N', 'N'],
+})
+
+def test_engine_is_used_without_data_and_variables():
+    engine = ContingencyEngine(DATA, ['sex', 'smoker'])
+    results = chi_square_test(None, None, engine=engine, verbose=False)
+    assert list(zip(results.var1, results.var2)) == [('sex', 'smoker')]
+    assert chi_square_test(DATA, ['sex', 'smoker'], engine=engine, verbose=False).equals(results)
+
+def test_engine_must_agree_with_variables_and_data():
+    engine = ContingencyEngine(DATA, ['sex', 'smoker'])
+    with pytest.raises(ValueError, match='Invalid variables'):
+        chi_square_test(DATA, ['sex', 'region'], engine=engine, verbose=False)
+    with pytest.raises(ValueError, match='Invalid data'):
+        contingency_table(DATA.copy(), None, engine=engine)
+
+def test_contingency_table_returns_every_pair(capsys):
+    tables = contingency_table(DATA, ['sex', 'smoker', 'region'], verbose=False)
+    assert list(tables) == [('sex', 'smoker'), ('sex', 'region'), ('smoker', 'region')]
+    pd.testing.assert_frame_equal(tables['sex', 'smoker'], pd.crosstab(DATA.sex, DATA.smoker), check_dtype=False,
+                                  check_index_type=False, check_column_type=False, check_names=False)
+    assert capsys.readouterr().out == ''
+    contingency_table(DATA, ['sex', 'smoker'])
+    assert 'Contingency table for sex and smoker:' in capsys.readouterr().out
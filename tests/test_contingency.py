@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency
+
+from quantitative_methods.contingency import ContingencyEngine
+
+def _data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'region': rng.choice(['N', 'S', 'E', 'W'], 500),
+        'product': rng.choice(['x', 'y', 'z'], 500),
+        'channel': rng.choice(['web', 'store'], 500),
+    })
+
+def test_tables_match_crosstab():
+    data = _data()
+    engine = ContingencyEngine(data, list(data.columns))
+    for a, b in engine.pairs():
+        expected = pd.crosstab(data[a], data[b])
+        pd.testing.assert_frame_equal(engine.table(a, b), expected, check_dtype=False,
+                                      check_index_type=False, check_column_type=False)
+
+def test_chi_square_matches_scipy():
+    data = _data()
+    results = ContingencyEngine(data, list(data.columns)).chi_square()
+    for row in results.itertuples(index=False):
+        chi2, p_value, dof, _ = chi2_contingency(pd.crosstab(data[row.var1], data[row.var2]))
+        assert np.isclose(row.chi2, chi2) and np.isclose(row.p_value, p_value) and row.dof == dof
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantitative_methods import data_loader
+from quantitative_methods.data_loader import load_csv
+
+def write_csv(tmp_path, frame, name='data.csv'):
+    path = tmp_path / name
+    frame.to_csv(path, index=False)
+    return str(path)
+
+def test_category_values_that_look_numeric_in_later_chunks(tmp_path):
+    path = write_csv(tmp_path, pd.DataFrame({'Group': ['A', 'B'] * 50 + ['1', '2'] * 50, 'Value': range(200)}))
+    data = load_csv(path, chunksize=100)
+    assert isinstance(data['Group'].dtype, pd.CategoricalDtype)
+    assert data['Group'].astype(str).tolist() == pd.read_csv(path, dtype={'Group': str})['Group'].tolist()
+    assert data['Value'].tolist() == list(range(200))
+
+def survey(tmp_path):
+    rng = np.random.default_rng(0)
+    names = np.array([f'name {i}' for i in range(1000)], dtype=object)
+    names[::7] = None
+    return write_csv(tmp_path, pd.DataFrame({
+        'Region': rng.choice(['North', 'South'], 1000),
+        'Name': names,
+        'Age': rng.integers(18, 90, 1000),
+        'Score': rng.normal(size=1000),
+    }))
+
+def test_npz_cache_round_trip_without_pickle(tmp_path, monkeypatch):
+    def no_parquet(self, *args, **kwargs):
+        raise ValueError("ArrowInvalid: mixed types")
+    monkeypatch.setattr(pd.DataFrame, 'to_parquet', no_parquet)
+    path, cache_dir = survey(tmp_path), str(tmp_path / 'cache')
+
+    data = load_csv(path, chunksize=300, cache_dir=cache_dir)
+    files = os.listdir(cache_dir)
+    assert len(files) == 1 and files[0].endswith('.npz')
+    with np.load(os.path.join(cache_dir, files[0]), allow_pickle=False) as arrays:
+        assert all(arrays[key].dtype != object for key in arrays.files)
+
+    cached = load_csv(path, chunksize=300, cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(cached, data)
+    assert cached['Name'].isna().sum() == data['Name'].isna().sum()
+
+def test_truncated_cache_file_is_a_miss(tmp_path, monkeypatch):
+    monkeypatch.setattr(pd.DataFrame, 'to_parquet', lambda *args, **kwargs: (_ for _ in ()).throw(ImportError))
+    path, cache_dir = survey(tmp_path), str(tmp_path / 'cache')
+    data = load_csv(path, cache_dir=cache_dir)
+    cache_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    with open(cache_file, 'r+b') as f:
+        f.truncate(100)
+    pd.testing.assert_frame_equal(load_csv(path, cache_dir=cache_dir), data)
+
+def test_interrupted_cache_write_leaves_no_file(tmp_path):
+    target = str(tmp_path / 'cache.npz')
+
+    def fail(f):
+        f.write(b'partial')
+        raise KeyboardInterrupt
+
+    try:
+        data_loader._write_atomic(target, fail)
+    except KeyboardInterrupt:
+        pass
+    assert os.listdir(tmp_path) == []
+
+def test_file_is_parsed_once_and_chunking_does_not_change_the_result(tmp_path, monkeypatch):
+    path = survey(tmp_path)
+    whole = load_csv(path, chunksize=10_000)
+    calls = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        calls.append(kwargs)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, 'read_csv', counting_read_csv)
+    chunked = load_csv(path, chunksize=300)
+    assert len(calls) == 1 and 'nrows' not in calls[0]
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert isinstance(chunked['Region'].dtype, pd.CategoricalDtype) and chunked['Age'].dtype == np.int8
+
+def test_parquet_cache_round_trip(tmp_path):
+    pytest.importorskip('pyarrow')
+    path, cache_dir = survey(tmp_path), str(tmp_path / 'cache')
+    data = load_csv(path, chunksize=300, cache_dir=cache_dir)
+    files = os.listdir(cache_dir)
+    assert len(files) == 1 and files[0].endswith('.parquet')
+    pd.testing.assert_frame_equal(load_csv(path, chunksize=300, cache_dir=cache_dir), data)
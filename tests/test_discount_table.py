@@ -0,0 +1,17 @@
+import numpy as np
+
+from quantitative_methods import tvm_kernel
+from quantitative_methods.discount_table import DiscountFactorTable
+
+def test_grid_points_and_interpolation_agree_with_kernel():
+    table = DiscountFactorTable(np.round(np.arange(0, 101) * 1e-3, 3), np.arange(0, 61), interpolate=True)
+    assert np.isclose(table.present_value(1000, 0.05, 10), tvm_kernel.present_value(1000, 0.05, 10))
+    # log1p(r) interpolation is exact in n and close in r
+    assert np.isclose(table.annuity_pv(100, 0.0505, 10.5), tvm_kernel.annuity_pv(100, 0.0505, 10.5), rtol=1e-5)
+    assert table.stats()['hits'] == 1 and table.stats()['interpolated'] == 1
+
+def test_off_grid_requests_are_exact():
+    table = DiscountFactorTable([0.01, 0.02], [1, 2])
+    rates = np.array([0.01, 0.3])
+    np.testing.assert_allclose(table.annuity_fv(100, rates, 12), tvm_kernel.annuity_fv(100, rates, 12))
+    assert table.stats()['misses'] == 2
@@ -0,0 +1,59 @@
+import numpy as np
+
+import pytest
+
+from economics.elasticity import (
+    arc_elasticities, calculate_elasticity_coefficient, calculate_unitary_elasticity_point, find_unitary_elasticity,
+    fit_demand, own_price_elasticities, point_elasticities,
+)
+
+PRICES = [5, 6, 7, 8]
+QUANTITIES = [120, 110, 100, 90]
+
+def test_single_curve_results_are_one_dimensional():
+    assert own_price_elasticities(PRICES, QUANTITIES).shape == (4,)
+    assert point_elasticities(PRICES, QUANTITIES).shape == (4,)
+    assert arc_elasticities(PRICES, QUANTITIES).shape == (3,)
+
+def test_batch_results_keep_one_row_per_curve():
+    prices, quantities = np.array([PRICES] * 3), np.array([QUANTITIES] * 3)
+    assert own_price_elasticities(prices, quantities).shape == (3, 4)
+    assert point_elasticities(prices, quantities).shape == (3, 4)
+    assert arc_elasticities(prices, quantities).shape == (3, 3)
+
+def test_own_price_elasticities_match_scalar_coefficient():
+    result = own_price_elasticities(PRICES, QUANTITIES)
+    assert np.isnan(result[0])
+    for price, quantity, elasticity in zip(PRICES[1:], QUANTITIES[1:], result[1:]):
+        assert np.isclose(elasticity, calculate_elasticity_coefficient(price, quantity, QUANTITIES[0], PRICES[0]))
+
+def test_arc_elasticity_uses_midpoints():
+    # (-10 / 115) / (1 / 5.5)
+    assert np.isclose(arc_elasticities(PRICES, QUANTITIES)[0], -10 / 115 * 5.5)
+
+def test_unitary_point_without_a_segment_is_missing():
+    assert calculate_unitary_elasticity_point([5], [120]) == (None, None)
+    price, quantity = find_unitary_elasticity([[5, 6], [7, 8]], [[120, 110], [100, 90]], method='arc')
+    assert price.shape == (2,) and np.isnan(price).all() and np.isnan(quantity).all()
+    price, _ = find_unitary_elasticity([5], [120], method='arc')
+    assert np.isnan(price).all()
+
+@pytest.mark.parametrize('form, demand', [
+    ('linear', lambda p: 200 - 5 * p),
+    ('log-log', lambda p: np.exp(6) * p ** -1.5),
+    ('semi-log', lambda p: np.exp(6 - 0.1 * p)),
+])
+def test_fit_demand_recovers_known_coefficients(form, demand):
+    prices = np.linspace(2, 20, 10)
+    curve = fit_demand(prices, demand(prices), form)
+    expected = {'linear': (200, -5), 'log-log': (6, -1.5), 'semi-log': (6, -0.1)}[form]
+    np.testing.assert_allclose([curve.intercept[0], curve.slope[0]], expected)
+    np.testing.assert_allclose(curve.r_squared, 1)
+    np.testing.assert_allclose(curve(prices), demand(prices))
+
+def test_single_demand_curve_keeps_the_price_shape():
+    curve = fit_demand(PRICES, QUANTITIES)
+    assert curve([5, 6, 7]).shape == (3,)
+    assert np.ndim(curve(9)) == 0 and np.isclose(curve(9), 80)
+    batch = fit_demand([PRICES] * 2, [QUANTITIES] * 2)
+    assert batch([5, 6, 7]).shape == (2, 3)
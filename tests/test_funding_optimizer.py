@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from corporate_finance.funding_optimizer import FundingBook, allocate_funding
+
+QUOTES = pd.DataFrame({
+    'interest': [1000, 500, 750, 400],
+    'commitment_fee': [50, 0, 0, 0],
+    'loan_amount': [10000, 10000, 15000, 8000],
+    'dealer_commission': [0, 0, 25, 15],
+    'backup_costs': [0, 0, 10, 5],
+    'capacity': [20000, 10000, 15000, 8000],
+}, index=['LOC Bank A', 'BA Bank B', 'CP Program 1', 'CP Program 2'])
+
+def test_greedy_fills_the_cheapest_quotes_first():
+    result = allocate_funding(30000, QUOTES)
+    # BA Bank B (5.26%), CP Program 1 (5.51%) and CP Program 2 (5.53%) cover 30,000 before the LOC (10.5%)
+    expected = pd.Series([0.0, 10000.0, 15000.0, 5000.0], index=QUOTES.index, name='amount')
+    pd.testing.assert_series_equal(result.allocation, expected)
+    assert np.isclose(result.total_cost, 10000 * 500 / 9500 + 15000 * 785 / 14250 + 5000 * 420 / 7600)
+    assert result.shortfall == 0
+
+def test_greedy_and_lp_agree():
+    for need in [0, 5000, 30000, 53000, 60000]:
+        greedy = allocate_funding(need, QUOTES)
+        lp = allocate_funding(need, QUOTES, method='lp')
+        assert np.isclose(greedy.total_cost, lp.total_cost)
+        np.testing.assert_allclose(greedy.allocation, lp.allocation, atol=1e-6)
+    assert allocate_funding(60000, QUOTES).shortfall == 7000
+
+def test_update_quote_reorders_the_book():
+    book = FundingBook(QUOTES)
+    book.update_quote('LOC Bank A', interest=100)
+    assert book.ranking().index[0] == 'LOC Bank A'
+    assert book.allocate(20000).allocation['LOC Bank A'] == 20000
+    with pytest.raises(ValueError):
+        book.allocate(-1)
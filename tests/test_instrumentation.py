@@ -0,0 +1,85 @@
+import pytest
+
+import economics
+import quantitative_methods
+from economics import elasticity
+from quantitative_methods import instrumentation, irr_engine
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+def test_disable_restores_the_original_functions():
+    original_irr = irr_engine.irr
+    original_package_irr = quantitative_methods.irr
+    instrumentation.enable()
+    assert irr_engine.irr is not original_irr
+    assert irr_engine.irr.__wrapped__ is original_irr
+    quantitative_methods.irr([-100, 60, 60])
+    instrumentation.disable()
+    assert irr_engine.irr is original_irr
+    assert quantitative_methods.irr is original_package_irr
+    assert instrumentation.snapshot()['functions']['quantitative_methods.irr']['calls'] == 1
+
+def test_second_enable_switches_packages():
+    original_elasticity = elasticity.own_price_elasticities
+    original_irr = irr_engine.irr
+    instrumentation.enable(('economics',))
+    assert elasticity.own_price_elasticities is not original_elasticity
+    assert irr_engine.irr is original_irr
+
+    instrumentation.enable('quantitative_methods')
+    assert elasticity.own_price_elasticities is original_elasticity
+    assert economics.own_price_elasticities is original_elasticity
+    assert irr_engine.irr is not original_irr
+
+    instrumentation.disable()
+    assert irr_engine.irr is original_irr
+
+def test_iterations_are_credited_to_every_active_call():
+    @instrumentation.instrument
+    def inner():
+        instrumentation.add_iterations(3)
+
+    @instrumentation.instrument
+    def outer():
+        inner()
+        instrumentation.add_iterations(2)
+
+    outer()
+    instrumentation.enable(())
+    outer()
+    functions = instrumentation.snapshot()['functions']
+    assert functions[inner.__wrapped_name__]['iterations'] == 3
+    assert functions[outer.__wrapped_name__]['iterations'] == 5
+    assert functions[outer.__wrapped_name__]['calls'] == 1
+
+def test_wrapping_solver_reports_irr_iterations():
+    instrumentation.enable()
+    quantitative_methods.calculate_mwrr([-100, 50, 75, 120])
+    functions = instrumentation.snapshot()['functions']
+    iterations = functions['quantitative_methods.irr']['iterations']
+    assert iterations > 0
+    assert functions['quantitative_methods.calculate_mwrr']['iterations'] == iterations
+
+def test_prometheus_output():
+    instrumentation.enable()
+    quantitative_methods.calculate_annuity_pv(100, 0.05, 10)
+    quantitative_methods.calculate_annuity_pv(100, 0.05, 10)
+    with pytest.raises(ValueError):
+        instrumentation.enable(profiler='unknown')
+    text = instrumentation.to_prometheus()
+    label = 'function="quantitative_methods.calculate_annuity_pv"'
+    lines = text.splitlines()
+    assert '# TYPE cfa_calls_total counter' in lines
+    assert '# TYPE cfa_wall_seconds histogram' in lines
+    assert f'cfa_calls_total{{{label}}} 2' in lines
+    assert f'cfa_errors_total{{{label}}} 0' in lines
+    assert f'cfa_wall_seconds_bucket{{{label},le="+Inf"}} 2' in lines
+    assert f'cfa_wall_seconds_count{{{label}}} 2' in lines
+    buckets = [int(line.rsplit(' ', 1)[1]) for line in lines
+               if line.startswith(f'cfa_cpu_seconds_bucket{{{label},')]
+    assert buckets == sorted(buckets) and len(buckets) == len(instrumentation.TIME_BUCKETS) + 1
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from quantitative_methods import money_weighted_rate_of_return
+from quantitative_methods.irr_engine import irr, npv, xirr, xnpv
+
+def test_irr_of_a_level_annuity():
+    # 100 now for 3 x 40.21148036 is a 10% annuity
+    rate, converged = irr([-100, 40.21148036, 40.21148036, 40.21148036])
+    assert isinstance(rate, float) and converged is True
+    assert np.isclose(rate, 0.10, atol=1e-8)
+
+def test_irr_zeroes_npv_row_by_row():
+    cash_flows = np.array([[-100, 50, 75, 120], [-1000, 300, 300, 300], [-50, 60, 0, 0]])
+    rates, converged = irr(cash_flows)
+    assert converged.all()
+    np.testing.assert_allclose(npv(rates, cash_flows), 0, atol=1e-8)
+    assert np.isclose(rates[2], 0.2)
+
+def test_irr_without_a_sign_change_is_nan():
+    rates, converged = irr([[100, 50, 25], [-100, 60, 60]])
+    assert np.isnan(rates[0]) and not converged[0]
+    assert converged[1]
+
+def test_xirr_one_year_apart_is_the_simple_return():
+    rate, converged = xirr([-100, 110], ['2023-01-01', '2024-01-01'])
+    assert converged
+    assert np.isclose(rate, 0.10)
+
+def test_xirr_zeroes_xnpv():
+    cash_flows = [-1000, 200, 300, 700]
+    dates = ['2023-01-01', '2023-03-15', '2023-10-30', '2024-06-01']
+    rate, _ = xirr(cash_flows, dates)
+    assert np.isclose(xnpv(rate, cash_flows, dates), 0, atol=1e-8)
+    # Year fractions give the same answer as dates
+    days = np.array([0, 73, 302, 517]) / 365
+    assert np.isclose(xirr(cash_flows, days)[0], rate)
+    rates, converged = xirr([cash_flows], dates)
+    assert rates.shape == converged.shape == (1,)
+
+def test_money_weighted_rate_of_return_runs_as_a_script():
+    script = os.path.abspath(money_weighted_rate_of_return.__file__)
+    result = subprocess.run([sys.executable, script], cwd=os.path.dirname(script), capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "51.64%" in result.stdout
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from economics.law_of_diminishing_marginal_returns import (
+    calculate_panel_productivity_measures, calculate_productivity_measures, find_diminishing_returns_onset,
+)
+
+def test_marginal_product_is_the_change_in_total_product():
+    df = calculate_productivity_measures([0, 1, 2, 4], [0, 10, 25, 40])
+    np.testing.assert_allclose(df['Marginal Product'], [0, 10, 15, 7.5])
+    np.testing.assert_allclose(df['Average Product'], [np.nan, 10, 12.5, 10])
+
+def test_panel_matches_each_firm_and_finds_the_onset():
+    panel = pd.DataFrame({
+        'Firm': ['B', 'A', 'A', 'B', 'A', 'B', 'A'],
+        'Labor Input': [2, 3, 1, 1, 2, 3, 4],
+        'Total Product': [30, 36, 10, 10, 24, 45, 44],
+    })
+    df = calculate_panel_productivity_measures(panel)
+    for firm, rows in df.groupby('Firm'):
+        single = calculate_productivity_measures(rows['Labor Input'].tolist(), rows['Total Product'].tolist())
+        np.testing.assert_allclose(rows['Marginal Product'], single['Marginal Product'])
+    onset = find_diminishing_returns_onset(df)
+    # A: MP 0, 14, 12, 8 -> peaks at 2 workers; B: MP 0, 20, 15 -> peaks at 2 workers
+    assert onset.loc['A', 'Labor Input'] == 2 and onset.loc['B', 'Labor Input'] == 2
@@ -0,0 +1,29 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+@pytest.mark.parametrize('package_name', ['quantitative_methods', 'economics', 'corporate_finance'])
+def test_every_export_resolves_and_is_cached(package_name):
+    package = importlib.import_module(package_name)
+    for module_name, names in package._SUBMODULE_EXPORTS.items():
+        module = importlib.import_module(f'{package_name}.{module_name}')
+        for name in names:
+            assert getattr(package, name) is getattr(module, name)
+            assert name in vars(package)
+    assert set(package.__all__) <= set(dir(package))
+    with pytest.raises(AttributeError, match='no_such_name'):
+        package.no_such_name
+
+def test_importing_the_packages_loads_no_submodule():
+    code = ("import sys, quantitative_methods, economics, corporate_finance; "
+            "print(sorted(m for m in sys.modules if m.split('.')[0] in "
+            "('quantitative_methods', 'economics', 'corporate_finance') and '.' in m))")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+def test_packages_share_the_neutral_lazy_exports_module():
+    import lazy_exports
+    for package_name in ['quantitative_methods', 'economics', 'corporate_finance']:
+        assert importlib.import_module(package_name).lazy_exports is lazy_exports.lazy_exports
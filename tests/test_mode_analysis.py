@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from quantitative_methods.mode_analysis import HistogramAccumulator, calculate_mode
+
+def test_from_chunks_rejects_one_shot_iterator_without_bounds():
+    with pytest.raises(TypeError):
+        HistogramAccumulator.from_chunks((np.arange(10.) for _ in range(3)), 5)
+
+def test_from_chunks_streams_generator_with_bounds():
+    accumulator = HistogramAccumulator.from_chunks((np.arange(10.) for _ in range(3)), 5, lower=0, upper=9)
+    np.testing.assert_array_equal(accumulator.counts, [6, 6, 6, 6, 6])
+
+def test_from_chunks_list_matches_histogram():
+    chunks = [np.arange(10.)] * 3
+    accumulator = HistogramAccumulator.from_chunks(chunks, 5)
+    np.testing.assert_array_equal(accumulator.counts, np.histogram(np.concatenate(chunks), 5)[0])
+
+def test_calculate_mode_ignores_nan_when_checking_for_no_mode():
+    mode, mode_type = calculate_mode([1., 1., 2., 2., np.nan])
+    assert np.isnan(mode) and mode_type == "No Mode"
+    assert calculate_mode([1., 1., 2., 2., 3., np.nan]) == (1., "Bimodal")
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from quantitative_methods.irr_engine import npv
+from quantitative_methods.money_weighted_rate_of_return import calculate_mwrr, calculate_mwrr_batch
+
+def test_mwrr_zeroes_the_npv():
+    cash_flows = [-100, 50, 75, 120]
+    assert np.isclose(npv(calculate_mwrr(cash_flows, -100), cash_flows), 0, atol=1e-8)
+
+def test_batch_rows_match_single_schedules_and_report_failures():
+    portfolios = np.array([[-100, 50, 75, 120], [-1000, 300, 300, 300], [100, 50, 25, 0]])
+    rates, converged = calculate_mwrr_batch(portfolios, tol=[1e-10, 1e-6, 1e-8])
+    assert converged.tolist() == [True, True, False] and np.isnan(rates[2])
+    np.testing.assert_allclose(rates[:2], [calculate_mwrr(row) for row in portfolios[:2]], atol=1e-6)
+    with pytest.raises(ValueError, match='did not converge'):
+        calculate_mwrr(portfolios[2])
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from economics.mpc import (
+    analyze_mpc_data, analyze_mpc_data_chunked, calculate_keyesian_multiplier, simulate_multiplier_effect,
+    simulate_multiplier_effect_batch,
+)
+
+def _data():
+    return pd.DataFrame({
+        'Income Level': ['Low', 'High', 'Low', 'High', 'Mid', 'Low'],
+        'Region': ['N', 'S', 'S', 'N', 'N', 'N'],
+        'Income Change': [100, 200, 50, 400, 80, 150],
+        'Consumption Change': [90, 120, 40, 200, 60, 120],
+    })
+
+def test_mpc_and_multiplier_per_group():
+    summary = analyze_mpc_data(_data(), verbose=False)
+    assert np.isclose(summary.loc['Low', 'mpc'], 250 / 300)
+    assert np.isclose(summary.loc['High', 'multiplier'], 1 / (1 - 320 / 600))
+    assert summary.loc['Low', 'count'] == 3
+
+@pytest.mark.parametrize('keys', ['Income Level', ('Income Level',), ('Income Level', 'Region')])
+def test_chunks_with_different_categories_match_one_pass(keys):
+    data = _data()
+    # Only the last chunk has 'Mid' rows, and the second has no 'N' region
+    chunks = [data[:2], data[2:3], data[4:]]
+    data = pd.concat(chunks)
+    pd.testing.assert_frame_equal(analyze_mpc_data_chunked(chunks, keys), analyze_mpc_data(data, keys, verbose=False))
+
+def test_single_key_name_is_one_column(capsys):
+    summary = analyze_mpc_data(_data(), keys='Region')
+    assert list(summary.index) == ['N', 'S']
+    assert 'MPC by Region:' in capsys.readouterr().out
+
+def test_multiplier_and_rounds():
+    assert np.isclose(calculate_keyesian_multiplier(0.8), 5)
+    np.testing.assert_allclose(simulate_multiplier_effect(100, 0.8, rounds=3), [100, 180, 244, 295.2])
+    totals = simulate_multiplier_effect_batch([100, 100], [0.8, 1.0], rounds=3, totals_only=True)
+    np.testing.assert_allclose(totals, [295.2, 400])
+    # The series converges to the multiplier
+    assert np.isclose(simulate_multiplier_effect_batch(100, 0.5, rounds=200, totals_only=True)[0], 200)
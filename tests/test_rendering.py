@@ -0,0 +1,68 @@
+import io
+
+import matplotlib
+import pandas as pd
+import pytest
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+
+from quantitative_methods import charting, rendering
+from quantitative_methods.charting import grouped_bar_chart, tree_map
+from quantitative_methods.rendering import FigureRenderer, finish, new_axes, render_batch
+
+PNG = b'\x89PNG'
+LABELS = ['A', 'B', 'C']
+
+def draw_line(ax):
+    ax.plot([1, 2, 3])
+
+def test_renderer_returns_bytes_and_writes_paths(tmp_path):
+    with FigureRenderer() as renderer:
+        assert renderer.render(draw_line).startswith(PNG)
+        assert renderer.render(draw_line, format='svg').lstrip().startswith(b'<?xml')
+        path = renderer.render(draw_line, str(tmp_path / 'line.png'))
+    assert open(path, 'rb').read().startswith(PNG)
+
+def test_renderer_reuses_and_clears_its_figure():
+    with FigureRenderer() as renderer:
+        figure = renderer.figure
+        renderer.render(draw_line)
+        renderer.render(lambda ax: ax.bar([0, 1], [1, 2]), figsize=(4, 3))
+        assert renderer.figure is figure
+        assert len(figure.axes) == 1 and not figure.axes[0].lines
+        assert tuple(figure.get_size_inches()) == (4, 3)
+    assert renderer.figure is None
+    assert not plt.get_fignums()
+
+def test_render_batch_writes_files_and_releases_the_renderer(tmp_path):
+    outputs = [str(tmp_path / f'chart_{i}.png') for i in range(3)] + [None]
+    jobs = [(grouped_bar_chart, (LABELS, [i, 2, 3], [3, 2, 1], 'Chart', 'X', 'Y'), {}, output)
+            for i, output in enumerate(outputs)]
+    results = render_batch(jobs)
+    assert results[:3] == outputs[:3] and results[3].startswith(PNG)
+    for path in outputs[:3]:
+        assert open(path, 'rb').read().startswith(PNG)
+    assert rendering._worker_renderer is None
+
+def test_finish_writes_to_file_objects_and_closes_owned_figures():
+    buffer = io.BytesIO()
+    assert grouped_bar_chart(LABELS, [1, 2, 3], [3, 2, 1], 'Chart', 'X', 'Y', output=buffer) is buffer
+    assert buffer.getvalue().startswith(PNG)
+    assert not plt.get_fignums()
+    figure, ax, owned = new_axes()
+    finish(figure, io.BytesIO(), owned=False)
+    assert plt.fignum_exists(figure.number)
+    plt.close(figure)
+
+def test_tree_map_labels_each_cell(tmp_path):
+    pytest.importorskip('squarify')
+    data = pd.DataFrame({'sex': ['M', 'F', 'F', 'M', 'M'], 'smoker': ['y', 'n', 'y', 'n', 'y']})
+    paths = tree_map(data, ['sex', 'smoker'], output_dir=str(tmp_path))
+    assert len(paths) == 1 and open(paths[0], 'rb').read().startswith(PNG)
+    table = pd.crosstab(data.sex, data.smoker)
+    with FigureRenderer() as renderer:
+        renderer.render(lambda ax: charting._draw_tree_map(ax, table, 'sex', 'smoker'))
+        texts = {text.get_text() for text in renderer.figure.axes[0].texts}
+    assert texts == {'F, n', 'F, y', 'M, n', 'M, y'}
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantitative_methods.required_rate_of_return import (
+    RatingIndex, calculate_default_risk_premium, calculate_required_return_matrix,
+)
+
+RATES = {'A': 0.01, 'B': 0.02, 'C': 0.05}
+
+def _matrix(credit_rating, historical_default_rates=RATES, rating_codes=None):
+    return calculate_required_return_matrix(0.02, 0.03, [5.0, 10.0], 0.001, 0.005, credit_rating,
+                                            historical_default_rates, rating_codes=rating_codes)
+
+def test_codes_and_ratings_give_the_same_build_up():
+    index = RatingIndex(RATES)
+    by_rating = _matrix(np.array(['C', 'A']), index)
+    by_code = _matrix(None, index, rating_codes=index.codes(['C', 'A']))
+    np.testing.assert_array_equal(by_rating, by_code)
+    np.testing.assert_allclose(by_rating[:, -1], [0.02 + 0.03 + 0.005 + 0.005 + 0.05, 0.02 + 0.03 + 0.01 + 0.005 + 0.01])
+
+@pytest.mark.parametrize('codes', [[0, -1], [0, 3]])
+def test_out_of_range_codes_are_rejected(codes):
+    with pytest.raises(ValueError, match='Invalid rating codes'):
+        _matrix(None, rating_codes=np.array(codes))
+
+def test_integer_ratings_are_looked_up_by_key():
+    # Integer credit ratings are always keys; positions go through rating_codes
+    rates = {1: 0.01, 2: 0.02, 3: 0.05}
+    np.testing.assert_allclose(_matrix(np.array([3, 1]), rates)[:, 4], [0.05, 0.01])
+    np.testing.assert_allclose(_matrix(None, rates, rating_codes=[2, 0])[:, 4], [0.05, 0.01])
+    np.testing.assert_allclose(calculate_default_risk_premium(np.array([2, 3]), rates), [0.02, 0.05])
+    with pytest.raises(KeyError):
+        _matrix(np.array([0, 1]), RATES)
+    with pytest.raises(ValueError, match='either'):
+        _matrix(np.array(['A', 'B']), rating_codes=[0, 1])
+
+def test_categorical_ratings_are_resolved_per_category(monkeypatch):
+    # Four bonds over three categories: one lookup of the three categories
+    ratings = pd.Series(pd.Categorical(['C', 'A', 'C', 'B']))
+    lookups = []
+    get_indexer = pd.Index.get_indexer
+
+    def counting_get_indexer(self, target):
+        lookups.append(len(target))
+        return get_indexer(self, target)
+
+    monkeypatch.setattr(pd.Index, 'get_indexer', counting_get_indexer)
+    result = calculate_required_return_matrix(0.02, 0.03, 5.0, 0.001, 0.005, ratings, RATES)
+    np.testing.assert_allclose(result[:, 4], [0.05, 0.01, 0.05, 0.02])
+    assert lookups == [3]
+
+def test_unknown_ratings_raise():
+    with pytest.raises(KeyError, match='D'):
+        calculate_default_risk_premium(['A', 'D'], RATES)
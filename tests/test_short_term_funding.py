@@ -0,0 +1,22 @@
+from decimal import Decimal
+
+import numpy as np
+
+from corporate_finance.short_term_funding import calculate_cost, calculate_cost_batch, calculate_cost_decimal
+
+def test_costs_match_hand_calculation():
+    # Line of credit, banker's acceptance, commercial paper
+    assert calculate_cost_decimal(Decimal(1000), Decimal(50), Decimal(10000)) == Decimal('0.105')
+    assert np.isclose(calculate_cost(500.0, 0, 10000.0), 500 / 9500)
+    costs = calculate_cost_batch([1000, 500, 750], commitment_fee=[50, 0, 0], loan_amount=[10000, 10000, 15000],
+                                 dealer_commission=[0, 0, 25], backup_costs=[0, 0, 10])
+    np.testing.assert_allclose(costs, [1050 / 10000, 500 / 9500, 785 / 14250])
+    assert np.isnan(calculate_cost_batch(100, 0, 0))
+
+def test_batch_matches_the_scalar_paths():
+    rng = np.random.default_rng(0)
+    interest, fees, loans = rng.uniform(100, 1000, 50), rng.uniform(0, 100, 50), rng.uniform(5000, 20000, 50)
+    costs = calculate_cost_batch(interest, fees, loans)
+    for row in zip(interest, fees, loans, costs):
+        assert np.isclose(calculate_cost(*row[:3]), row[3])
+        assert np.isclose(float(calculate_cost_decimal(*(Decimal(str(x)) for x in row[:3]))), row[3])
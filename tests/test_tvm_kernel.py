@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from quantitative_methods import tvm_kernel
+from quantitative_methods.series_of_cashflow import calculate_future_value
+
+def test_annuity_factors_use_the_zero_rate_limit():
+    factors = tvm_kernel.tvm_factors(np.array([0.0, 1e-12]), 12)
+    np.testing.assert_allclose(factors.annuity_fv, [12, 12])
+    np.testing.assert_allclose(factors.annuity_pv, [12, 12])
+    assert factors.growth[0] == 1 and factors.discount[0] == 1
+
+def test_annuity_values_match_closed_forms():
+    r, n = 0.05, 10
+    assert np.isclose(tvm_kernel.annuity_pv(100, r, n), 100 * (1 - 1.05 ** -10) / r)
+    assert np.isclose(tvm_kernel.annuity_fv(100, r, n, due=True), 100 * (1.05 ** 10 - 1) / r * 1.05)
+    assert np.isclose(tvm_kernel.payment(1000, r, n), 1000 * r / (1 - 1.05 ** -10))
+
+def test_future_value_series_matches_hand_calculation():
+    # 1000 * 1.06 ** 5 + 30 * (1.06 ** 5 - 1) / 0.06 [* 1.06 when due]
+    end = 1000 * 1.06 ** 5 + 30 * (1.06 ** 5 - 1) / 0.06
+    assert np.isclose(tvm_kernel.future_value_series(1000, 30, 0.06, 5), end)
+    assert np.isclose(calculate_future_value(1000, 30, 0.06, 5, 'begin'), 1000 * 1.06 ** 5 + (end - 1000 * 1.06 ** 5) * 1.06)
+    assert tvm_kernel.future_value_series(1000, 30, 0.0, 5) == 1150
+
+def test_series_input_returns_series():
+    rates = pd.Series([0.0, 0.05], index=['a', 'b'])
+    result = tvm_kernel.future_value_series(100, 10, rates, 2)
+    assert isinstance(result, pd.Series) and list(result.index) == ['a', 'b']
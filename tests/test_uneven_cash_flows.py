@@ -0,0 +1,21 @@
+import numpy as np
+
+from quantitative_methods.uneven_cash_flows import CashFlowAccumulator, calculate_ledger_values, pack_ledgers
+
+LEDGERS = [[100, 200, 300], [-50, 25], [], [10, 10, 10, 10, 10]]
+
+def test_ledger_values_match_hand_calculation():
+    values, offsets = pack_ledgers(LEDGERS)
+    result = calculate_ledger_values(values, offsets, 0.05)
+    np.testing.assert_allclose(result.fv, [100 * 1.05 ** 2 + 200 * 1.05 + 300, -50 * 1.05 + 25, 0,
+                                           10 * (1.05 ** 5 - 1) / 0.05])
+    np.testing.assert_allclose(result.pv, [100 + 200 / 1.05 + 300 / 1.05 ** 2, -50 + 25 / 1.05, 0,
+                                           10 * (1 - 1.05 ** -5) / 0.05 * 1.05])
+
+def test_per_ledger_rates_and_streaming_agree():
+    values, offsets = pack_ledgers(LEDGERS)
+    rates = np.array([0.05, 0.0, 0.02, 0.1])
+    batch = calculate_ledger_values(values, offsets, rates)
+    for ledger, rate, fv, pv in zip(LEDGERS, rates, batch.fv, batch.pv):
+        stream = CashFlowAccumulator(rate).extend(ledger).result()
+        assert np.isclose(stream.fv, fv) and np.isclose(stream.pv, pv)
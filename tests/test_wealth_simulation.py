@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from quantitative_methods import tvm_kernel
+from quantitative_methods.wealth_simulation import project_wealth, simulate_wealth
+
+@pytest.mark.parametrize('timing', ['end', 'begin'])
+def test_zero_volatility_matches_tvm_kernel(timing):
+    result = simulate_wealth(1000, 24, contribution=50, model='normal', mean_return=0.01,
+                             volatility=0.0, timing=timing, paths=3, seed=1)
+    expected = tvm_kernel.future_value_series(1000, 50, 0.01, 24, due=timing == 'begin')
+    np.testing.assert_allclose(result.nominal, expected)
+    np.testing.assert_allclose(result.real, expected)
+    assert not result.depleted.any()
+
+def test_constant_inflation_deflates_real_wealth():
+    result = simulate_wealth(1000, 12, model='normal', mean_return=0.01, volatility=0.0,
+                             inflation_mean=0.004, paths=2, seed=1)
+    np.testing.assert_allclose(result.nominal, 1000 * 1.01 ** 12)
+    np.testing.assert_allclose(result.real, 1000 * (1.01 / 1.004) ** 12)
+
+def test_indexed_contributions_are_in_todays_money():
+    # With returns equal to inflation, an indexed plan keeps its real value exactly
+    result = simulate_wealth(0, 10, contribution=100, model='normal', mean_return=0.003,
+                             volatility=0.0, inflation_mean=0.003, indexed=True, paths=2, seed=1)
+    np.testing.assert_allclose(result.real, 1000)
+    np.testing.assert_allclose(result.nominal, 1000 * 1.003 ** 10)
+
+def test_returns_below_minus_100_percent_empty_without_depleting():
+    result = simulate_wealth(1000, 5, model='normal', mean_return=-0.5, volatility=1.0,
+                             paths=2000, seed=3)
+    assert (result.nominal >= 0).all()
+    assert not result.depleted.any()
+
+    history = np.array([-1.5, 0.1])
+    result = simulate_wealth(1000, 5, model='bootstrap', history=history, paths=200, seed=3)
+    assert (result.nominal >= 0).all()
+    assert not result.depleted.any()
+
+def test_withdrawals_beyond_the_balance_deplete():
+    result = simulate_wealth(100, 5, contribution=-30, model='normal', mean_return=0.0,
+                             volatility=0.0, paths=4, seed=1)
+    assert result.depleted.all()
+    np.testing.assert_array_equal(result.nominal, 0)
+
+def test_result_does_not_depend_on_processes():
+    kwargs = dict(contribution=-40, mean_return=0.004, volatility=0.05, inflation_mean=0.002,
+                  inflation_volatility=0.003, indexed=True, paths=1000, block_size=256, seed=7)
+    serial = simulate_wealth(10000, 120, **kwargs)
+    parallel = simulate_wealth(10000, 120, processes=2, **kwargs)
+    for left, right in zip(serial, parallel):
+        np.testing.assert_array_equal(left, right)
+
+def test_project_wealth_quantiles_are_ordered():
+    table = project_wealth(1000, 60, contribution=10, paths=2000, seed=5)
+    assert table.index.name == 'quantile'
+    assert table['nominal'].is_monotonic_increasing
+    assert table['real'].is_monotonic_increasing